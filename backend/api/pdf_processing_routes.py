@@ -12,6 +12,8 @@ from typing import Optional
 from models.database_session import get_db
 from services.pdf_processor import PDFProcessor
 from services.db_service import DBService
+from services.table_extraction import get_engine_stats
+from services.file_service import FileService, UploadRejectedError
 from models.schemas import CompanyCreate, ReportCreate
 from models.database import Report
 
@@ -72,11 +74,28 @@ async def process_pdf(
         if not os.path.exists(uploads_dir):
             os.makedirs(uploads_dir)
         
-        file_content = await file.read()
-        file_path = os.path.join(uploads_dir, file.filename)
+        file_path = os.path.join(uploads_dir, os.path.basename(file.filename))
         
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        try:
+            upload = await FileService.stream_upload(file, file_path)
+        except UploadRejectedError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        
+        # Byte-identical re-uploads reuse the earlier analysis instead of processing again
+        existing_report = None
+        if os.getenv("UPLOAD_DEDUP_ENABLED", "true").lower() == "true":
+            existing_report = db_service.get_report_by_content_hash(db, upload["sha256"])
+        
+        if existing_report and existing_report.company_id == company.id and existing_report.year == str(year):
+            logger.info(f"Duplicate upload of report {existing_report.id}, returning existing report")
+            if os.path.abspath(file_path) != os.path.abspath(existing_report.file_path):
+                FileService.delete_file(file_path)
+            return {
+                "report_id": existing_report.id,
+                "status": existing_report.processing_status,
+                "duplicate_of": existing_report.id,
+                "message": "This report was already uploaded"
+            }
         
         # Create report entry
         report_create = ReportCreate(
@@ -84,10 +103,20 @@ async def process_pdf(
             year=year,
             file_path=file_path,
             file_name=file.filename,
-            processing_status="pending"
+            processing_status="pending",
+            content_hash=upload["sha256"]
         )
         report = db_service.create_report(db, report_create)
         
+        if existing_report and existing_report.processing_status == "completed":
+            db_service.clone_report_analysis(db, existing_report.id, report.id)
+            return {
+                "report_id": report.id,
+                "status": "completed",
+                "cloned_from": existing_report.id,
+                "message": "Identical report found, analysis copied without reprocessing"
+            }
+        
         # Add background task to process the report
         background_tasks.add_task(process_report_background, report.id, file_path)
         
@@ -97,6 +126,8 @@ async def process_pdf(
             "message": "Report processing started in the background"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
@@ -310,4 +341,14 @@ async def get_report(report_id: int, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         logger.error(f"Error retrieving report {report_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/table-engines/stats")
+async def get_table_engine_stats():
+    """
+    Get accumulated table extraction timings per engine.
+    
+    Returns:
+        Dict with runs, failures, pages, tables, seconds and pages_per_sec per engine
+    """
+    return {"engines": get_engine_stats()}
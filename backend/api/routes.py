@@ -19,15 +19,17 @@ from models.schemas import (
     EntityCreate, SentimentAnalysisCreate, RiskAssessmentCreate,
     ReportCreate
 )
-from services.analysis_service import AnalysisService
+from services.service_registry import get_analysis_service
 from services.db_service import DBService  # Consistent import path
 from api.pdf_processing_routes import router as pdf_router
-from services.file_service import FileService
+from services.file_service import FileService, UploadRejectedError
 from services.huggingface_service import HuggingFaceService
+from services.inference_cache import get_inference_cache
+from services.resilience import get_circuit_stats
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-analysis_service = AnalysisService()
+analysis_service = get_analysis_service()
 
 # Include PDF processing routes
 router.include_router(pdf_router)
@@ -204,9 +206,33 @@ async def upload_report(
                     content={"error": "Invalid file object received"}
                 )
         
-        # Now safely use file_obj
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file_obj.read())
+        # Now safely use file_obj; the body is streamed to disk without blocking the event loop
+        try:
+            upload = await FileService.stream_upload(file_obj, file_path)
+        except UploadRejectedError as e:
+            logger.warning(f"PIPELINE: UPLOAD REJECTED - {str(e)}")
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        logger.info(f"PIPELINE: Saved {upload['size']} bytes to {file_path}")
+        
+        # Byte-identical re-uploads reuse the earlier analysis instead of running the pipeline again
+        existing_report = None
+        if os.getenv("UPLOAD_DEDUP_ENABLED", "true").lower() == "true":
+            existing_report = DBService.get_report_by_content_hash(db, upload["sha256"])
+        
+        if existing_report and existing_report.company_id == company.id and existing_report.year == str(year):
+            logger.info(f"PIPELINE: Duplicate upload of report {existing_report.id}, returning existing report")
+            if os.path.abspath(file_path) != os.path.abspath(existing_report.file_path):
+                FileService.delete_file(file_path)
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "report_id": existing_report.id,
+                    "company_id": company.id,
+                    "status": existing_report.processing_status,
+                    "duplicate_of": existing_report.id,
+                    "message": "This report was already uploaded. Returning the existing analysis."
+                }
+            )
         
         # Create report
         logger.info(f"PIPELINE: Creating report record for company {company.id}")
@@ -215,11 +241,26 @@ async def upload_report(
             year=str(year),
             file_name=file_obj.filename if hasattr(file_obj, 'filename') else filename,
             file_path=file_path,
-            processing_status="pending"
+            processing_status="pending",
+            content_hash=upload["sha256"]
         )
         db_report = DBService.create_report(db, report_create)
         logger.info(f"PIPELINE: Created report with ID {db_report.id}, status: pending")
         
+        if existing_report and existing_report.processing_status == "completed":
+            DBService.clone_report_analysis(db, existing_report.id, db_report.id)
+            logger.info(f"===== PIPELINE: UPLOAD COMPLETE - Report ID: {db_report.id} (cloned from {existing_report.id}) =====")
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "report_id": db_report.id,
+                    "company_id": company.id,
+                    "status": "completed",
+                    "cloned_from": existing_report.id,
+                    "message": "Identical report found. Analysis copied without reprocessing."
+                }
+            )
+        
         # Start analysis in background
         logger.info(f"PIPELINE: Starting background analysis task for report {db_report.id}")
         background_tasks.add_task(
@@ -686,4 +727,28 @@ def get_report_status(
         return JSONResponse(
             status_code=500,
             content={"status": "error", "message": f"Error getting report status: {str(e)}"}
-        ) 
\ No newline at end of file
+        ) 
+
+@router.get("/inference/cache/stats", response_model=Dict[str, Any])
+async def get_inference_cache_stats():
+    """
+    Get hit/miss counters and sizes of the inference result cache.
+    
+    Returns:
+        Dict with "enabled" and, when enabled, the cache's stats
+    """
+    cache = get_inference_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.get_stats()}
+
+
+@router.get("/inference/circuits", response_model=Dict[str, Any])
+async def get_inference_circuits():
+    """
+    Get the circuit breaker state of every inference model called so far.
+    
+    Returns:
+        Dict of model name to state, counters and recent state changes
+    """
+    return get_circuit_stats()
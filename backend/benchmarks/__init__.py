@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Annual Report Analyzer backend.
+
+Each module is a standalone script, e.g.:
+    python -m benchmarks.bench_table_prefilter --pages 500
+"""
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the single-pass token-packing chunker against the previous one.
+
+The previous chunk_text (reproduced below as legacy_chunk_text) capped
+chunks at 1600 characters, re-estimated tokens with split() on every chunk
+and recursively halved chunks over the limit. The current chunker counts
+tokens once per word and packs chunks close to max_tokens, so the same
+report needs fewer chunks and therefore fewer inference calls.
+
+Usage:
+    python -m benchmarks.bench_chunker [--mb 3] [--max-tokens 1024] [--vocab path/to/vocab.txt]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+from typing import List
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.nlp_utils import chunk_text, estimate_tokens
+from services.token_counter import get_token_counter
+
+SENTENCES = [
+    "Total revenue was $4.2 billion in fiscal 2023, an increase of 12% compared with the prior year.",
+    "Net income attributable to shareholders increased to $610 million.",
+    "We expect continued growth in our cloud and services businesses.",
+    "Our results could be adversely affected by competition, regulation and supply chain disruptions.",
+    "Operating margin improved by 150 basis points as a result of pricing actions.",
+    "See Note 7 to the consolidated financial statements for additional information.",
+]
+
+
+def legacy_chunk_text(text: str, chunk_size: int = 1600, overlap_size: int = 200, max_tokens: int = 1024) -> List[str]:
+    """The recursive chunker chunk_text replaced."""
+    chunks = []
+    char_limit = min(chunk_size, 1600)
+    start = 0
+    while start < len(text):
+        end = min(start + char_limit, len(text))
+        if end < len(text):
+            boundary_search_start = max(start + int(char_limit * 0.8), start)
+            sentence_boundary = text.rfind('. ', boundary_search_start, end)
+            if sentence_boundary != -1:
+                end = sentence_boundary + 2
+        chunk = text[start:end]
+        if estimate_tokens(chunk) > max_tokens:
+            chunks.extend(legacy_chunk_text(chunk, len(chunk) // 2, overlap_size // 2, max_tokens // 2))
+        else:
+            chunks.append(chunk)
+        overlap = min(overlap_size, char_limit // 10)
+        start = end - overlap if end - overlap > start else end
+    return chunks
+
+
+def build_report(size_bytes: int) -> str:
+    random.seed(42)
+    parts = []
+    length = 0
+    while length < size_bytes:
+        paragraph = " ".join(random.choice(SENTENCES) for _ in range(random.randint(3, 8))) + "\n\n"
+        parts.append(paragraph)
+        length += len(paragraph)
+    return "".join(parts)
+
+
+def measure(name: str, chunker, text: str, max_tokens: int, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = chunker(text, max_tokens=max_tokens)
+        best = min(best, time.perf_counter() - start)
+    counter = get_token_counter()
+    fill = sum(sum(counter.count(word) for word in chunk.split()) for chunk in chunks) / len(chunks)
+    print(
+        f"{name:>8}: {best * 1000:8.1f} ms, {len(chunks):5d} chunks (inference calls), "
+        f"mean {fill:6.1f} / {counter.budget(max_tokens)} {counter.name} token budget per chunk"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the text chunker")
+    parser.add_argument("--mb", type=float, default=3, help="Size of the synthetic report text")
+    parser.add_argument("--max-tokens", type=int, default=1024, help="Token limit per chunk")
+    parser.add_argument("--vocab", help="Local tokenizer vocabulary (vocab.txt or tokenizer.json)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per chunker (best time is reported)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.vocab:
+        os.environ["TOKENIZER_VOCAB_PATH"] = args.vocab
+
+    text = build_report(int(args.mb * 1024 * 1024))
+    print(f"Report text: {len(text) / 1e6:.1f}M chars")
+    measure("legacy", legacy_chunk_text, text, args.max_tokens, args.repeat)
+    measure("packed", chunk_text, text, args.max_tokens, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-text allocations of the report analysis stages.
+
+Runs the analysis stages the pipeline calls one by one (metrics, summaries,
+outlook, risks, sentiment, entities; Hugging Face calls answered with mock
+responses) on a synthetic annual report, once with the plain text, so every
+stage builds its own views of it, and once with a single Document shared by
+all stages. The text is a str subclass that counts how often it is
+lowercased, split or copied (slices of at least half its length), which are
+the allocations the size of the whole report.
+
+Usage:
+    python -m benchmarks.bench_document [--pages 300]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+os.environ.pop("HUGGINGFACE_API_KEY", None)
+
+from services.ai_service import AIService
+from services.document import Document
+from services.nlp_utils import fallback_sentiment_analysis, extract_basic_entities
+
+PAGE_TEXT = (
+    "Total revenue was $4.2 billion in fiscal 2023, an increase of 12% driven by strong growth. "
+    "Net income was $610 million. We expect continued growth in our cloud business. "
+    "Risk Factors. Our results could be adversely affected by competition and regulation. "
+    "Looking ahead, we anticipate margin improvement as supply challenges decline. "
+    "Acme Corp operates in New York and London with 12,000 employees. "
+) * 8
+
+
+class CountingStr(str):
+    """A str that counts the full-text copies made from it."""
+
+    counts = {"lower": 0, "split": 0, "large_slice": 0}
+
+    def lower(self):
+        CountingStr.counts["lower"] += 1
+        return str.lower(self)
+
+    def split(self, *args, **kwargs):
+        CountingStr.counts["split"] += 1
+        return str.split(self, *args, **kwargs)
+
+    def __getitem__(self, key):
+        result = str.__getitem__(self, key)
+        if isinstance(key, slice) and len(result) * 2 >= len(self):
+            CountingStr.counts["large_slice"] += 1
+        return result
+
+
+def run_stages(service: AIService, text) -> None:
+    """Call the analysis stages the way AnalysisService's component analysis does."""
+    hf = service.huggingface_service
+    metrics = service.extract_financial_metrics(text)
+    service.generate_summary(text, "executive")
+    service.generate_summary(text, "business")
+    service.extract_risk_factors(text)
+    hf.analyze_sentiment(text)
+    hf.extract_entities(text)
+    hf.analyze_risk(text)
+    hf.generate_summary(text, {metric["name"]: metric["value"] for metric in metrics})
+    fallback_sentiment_analysis(text)
+    extract_basic_entities(text)
+
+
+def run(service: AIService, text, shared: bool):
+    CountingStr.counts = {"lower": 0, "split": 0, "large_slice": 0}
+    tracemalloc.start()
+    start = time.perf_counter()
+    run_stages(service, Document(text) if shared else text)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, dict(CountingStr.counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared Document views")
+    parser.add_argument("--pages", type=int, default=300, help="Number of synthetic pages")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.INFO)
+
+    text = CountingStr("".join(f"Page {i + 1}. {PAGE_TEXT}\n\n" for i in range(args.pages)))
+    service = AIService()
+    hf = service.huggingface_service
+    hf._call_inference_api = lambda model_name, task, inputs, **kwargs: hf._get_mock_response(model_name, task, inputs)
+
+    results = {}
+    for name, shared in (("plain str", False), ("Document", True)):
+        elapsed, peak, counts = run(service, text, shared)
+        results[name] = counts
+        copies = sum(counts.values())
+        print(
+            f"{name:>9}: {len(text) / 1e6:.1f}M chars in {elapsed:.2f}s, "
+            f"peak traced memory {peak / 1e6:6.1f} MB, full-text copies {copies} "
+            f"(lower {counts['lower']}, split {counts['split']}, slices {counts['large_slice']})"
+        )
+
+    assert results["Document"]["lower"] <= 1, "A shared Document should lowercase the text at most once"
+    assert sum(results["Document"].values()) < sum(results["plain str"].values())
+
+
+if __name__ == "__main__":
+    main()
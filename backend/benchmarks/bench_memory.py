@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of PDF extraction as the page count grows.
+
+Runs text and table extraction over every page of synthetic reports of
+increasing size under tracemalloc, in low-memory mode and through the
+streaming page iterator, and asserts that the extraction working set (peak
+minus the results that are kept) stays flat instead of growing with the
+number of pages.
+
+tracemalloc slows extraction down considerably; expect a few minutes.
+
+Usage:
+    python -m benchmarks.bench_memory [--pages 50 100 200] [--max-growth 1.5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.page_store import PageStore
+from services.pdf_service import PDFService
+from utils.sample_pdf import write_sample_pdf, build_synthetic_report
+
+
+def measure_page_store(file_path: str, max_resident_pages: int):
+    """Extract text and tables of all pages through a low-memory page store."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with PageStore(file_path, low_memory=True, max_resident_pages=max_resident_pages) as page_store:
+        for i in range(page_store.page_count):
+            page_store.get_text(i)
+            page_store.get_tables(i)
+        retained, peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return peak, retained, elapsed
+
+
+def measure_iter_pages(file_path: str):
+    """Stream text and tables of all pages without keeping them."""
+    pdf_service = PDFService()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in pdf_service.iter_pages(file_path):
+        pass
+    retained, peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return peak, retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak extraction memory by page count")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 100, 200], help="Report sizes to measure")
+    parser.add_argument("--max-resident-pages", type=int, default=20, help="Page store recycling interval")
+    parser.add_argument(
+        "--max-growth", type=float, default=1.5,
+        help="Allowed ratio between the working set of the largest and the smallest report"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = sorted(args.pages)
+
+    working_sets = {"page_store": [], "iter_pages": []}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for page_count in sizes:
+            file_path = write_sample_pdf(
+                os.path.join(temp_dir, f"report_{page_count}.pdf"),
+                build_synthetic_report(page_count)
+            )
+
+            for mode, measure in (
+                ("page_store", lambda: measure_page_store(file_path, args.max_resident_pages)),
+                ("iter_pages", lambda: measure_iter_pages(file_path))
+            ):
+                peak, retained, elapsed = measure()
+                working_set = peak - retained
+                working_sets[mode].append(working_set)
+                print(
+                    f"{mode:>10} {page_count:5d} pages: peak {peak / 1e6:7.2f} MB, "
+                    f"kept results {retained / 1e6:6.2f} MB, working set {working_set / 1e6:6.2f} MB "
+                    f"({page_count / elapsed:.1f} pages/sec under tracemalloc)"
+                )
+
+    failed = False
+    for mode, values in working_sets.items():
+        growth = values[-1] / values[0] if values[0] else float("inf")
+        status = "OK" if growth <= args.max_growth else "FAIL"
+        failed = failed or status == "FAIL"
+        print(f"{mode}: working set grew {growth:.2f}x from {sizes[0]} to {sizes[-1]} pages [{status}]")
+
+    assert not failed, f"Peak extraction memory grew more than {args.max_growth}x with page count"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark financial metric extraction on a 1M-character report.
+
+Compares the previous extraction (legacy_* below: every statement pattern
+lowercases the text and scans it with its own re.finditer, and the KPI
+calculation runs eleven case-insensitive re.search calls) with the shared
+MetricScanner, which lowercases the document once and finds the candidates
+of all metric definitions in one pass. Both must find the same metrics.
+
+Usage:
+    python -m benchmarks.bench_metrics [--chars 1000000] [--repeat 5]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.document import Document
+from services.metric_scanner import MetricScanner, DEFAULT_METRIC_DEFINITIONS
+
+PROSE = [
+    "We design, manufacture and market products and services to customers around the world.",
+    "Our business strategy leverages our ability to design and develop our own operating systems.",
+    "The Company believes ongoing investment in research and development is critical to its future.",
+    "Competition in the markets in which we operate is intense and subject to rapid change.",
+    "Management reviews the allowance for doubtful accounts on a quarterly basis.",
+    "Interest rate changes may affect the fair value of our investment portfolio.",
+]
+METRIC_SENTENCES = [
+    "Total revenue was $4.2 billion for the year.",
+    "Net income was 610 million, compared with 540 million in the prior year.",
+    "Earnings per share was 4.56 on a diluted basis.",
+    "Operating profit of 980 million reflected pricing actions.",
+]
+STATEMENT_LINES = [
+    "Total assets 12,345 11,200", "Total liabilities 7,890 7,001", "Total equity 4,455 4,199",
+    "Current assets 5,120 4,870", "Current liabilities 3,210 3,001", "Inventories 1,234 1,180",
+    "Cash and cash equivalents 2,345 2,010", "Operating income 980 912", "Interest expense 120 118",
+]
+
+
+def build_report(chars: int) -> str:
+    random.seed(7)
+    parts = []
+    length = 0
+    while length < chars:
+        if random.random() < 0.05:
+            paragraph = "\n".join(STATEMENT_LINES) + "\n"
+        else:
+            sentences = [random.choice(PROSE) for _ in range(6)]
+            if random.random() < 0.2:
+                sentences.append(random.choice(METRIC_SENTENCES))
+            paragraph = " ".join(sentences) + "\n\n"
+        parts.append(paragraph)
+        length += len(paragraph)
+    return "".join(parts)[:chars]
+
+
+def legacy_extract_metrics(text: str):
+    """The previous extract_metrics_with_regex: one lowercasing and scan per pattern."""
+    results = []
+    for definition in DEFAULT_METRIC_DEFINITIONS:
+        if definition["group"] != "statement":
+            continue
+        for match in re.finditer(definition["pattern"], text.lower()):
+            results.append((definition["name"], match.group("value")))
+    return results
+
+
+def legacy_kpi_values(text: str):
+    """The previous calculate_financial_kpis lookups: one case-insensitive search per line item."""
+    values = {}
+    for definition in DEFAULT_METRIC_DEFINITIONS:
+        if definition["group"] != "line_item":
+            continue
+        match = re.search(definition["pattern"], text, re.IGNORECASE | re.MULTILINE)
+        values[definition["name"]] = None
+        if match and match.group("value"):
+            try:
+                values[definition["name"]] = float(match.group("value").replace(',', '').strip())
+            except ValueError:
+                pass
+    return values
+
+
+def scanner_extract(scanner: MetricScanner, text: str):
+    document = Document(text)
+    metrics = sorted(
+        ((candidate["name"], candidate["value"]) for candidate in scanner.scan(document, group="statement")),
+        key=lambda metric: [definition.name for definition in scanner.definitions].index(metric[0])
+    )
+    return metrics, scanner.first_values(document, group="line_item")
+
+
+def best_time(function, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark financial metric extraction")
+    parser.add_argument("--chars", type=int, default=1_000_000, help="Size of the synthetic report text")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best time is reported)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    text = build_report(args.chars)
+    scanner = MetricScanner()
+
+    legacy_time, (legacy_metrics, legacy_values) = best_time(
+        lambda: (legacy_extract_metrics(text), legacy_kpi_values(text)), args.repeat
+    )
+    scanner_time, (metrics, values) = best_time(lambda: scanner_extract(scanner, text), args.repeat)
+
+    print(f"Report text: {len(text) / 1e6:.1f}M chars, {len(metrics)} statement metrics, "
+          f"{sum(value is not None for value in values.values())}/{len(values)} KPI line items")
+    print(f"  legacy: {legacy_time * 1000:7.1f} ms (4 lowercasings, 4 finditer scans, 11 case-insensitive searches)")
+    print(f" scanner: {scanner_time * 1000:7.1f} ms (1 lowercasing, 1 scan)")
+    assert metrics == legacy_metrics, "The scanner must find the same statement metrics"
+    assert values == legacy_values, "The scanner must find the same KPI line items"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark locating report sections with the section index.
+
+Before the section index every stage searched the full text for its own
+section: the risk factor extraction for its header, the outlook extraction
+for outlook headers anywhere in the report, and PDFProcessor for financial
+keywords on every page (reproduced below as legacy_*). Now one heading scan
+over the shared lowercased text builds the index and every stage reads its
+section span from it, so each stage only analyzes its own section.
+
+Usage:
+    python -m benchmarks.bench_sections [--pages 300] [--repeat 5]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.document import Document
+from services.section_index import SectionSegmenter, FINANCIAL_SECTIONS
+
+PROSE = [
+    "We design, manufacture and market products and services to customers around the world.",
+    "Competition in the markets in which we operate is intense and subject to rapid change.",
+    "Management reviews the allowance for doubtful accounts on a quarterly basis.",
+    "Interest rate changes may affect the fair value of our investment portfolio.",
+    "Supply chain disruptions could adversely affect our results of operations.",
+]
+ITEMS = [
+    ("Item 1. Business", 0.10), ("Item 1A. Risk Factors", 0.15), ("Item 2. Properties", 0.02),
+    ("Item 3. Legal Proceedings", 0.02), ("Item 7. Management's Discussion and Analysis", 0.20),
+    ("Outlook", 0.03), ("Item 7A. Quantitative and Qualitative Disclosures About Market Risk", 0.03),
+    ("Item 8. Financial Statements and Supplementary Data", 0.05), ("Consolidated Balance Sheets", 0.05),
+    ("Notes to Consolidated Financial Statements", 0.25), ("Item 9A. Controls and Procedures", 0.10),
+]
+FINANCIAL_KEYWORDS = [
+    "financial statements", "consolidated financial",
+    "balance sheet", "income statement", "statement of income",
+    "cash flow statement", "statement of cash flows",
+    "statement of financial position", "notes to financial",
+    "financial results", "financial review", "financial performance"
+]
+OUTLOOK_HEADERS = [
+    r'business outlook', r'future outlook', r'outlook',
+    r'forward[ -]looking statements', r'future prospects', r'guidance'
+]
+
+
+def build_report(page_count: int):
+    random.seed(3)
+    pages = []
+    for heading, share in ITEMS:
+        for page in range(max(int(page_count * share), 1)):
+            lines = [heading] if page == 0 else []
+            lines.extend(" ".join(random.choice(PROSE) for _ in range(8)) for _ in range(6))
+            pages.append("\n".join(lines) + "\n")
+    return pages
+
+
+def legacy_sections(text: str, pages):
+    """The previous per-stage section searches over the full text."""
+    # Risk factors: search the header, then the next item heading
+    match = re.search(r'(?:Item\s+)?1A\.?\s+Risk\s+Factors', text)
+    next_item = re.search(r'(?:Item|ITEM)\s+\d+[AB]?\.', text[match.end():])
+    risk_chars = next_item.start()
+
+    # Outlook: every header pattern over the whole text
+    outlook = []
+    for header in OUTLOOK_HEADERS:
+        outlook.extend(re.compile(f'(?i){header}[:\\s]+(.*?)(?=\\n\\n|\\.$)', re.DOTALL).findall(text))
+
+    # PDFProcessor: financial keywords on every page, plus the next four pages
+    financial_pages = set()
+    for i, page_text in enumerate(pages):
+        page_text = page_text.lower()
+        if any(keyword in page_text for keyword in FINANCIAL_KEYWORDS):
+            financial_pages.update(range(i, min(i + 5, len(pages))))
+    return risk_chars, len(text), financial_pages
+
+
+def indexed_sections(pages):
+    document = Document.from_pages(pages)
+    index = SectionSegmenter().index(document)
+    risk_start, risk_end = index.span("risk_factors")
+    outlook_chars = sum(section["end"] - section["start"] for section in index.find("outlook"))
+    return risk_end - risk_start, outlook_chars, index.page_indices(FINANCIAL_SECTIONS)
+
+
+def best_time(function, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the section index")
+    parser.add_argument("--pages", type=int, default=300, help="Pages of the synthetic 10-K")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best time is reported)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    pages = build_report(args.pages)
+    text = "".join(page + "\n\n" for page in pages)
+
+    legacy_time, (legacy_risk, legacy_outlook, legacy_pages) = best_time(
+        lambda: legacy_sections(text, pages), args.repeat
+    )
+    indexed_time, (risk_chars, outlook_chars, section_pages) = best_time(lambda: indexed_sections(pages), args.repeat)
+
+    print(f"Report text: {len(text) / 1e6:.2f}M chars, {len(pages)} pages")
+    print(f"  legacy: {legacy_time * 1000:7.1f} ms; outlook stage reads {legacy_outlook:,} chars, "
+          f"{len(legacy_pages)} financial pages (pages with a keyword and the next 4)")
+    print(f" indexed: {indexed_time * 1000:7.1f} ms; outlook stage reads {outlook_chars:,} chars, "
+          f"{len(section_pages)} financial pages (financial statement and notes sections)")
+    assert risk_chars <= legacy_risk + len("Item 1A. Risk Factors"), "The risk section must not grow"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark lexicon sentiment scoring on a synthetic report.
+
+The previous fallback_sentiment_analysis (legacy_sentiment below) lowercased
+the text once per word and counted 22 words with str.count, for the whole
+document only. Counting the finance lexicon that way scales with the lexicon
+(one full-text count per word form) and gives no page or section scores.
+The LexiconSentimentAnalyzer tokenizes once and counts every category per
+page and section with NumPy.
+
+Usage:
+    python -m benchmarks.bench_sentiment [--pages 300] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from benchmarks.bench_sections import build_report
+from services.document import Document
+from services.lexicon_sentiment import LexiconSentimentAnalyzer
+
+POSITIVE_WORDS = ["increase", "growth", "profit", "success", "improve", "positive",
+                  "advantage", "opportunity", "strong", "exceed", "gain"]
+NEGATIVE_WORDS = ["decrease", "decline", "loss", "risk", "challenge", "negative",
+                  "difficult", "weak", "fail", "threat", "liability"]
+
+
+def legacy_sentiment(text: str):
+    """The previous fallback: 22 lowercased copies, 22 counts, one document label."""
+    positive_count = sum(text.lower().count(word) for word in POSITIVE_WORDS)
+    negative_count = sum(text.lower().count(word) for word in NEGATIVE_WORDS)
+    return positive_count, negative_count
+
+
+def legacy_lexicon_counts(text: str, analyzer: LexiconSentimentAnalyzer):
+    """The same approach over the full lexicon: one count per word form (shared lowercased copy)."""
+    lower = text.lower()
+    return {word: lower.count(word) for word in analyzer.codes}
+
+
+def best_time(function, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lexicon sentiment scoring")
+    parser.add_argument("--pages", type=int, default=300, help="Pages of the synthetic report")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best time is reported)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    pages = build_report(args.pages)
+    text = "".join(page + "\n\n" for page in pages)
+    analyzer = LexiconSentimentAnalyzer()
+
+    legacy_time, _ = best_time(lambda: legacy_sentiment(text), args.repeat)
+    lexicon_count_time, _ = best_time(lambda: legacy_lexicon_counts(text, analyzer), 1)
+    engine_time, result = best_time(lambda: analyzer.analyze(Document.from_pages(pages)), args.repeat)
+
+    print(f"Report text: {len(text) / 1e6:.2f}M chars, {len(pages)} pages, {len(analyzer.codes)} lexicon word forms")
+    print(f"       legacy 22 words: {legacy_time * 1000:7.1f} ms (document label only)")
+    print(f"  str.count of lexicon: {lexicon_count_time * 1000:7.1f} ms (document counts only)")
+    print(f"       lexicon engine: {engine_time * 1000:7.1f} ms "
+          f"({len(result['pages'])} pages, {len(result['sections'])} sections, incl. section index)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark API cold start: import time and time to first response.
+
+Autoscaled API pods start often, and every module imported by api.routes
+delays the first request. This imports the API module in a fresh
+interpreter with `python -X importtime`, reports its import time and the
+slowest imports, and checks the import-time budget: heavy optional
+dependencies (HEAVY_MODULES) must only be imported by the code paths that
+use them. Then it starts the server with uvicorn and measures the time
+until `GET /` answers.
+
+Exits with status 1 if a heavy module is imported at startup or the import
+time exceeds --max-import-seconds.
+
+Usage:
+    python -m benchmarks.bench_startup [--module api.routes] [--max-import-seconds 4] [--skip-server]
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+import urllib.request
+from typing import Dict, List, Tuple
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+# Packages too heavy to import at API startup; only the code paths using them may import them
+HEAVY_MODULES = ("torch", "transformers", "tensorflow", "pandas", "tabula", "jpype", "scipy", "sklearn")
+
+
+def measure_imports(module: str = "api.routes") -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        (seconds, cumulative seconds per imported module, heavy modules imported)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir, capture_output=True, text=True, check=True
+    )
+    cumulative: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, total, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not total.isdigit():
+            continue  # Header line
+        cumulative[name] = int(total) / 1e6
+    heavy = sorted({name.split(".")[0] for name in cumulative if name.split(".")[0] in HEAVY_MODULES})
+    return cumulative.get(module, 0.0), cumulative, heavy
+
+
+def measure_first_response(port: int, timeout: float = 120.0) -> float:
+    """
+    Start the API with uvicorn and wait for `GET /` to answer.
+
+    Args:
+        port: Port to serve on
+        timeout: Seconds to wait for the first response
+
+    Returns:
+        Seconds from process start to the first successful response
+    """
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=backend_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"No response within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API import time and time to first response")
+    parser.add_argument("--module", default="api.routes", help="Module whose import is measured")
+    parser.add_argument("--max-import-seconds", type=float, default=4.0, help="Import-time budget")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--skip-server", action="store_true", help="Do not measure time to first response")
+    args = parser.parse_args()
+
+    seconds, cumulative, heavy = measure_imports(args.module)
+    print(f"import {args.module}: {seconds * 1000:7.1f} ms ({len(cumulative)} modules, budget "
+          f"{args.max_import_seconds * 1000:.0f} ms)")
+    top_level = {name: total for name, total in cumulative.items() if "." not in name and name != args.module}
+    for name, total in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:30s} {total * 1000:7.1f} ms")
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+
+    if not args.skip_server:
+        print(f"time to first response: {measure_first_response(free_port()) * 1000:7.1f} ms")
+
+    if heavy or seconds > args.max_import_seconds:
+        print("Import-time budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
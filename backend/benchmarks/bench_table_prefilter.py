@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the table pre-filter of financial section detection.
+
+Builds a synthetic annual report and measures the throughput (pages/sec) of
+the financial table scan with and without the text-based page scorer.
+
+Usage:
+    python -m benchmarks.bench_table_prefilter [--pages 500]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.page_store import PageStore
+from services.page_scorer import find_financial_table_pages
+from utils.sample_pdf import write_sample_pdf, build_synthetic_report
+
+
+def run_scan(file_path: str, prefilter: bool):
+    """Run the table scan over all pages with a fresh page store."""
+    start = time.perf_counter()
+    with PageStore(file_path) as page_store:
+        table_pages = find_financial_table_pages(page_store, range(page_store.page_count), prefilter=prefilter)
+        stats = page_store.get_stats()
+    return time.perf_counter() - start, table_pages, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the table pre-filter")
+    parser.add_argument("--pages", type=int, default=500, help="Pages in the synthetic report")
+    parser.add_argument("--skip-baseline", action="store_true", help="Only run with the pre-filter")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = write_sample_pdf(os.path.join(temp_dir, "report.pdf"), build_synthetic_report(args.pages))
+
+        runs = [("pre-filter", True)]
+        if not args.skip_baseline:
+            runs.append(("baseline", False))
+
+        results = {}
+        for label, prefilter in runs:
+            elapsed, table_pages, stats = run_scan(file_path, prefilter)
+            results[label] = table_pages
+            print(
+                f"{label:>10}: {elapsed:8.2f}s  {args.pages / elapsed:8.1f} pages/sec  "
+                f"table extraction on {stats['table_pages_parsed']}/{stats['page_count']} pages, "
+                f"{len(table_pages)} financial table pages"
+            )
+
+        if "baseline" in results:
+            missed = results["baseline"] - results["pre-filter"]
+            print(f"Pages found by the baseline but skipped by the pre-filter: {sorted(missed) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop latency and memory of concurrent PDF uploads.
+
+Saves several large uploads concurrently, once the old way (read the whole
+body, then write it with a blocking write) and once through
+FileService.stream_upload, while a heartbeat task measures how late the
+event loop wakes it up. Streaming should keep the loop lag flat and the
+peak memory at a few chunks instead of the size of all uploads combined.
+
+Usage:
+    python -m benchmarks.bench_upload [--size-mb 50] [--concurrency 4]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+import logging
+
+# Make the backend packages importable when run as a script
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from fastapi import UploadFile
+
+from services.file_service import FileService
+
+HEARTBEAT_INTERVAL = 0.005
+
+
+def write_source_pdf(path: str, size_bytes: int) -> None:
+    """Write a file of the given size that starts with a PDF header."""
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.7\n")
+        written = 9
+        while written < size_bytes:
+            chunk = block[:size_bytes - written]
+            f.write(chunk)
+            written += len(chunk)
+
+
+async def save_read_all(file: UploadFile, destination_path: str) -> None:
+    """The previous upload path: whole body in memory, blocking write on the loop."""
+    with open(destination_path, "wb") as buffer:
+        buffer.write(await file.read())
+
+
+async def save_streamed(file: UploadFile, destination_path: str) -> None:
+    await FileService.stream_upload(file, destination_path, max_bytes=1 << 40)
+
+
+async def heartbeat(stop: asyncio.Event, lags: list) -> None:
+    """Record how much later than requested the event loop resumes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(loop.time() - start - HEARTBEAT_INTERVAL)
+
+
+async def run(save, source_path: str, out_dir: str, concurrency: int):
+    files = [UploadFile(file=open(source_path, "rb"), filename="report.pdf") for _ in range(concurrency)]
+    stop = asyncio.Event()
+    lags: list = []
+
+    tracemalloc.start()
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        save(file, os.path.join(out_dir, f"upload_{i}.pdf")) for i, file in enumerate(files)
+    ))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for file in files:
+        file.file.close()
+    return elapsed, peak, max(lags) if lags else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent upload saving")
+    parser.add_argument("--size-mb", type=int, default=50, help="Size of each upload")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of simultaneous uploads")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_path = os.path.join(temp_dir, "source.pdf")
+        write_source_pdf(source_path, args.size_mb * 1024 * 1024)
+
+        results = {}
+        for name, save in (("read_all", save_read_all), ("streamed", save_streamed)):
+            out_dir = os.path.join(temp_dir, name)
+            os.makedirs(out_dir)
+            elapsed, peak, max_lag = asyncio.run(run(save, source_path, out_dir, args.concurrency))
+            results[name] = (peak, max_lag)
+            print(
+                f"{name:>8}: {args.concurrency} x {args.size_mb} MB in {elapsed:.2f}s, "
+                f"peak traced memory {peak / 1e6:7.1f} MB, max event-loop lag {max_lag * 1000:6.1f} ms"
+            )
+
+    read_all_peak, _ = results["read_all"]
+    streamed_peak, _ = results["streamed"]
+    print(f"Streaming used {read_all_peak / max(streamed_peak, 1):.0f}x less peak memory")
+    assert streamed_peak < args.size_mb * 1024 * 1024, "Streamed uploads should never hold a whole file in memory"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 from api.routes import router
 from models.database import create_tables
+from models.migrate_report_content_hash import migrate_database as migrate_report_content_hash
 from middleware.log_streaming import setup_log_streaming
 from utils.logging_config import setup_logging
 
@@ -24,11 +26,29 @@ if not os.path.exists(uploads_dir):
 create_tables()
 logger.info("Database tables created or verified")
 
+# Start tabula's JVM now instead of during the first report
+if os.getenv("TABULA_WARMUP", "false").lower() == "true":
+    from services.table_extraction import TableExtractor
+    TableExtractor().warm_up()
+
+# Load the models of tasks on the local inference backend now instead of during the first report
+if os.getenv("LOCAL_MODEL_WARMUP", "false").lower() == "true":
+    from services.service_registry import get_huggingface_service
+    get_huggingface_service().warm_up_local_models()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # create_tables() does not add columns to existing tables; migrate when the
+    # server starts rather than whenever this module is imported
+    migrate_report_content_hash()
+    yield
+
 # Create FastAPI app
 app = FastAPI(
     title="Annual Report Analyzer API",
     description="API for analyzing annual reports using AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
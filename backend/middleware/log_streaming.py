@@ -22,7 +22,7 @@ class LogCaptureHandler(logging.Handler):
         self.formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         
         # Create a file handler for pipeline logs
-        logs_dir = os.path.join(os.getcwd(), "backend", "logs")
+        logs_dir = os.getenv("LOG_DIR") or os.path.join(os.getcwd(), "backend", "logs")
         if not os.path.exists(logs_dir):
             os.makedirs(logs_dir)
         
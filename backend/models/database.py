@@ -40,6 +40,7 @@ class Report(Base):
     page_count = Column(Integer, nullable=True)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
     error_message = Column(Text, nullable=True)  # Store error message when processing fails
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the PDF bytes, used to detect re-uploads
     
     # Relationships
     company = relationship("Company", back_populates="reports")
@@ -0,0 +1,74 @@
+"""
+Migration script to add the indexed content_hash column to the reports table.
+
+Existing reports whose PDF is still on disk get their hash backfilled, so
+re-uploads of filings analyzed before the migration are recognized too.
+"""
+import os
+import logging
+from sqlalchemy import inspect, text
+
+from models.database import engine
+from utils.helpers import hash_file
+
+logger = logging.getLogger(__name__)
+
+def migrate_database(db_engine=None, backfill: bool = True) -> bool:
+    """
+    Add the content_hash column and its index to the reports table if missing.
+
+    Args:
+        db_engine: SQLAlchemy engine (defaults to the application engine)
+        backfill: Hash the PDFs of existing reports that have no hash yet
+
+    Returns:
+        True if the table is up to date
+    """
+    db_engine = db_engine or engine
+
+    try:
+        inspector = inspect(db_engine)
+        if "reports" not in inspector.get_table_names():
+            logger.info("reports table does not exist yet; nothing to migrate")
+            return True
+
+        column_names = [column["name"] for column in inspector.get_columns("reports")]
+
+        with db_engine.begin() as conn:
+            if "content_hash" not in column_names:
+                logger.info("Adding content_hash column to reports table")
+                conn.execute(text("ALTER TABLE reports ADD COLUMN content_hash VARCHAR(64)"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_reports_content_hash ON reports (content_hash)"
+            ))
+
+            if backfill:
+                rows = conn.execute(text(
+                    "SELECT id, file_path FROM reports WHERE content_hash IS NULL"
+                )).fetchall()
+                backfilled = 0
+                for report_id, file_path in rows:
+                    if not file_path or not os.path.exists(file_path):
+                        continue
+                    conn.execute(
+                        text("UPDATE reports SET content_hash = :content_hash WHERE id = :id"),
+                        {"content_hash": hash_file(file_path), "id": report_id}
+                    )
+                    backfilled += 1
+                if backfilled:
+                    logger.info(f"Backfilled content_hash for {backfilled} reports")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                       format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    result = migrate_database()
+    if result:
+        logger.info("Migration script completed successfully")
+    else:
+        logger.error("Migration script failed")
@@ -43,6 +43,7 @@ class ReportCreate(ReportBase):
     file_path: str
     processing_status: str = "pending"
     page_count: Optional[int] = None
+    content_hash: Optional[str] = None
 
 
 class ReportUpdate(BaseModel):
@@ -59,6 +60,7 @@ class ReportInDB(ReportBase):
     upload_date: datetime
     processing_status: str
     page_count: Optional[int] = None
+    content_hash: Optional[str] = None
 
     class Config:
         from_attributes = True
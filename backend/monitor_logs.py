@@ -28,7 +28,7 @@ def monitor_logs(log_file_path=None, duration=300):
     if not log_file_path:
         # Check both possible log directories
         log_dirs = [
-            os.path.join(os.getcwd(), "backend", "logs"),
+            os.getenv("LOG_DIR") or os.path.join(os.getcwd(), "backend", "logs"),
             os.path.join(os.getcwd(), "backend", "backend", "logs")
         ]
         
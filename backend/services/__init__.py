@@ -12,6 +12,7 @@ from .pdf_processor import PDFProcessor
 from .analysis_service import AnalysisService
 from .nlp_utils import (
     chunk_text,
+    plan_chunks,
     extract_metrics_with_regex,
     extract_risk_factors_with_regex,
     extract_basic_entities,
@@ -27,6 +28,7 @@ __all__ = [
     'PDFProcessor',
     'AnalysisService',
     'chunk_text',
+    'plan_chunks',
     'extract_metrics_with_regex',
     'extract_risk_factors_with_regex',
     'extract_basic_entities',
@@ -1,9 +1,7 @@
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from dotenv import load_dotenv
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
 import re
 import json
 import requests
@@ -20,6 +18,11 @@ from services.nlp_utils import (
     fallback_sentiment_analysis,
     extract_basic_entities
 )
+from services.document import Document, as_document
+from services.section_index import get_section_index
+from services.extractive_summarizer import get_extractive_summarizer
+from services.service_registry import CredentialCheck, get_huggingface_service
+from services.inference_backends import REMOTE_BACKEND, LOCAL_TASKS
 
 # Load environment variables
 load_dotenv()
@@ -36,24 +39,35 @@ class AIService:
         """Initialize the AI service with dependencies and configuration."""
         self.huggingface_api_key = os.getenv("HUGGINGFACE_API_KEY")
         
-        # Import and initialize HuggingFaceService
-        from services.huggingface_service import HuggingFaceService
-        self.huggingface_service = HuggingFaceService()
+        # Model calls go through the process-wide HuggingFaceService
+        self.huggingface_service = get_huggingface_service()
         
         # Configure chunking parameters
         self.chunk_size = int(os.getenv("CHUNK_SIZE", "4000"))
         self.overlap_size = int(os.getenv("OVERLAP_SIZE", "200"))
         
-        # Validate API key
-        self.is_api_key_valid = self._validate_api_key()
+        # The API key is validated on first use, not here (the check is a whoami request)
+        self._api_key_check = CredentialCheck("Hugging Face Hub", self._validate_api_key)
         
         logger.info("AIService initialized")
     
-    def _validate_api_key(self):
+    @property
+    def is_api_key_valid(self) -> bool:
+        """Whether the API key works; validated on first use and cached (see CredentialCheck)."""
+        return self._api_key_check.is_valid
+    
+    @is_api_key_valid.setter
+    def is_api_key_valid(self, valid: bool) -> None:
+        self._api_key_check.set(valid)
+    
+    def _uses_local_models(self) -> bool:
+        """Whether any task runs on a local inference backend (which needs no API key)."""
+        return any(self.huggingface_service.task_backend(task) != REMOTE_BACKEND for task in LOCAL_TASKS)
+    
+    def _validate_api_key(self) -> bool:
         """Validate the Hugging Face API key using the huggingface-hub package."""
         if not self.huggingface_api_key:
             logger.warning("No Hugging Face API key provided.")
-            self.is_api_key_valid = False
             return False
             
         try:
@@ -69,13 +83,11 @@ class AIService:
             user_info = api.whoami()
             
             # If we get here without an exception, the key is valid
-            self.is_api_key_valid = True
             logger.info("Hugging Face API key validated successfully.")
             return True
             
         except ImportError:
             logger.warning("huggingface_hub package not installed. Cannot validate API key.")
-            self.is_api_key_valid = False
             return False
         except HfHubHTTPError as e:
             # This catches specific API errors like invalid tokens
@@ -83,14 +95,12 @@ class AIService:
                 logger.error("Invalid Hugging Face API key (unauthorized).")
             else:
                 logger.error(f"Hugging Face API error: {str(e)}")
-            self.is_api_key_valid = False
             return False
         except Exception as e:
             logger.error(f"Error validating Hugging Face API key: {str(e)}")
-            self.is_api_key_valid = False
             return False
     
-    def extract_financial_metrics(self, text: str) -> List[Dict[str, Any]]:
+    def extract_financial_metrics(self, text: Union[str, Document]) -> List[Dict[str, Any]]:
         """
         Extract financial metrics from text using regex patterns.
         
@@ -106,18 +116,18 @@ class AIService:
         metrics = extract_metrics_with_regex(text)
         
         # Post-process metrics for consistency
-        processed_metrics = []
-        for metric in metrics:
-            # Standardize metric name and category
-            metric["name"] = self._determine_metric_name(metric["name"], metric.get("context", ""))
-            metric["category"] = self._determine_category(metric["category"])
-            metric["unit"] = self._standardize_unit(metric["unit"])
-            
-            processed_metrics.append(metric)
+        processed_metrics = [self._standardize_metric(metric) for metric in metrics]
         
         logger.info(f"Extracted {len(processed_metrics)} financial metrics")
         return processed_metrics
     
+    def _standardize_metric(self, metric: Dict[str, Any]) -> Dict[str, Any]:
+        """Standardize the name, category and unit of an extracted metric."""
+        metric["name"] = self._determine_metric_name(metric["name"], metric.get("context", ""))
+        metric["category"] = self._determine_category(metric["category"])
+        metric["unit"] = self._standardize_unit(metric["unit"])
+        return metric
+    
     def _determine_metric_name(self, name: str, context: str) -> str:
         """
         Determine the standardized name for a financial metric.
@@ -235,7 +245,7 @@ class AIService:
         # Return the original category with proper capitalization
         return category.title()
     
-    def extract_risk_factors(self, text: str) -> List[str]:
+    def extract_risk_factors(self, text: Union[str, Document]) -> List[str]:
         """
         Extract risk factors from financial text.
         
@@ -245,11 +255,12 @@ class AIService:
         Returns:
             List of extracted risk factors
         """
+        text = as_document(text)
         logger.info(f"Extracting risk factors from text of length {len(text)}")
         
         try:
             # Delegate to HuggingFaceService for risk analysis
-            if self.is_api_key_valid:
+            if self.is_api_key_valid or self.huggingface_service.task_backend("text-generation") != REMOTE_BACKEND:
                 risk_analysis = self.huggingface_service.analyze_risk(text)
                 risks = risk_analysis.get("risks", [])
                 logger.info(f"Extracted {len(risks)} risk factors using HuggingFace models")
@@ -262,7 +273,7 @@ class AIService:
         logger.info(f"Extracted {len(risks)} risk factors using fallback regex method")
         return risks
     
-    def generate_business_outlook(self, text: str) -> str:
+    def generate_business_outlook(self, text: Union[str, Document]) -> str:
         """
         Generate a business outlook summary from financial text.
         
@@ -272,6 +283,7 @@ class AIService:
         Returns:
             Business outlook summary
         """
+        text = as_document(text)
         logger.info(f"Generating business outlook from text of length {len(text)}")
         
         # Extract outlook statements using regex patterns
@@ -291,7 +303,7 @@ class AIService:
         logger.info(f"Generated business outlook of length {len(outlook)}")
         return outlook
     
-    def _extract_outlook_statements(self, text: str) -> str:
+    def _extract_outlook_statements(self, text: Union[str, Document]) -> str:
         """
         Extract outlook statements from financial text using regex patterns.
         
@@ -311,12 +323,22 @@ class AIService:
             r'guidance'
         ]
         
+        document = as_document(text)
+        
+        # Only read the outlook sections (or, without any, the MD&A) of the section index
+        section_index = get_section_index(document)
+        regions = [(section["start"], section["end"]) for section in section_index.find("outlook")]
+        if not regions:
+            mdna_span = section_index.span("mdna")
+            regions = [mdna_span] if mdna_span else [(0, len(document))]
+        
         # Extract text after outlook headers
         outlook_statements = []
         for header in outlook_headers:
             pattern = re.compile(f'(?i){header}[:\\s]+(.*?)(?=\\n\\n|\\.$)', re.DOTALL)
-            matches = pattern.findall(text)
-            outlook_statements.extend(matches)
+            for start, end in regions:
+                matches = pattern.findall(document.text, start, end)
+                outlook_statements.extend(matches)
         
         # If no headers found, look for outlook keywords in sentences
         if not outlook_statements:
@@ -332,50 +354,67 @@ class AIService:
                 r'next year'
             ]
             
-            sentences = re.split(r'(?<=[.!?])\s+', text)
-            for sentence in sentences:
-                if any(re.search(f'(?i){keyword}', sentence) for keyword in outlook_keywords):
-                    outlook_statements.append(sentence)
+            # One pass over each region; matches are mapped to the document's sentences
+            keyword_pattern = re.compile('|'.join(outlook_keywords), re.IGNORECASE)
+            sentence_indices = []
+            for start, end in regions:
+                for match in keyword_pattern.finditer(document.text, start, end):
+                    sentence_index = document.sentence_index_at(match.start())
+                    if not sentence_indices or sentence_indices[-1] != sentence_index:
+                        sentence_indices.append(sentence_index)
+            
+            for sentence_index in sentence_indices:
+                start, end = document.sentence_spans[sentence_index]
+                outlook_statements.append(document.text[start:end])
         
         # Combine all outlook statements
         outlook = " ".join(outlook_statements)
         return outlook
     
-    def generate_summary(self, text: str, summary_type: str = "executive") -> str:
+    def generate_summary(
+        self,
+        text: Union[str, Document],
+        summary_type: str = "executive",
+        engine: Optional[str] = None
+    ) -> str:
         """
         Generate a summary of financial text.
         
         Args:
             text: Financial text to summarize
             summary_type: Type of summary to generate ("executive", "brief", etc.)
+            engine: "auto", "model" or "extractive" (defaults to SUMMARY_ENGINE);
+                the extractive engine makes no inference calls
             
         Returns:
             Generated summary as a string
         """
+        text = as_document(text)
         logger.info(f"Generating {summary_type} summary for text of length {len(text)}")
         
-        try:
-            # Extract metrics to include in the summary
-            metrics = self.extract_financial_metrics(text)
-            
-            # Use HuggingFaceService to generate the summary
-            summary_result = self.huggingface_service.generate_summary(text, metrics)
-            summary = summary_result.get("summary", "")
-            
-            if summary:
-                logger.info(f"Generated {summary_type} summary of length {len(summary)} using HuggingFace")
-                return summary
-        except Exception as e:
-            logger.error(f"Error generating summary with HuggingFace: {str(e)}")
+        if self.huggingface_service.resolve_summary_engine(engine) == "model":
+            try:
+                # Extract metrics to include in the summary
+                metrics = self.extract_financial_metrics(text)
+                
+                # Use HuggingFaceService to generate the summary
+                summary_result = self.huggingface_service.generate_summary(text, metrics, engine="model")
+                summary = summary_result.get("summary", "")
+                
+                if summary:
+                    logger.info(f"Generated {summary_type} summary of length {len(summary)} using HuggingFace")
+                    return summary
+            except Exception as e:
+                logger.error(f"Error generating summary with HuggingFace: {str(e)}")
         
-        # Fallback to extractive summarization
+        # Extractive summarization (selected engine, or fallback)
         summary = self._fallback_summary(text, summary_type)
-        logger.info(f"Generated {summary_type} summary of length {len(summary)} using fallback method")
+        logger.info(f"Generated {summary_type} summary of length {len(summary)} using extractive method")
         return summary
     
-    def _fallback_summary(self, text: str, summary_type: str) -> str:
+    def _fallback_summary(self, text: Union[str, Document], summary_type: str) -> str:
         """
-        Generate a fallback summary when model-based summarization fails.
+        Generate an extractive summary when model-based summarization fails or is not selected.
         
         Args:
             text: Text to summarize
@@ -384,52 +423,31 @@ class AIService:
         Returns:
             Extractive summary
         """
-        logger.info(f"Using fallback method for {summary_type} summary generation")
-        
-        # Split into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        logger.info(f"Using extractive method for {summary_type} summary generation")
         
-        # Define important keywords based on summary type
+        # Words the summary leans towards, based on summary type
         if summary_type == "executive":
-            important_keywords = [
+            focus_terms = [
                 "key", "important", "significant", "highlight", "executive", "summary",
                 "revenue", "profit", "growth", "increase", "decrease", "performance",
                 "fiscal year", "quarter", "annual", "financial", "earnings"
             ]
         elif summary_type == "brief":
-            important_keywords = [
+            focus_terms = [
                 "summary", "overview", "brief", "highlight",
                 "report", "financial", "statement"
             ]
         else:
-            important_keywords = [
+            focus_terms = [
                 "key", "important", "significant", "highlight", "summary", "report", "financial"
             ]
         
-        # Score sentences based on importance
-        sentence_scores = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 10 or len(sentence) > 200:
-                continue
-                
-            score = 0
-            for keyword in important_keywords:
-                if keyword in sentence.lower():
-                    score += 1
-            
-            sentence_scores.append((sentence, score))
-        
-        # Sort by score and take top sentences
-        sentence_scores.sort(key=lambda x: x[1], reverse=True)
+        # Rank sentences by centrality, keep the top ones in document order
         num_sentences = 10 if summary_type == "executive" else 5
-        top_sentences = [s[0] for s in sentence_scores[:num_sentences]]
-        
-        # Combine into summary
-        summary = " ".join(top_sentences)
-        return summary
+        result = get_extractive_summarizer().summarize(text, max_sentences=num_sentences, focus_terms=focus_terms)
+        return result["summary"]
     
-    def analyze_financial_text(self, text: str) -> Dict[str, Any]:
+    def analyze_financial_text(self, text: Union[str, Document]) -> Dict[str, Any]:
         """
         Analyze financial text to extract insights, metrics, and summaries.
         
@@ -439,6 +457,7 @@ class AIService:
         Returns:
             Dictionary with analysis results
         """
+        text = as_document(text)
         logger.info(f"Analyzing financial text of length {len(text)}")
         
         # Track component errors
@@ -533,22 +552,24 @@ class AIService:
             })
         }
     
-    def analyze_report(self, report_text: str) -> Dict[str, Any]:
+    def analyze_report(self, report_text: Union[str, Document]) -> Dict[str, Any]:
         """
         Analyze a financial report and extract insights.
         
         Args:
-            report_text: Text of the financial report
+            report_text: Text of the financial report, or a Document whose
+                shared views (lowercased text, sentences, chunks) all stages reuse
             
         Returns:
             Dictionary with analysis results
         """
         start_time = time.time()
+        report_text = as_document(report_text)
         logger.info(f"Starting report analysis ({len(report_text)} characters)")
         
         try:
-            # Check if API key is valid
-            if not self.is_api_key_valid:
+            # Check if API key is valid (or models run locally)
+            if not self.is_api_key_valid and not self._uses_local_models():
                 logger.warning("No valid Hugging Face API key. Using comprehensive fallback methods.")
                 analysis_result = self._comprehensive_fallback_analysis(report_text)
                 
@@ -610,7 +631,7 @@ class AIService:
                     "model_used": "none (all methods failed)"
                 }
     
-    def _comprehensive_fallback_analysis(self, text: str) -> Dict[str, Any]:
+    def _comprehensive_fallback_analysis(self, text: Union[str, Document]) -> Dict[str, Any]:
         """
         Comprehensive fallback analysis when external services are unavailable.
         
@@ -621,6 +642,7 @@ class AIService:
             Dictionary with analysis results
         """
         logger.info("Using comprehensive fallback analysis as HuggingFace services are unavailable")
+        text = as_document(text)
         
         # Start timing
         start_time = time.time()
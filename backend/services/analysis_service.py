@@ -1,6 +1,7 @@
 import os
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from sqlalchemy.orm import Session
 from datetime import datetime
 import PyPDF2
@@ -10,10 +11,12 @@ import traceback
 import time
 
 from services.pdf_service import PDFService
-from services.ai_service import AIService
+from services.service_registry import get_ai_service
 from services.db_service import DBService
+from services.document import Document, as_document, page_offsets_from_texts
+from services.lexicon_sentiment import get_lexicon_sentiment_analyzer, sentiment_distribution
 from models.schemas import (
-    CompanyCreate, ReportCreate, MetricCreate, SummaryCreate
+    CompanyCreate, ReportCreate, MetricCreate, SummaryCreate, SentimentAnalysisCreate
 )
 
 logger = logging.getLogger(__name__)
@@ -23,8 +26,9 @@ class AnalysisService:
     
     def __init__(self):
         self.pdf_service = PDFService()
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
         self.db_service = DBService()
+        self.sentiment_analyzer = get_lexicon_sentiment_analyzer()
         self.upload_dir = os.path.join(os.getcwd(), "uploads")
         
         # Create uploads directory if it doesn't exist
@@ -78,10 +82,17 @@ class AnalysisService:
             logger.info(f"PIPELINE: Reading PDF file: {report.file_path}")
             
             try:
+                # Page offsets let the analysis stages map text back to pages
+                page_offsets = None
+                
                 # Extract text from PDF
                 try:
-                    text = self.pdf_service.extract_text_from_pdf(report.file_path)
+                    with self.pdf_service.open_page_store(report.file_path) as page_store:
+                        text = self.pdf_service.extract_text_from_pdf(report.file_path, page_store=page_store)
+                        page_offsets = page_offsets_from_texts(page_store.iter_texts())
+                        extraction_stats = page_store.get_stats()
                     logger.info(f"PIPELINE: Extracted {len(text)} characters from PDF")
+                    logger.info(f"PIPELINE: Parsed {extraction_stats['text_pages_parsed']}/{extraction_stats['page_count']} pages for report {report_id} with {extraction_stats['text_backend']}")
                 except Exception as pdf_error:
                     logger.error(f"PIPELINE: Error extracting text from PDF: {str(pdf_error)}")
                     
@@ -110,7 +121,7 @@ class AnalysisService:
                 analysis_start_time = time.time()
                 logger.info(f"PIPELINE: Starting AI analysis of {len(text)} characters")
                 
-                analysis_result = await self.analyze_report_text(text, report_id)
+                analysis_result = await self.analyze_report_text(Document(text, page_offsets=page_offsets), report_id)
                 
                 # Performance logging for AI analysis
                 analysis_time = time.time() - analysis_start_time
@@ -196,26 +207,31 @@ class AnalysisService:
                 logger.error(f"Failed to save uploaded file: {str(e)}")
                 raise Exception(f"Failed to save uploaded file: {str(e)}")
             
-            # Extract text from PDF
-            try:
-                text = self.pdf_service.extract_text_from_pdf(file_path)
-                if not text or len(text.strip()) < 100:
-                    logger.warning(f"Extracted text is too short or empty: {len(text) if text else 0} chars")
-                    raise Exception("The PDF appears to be empty or could not be properly read")
-                logger.info(f"Successfully extracted {len(text)} characters of text from PDF")
-            except Exception as e:
-                logger.error(f"Failed to extract text from PDF: {str(e)}")
-                raise Exception(f"Failed to extract text from PDF: {str(e)}")
-            
-            # Get PDF metadata
-            try:
-                metadata = self.pdf_service.get_pdf_metadata(file_path)
-                page_count = metadata.get('page_count', 0)
-                logger.info(f"PDF metadata extracted: {page_count} pages")
-            except Exception as e:
-                logger.error(f"Failed to extract PDF metadata: {str(e)}")
-                # Not critical, continue with default values
-                page_count = 0
+            # Text and metadata share one page store so the PDF is only parsed once
+            with self.pdf_service.open_page_store(file_path) as page_store:
+                # Extract text from PDF
+                try:
+                    text = self.pdf_service.extract_text_from_pdf(file_path, page_store=page_store)
+                    if not text or len(text.strip()) < 100:
+                        logger.warning(f"Extracted text is too short or empty: {len(text) if text else 0} chars")
+                        raise Exception("The PDF appears to be empty or could not be properly read")
+                    document = Document(text, page_offsets=page_offsets_from_texts(page_store.iter_texts()))
+                    logger.info(f"Successfully extracted {len(text)} characters of text from PDF")
+                except Exception as e:
+                    logger.error(f"Failed to extract text from PDF: {str(e)}")
+                    raise Exception(f"Failed to extract text from PDF: {str(e)}")
+                
+                # Get PDF metadata
+                try:
+                    metadata = self.pdf_service.get_pdf_metadata(file_path, page_store=page_store)
+                    page_count = metadata.get('page_count', 0)
+                    logger.info(f"PDF metadata extracted: {page_count} pages")
+                except Exception as e:
+                    logger.error(f"Failed to extract PDF metadata: {str(e)}")
+                    # Not critical, continue with default values
+                    page_count = 0
+                
+                logger.info(f"Parsed {page_store.text_pages_parsed} pages for {filename} with {page_store.text_backend}")
             
             # Database operations - use transaction
             try:
@@ -252,7 +268,7 @@ class AnalysisService:
                 
                 # Start AI analysis
                 logger.info(f"Starting AI analysis for report ID: {report.id}")
-                analysis_result = await self.analyze_report_text(text, report.id)
+                analysis_result = await self.analyze_report_text(document, report.id)
                 
                 # Begin a new transaction for storing analysis results
                 db.begin_nested()
@@ -298,8 +314,11 @@ class AnalysisService:
                 logger.info(f"Keeping file for debugging: {file_path}")
             raise
     
-    async def analyze_report_text(self, text: str, report_id: int) -> Dict[str, Any]:
-        """Analyze the text content of a report using AI services."""
+    async def analyze_report_text(self, text: Union[str, Document], report_id: int) -> Dict[str, Any]:
+        """Analyze the text content of a report (plain text or a Document) using AI services."""
+        # All stages share one Document so its lowercased copy, sentences and chunks are computed once
+        document = as_document(text)
+        text = document.text
         try:
             logger.info(f"PIPELINE: AI ANALYSIS - Starting report {report_id} text analysis")
             logger.info(f"PIPELINE: AI ANALYSIS - Text length: {len(text)} characters")
@@ -308,13 +327,18 @@ class AnalysisService:
             text_sample = text[:500] + "..." if len(text) > 500 else text
             logger.debug(f"PIPELINE: AI ANALYSIS - Text sample: {text_sample}")
             
+            # Lexicon sentiment per page and section is cheap, so it runs on every report
+            lexicon_sentiment = self._analyze_lexicon_sentiment(document, report_id)
+            
             # Use the new comprehensive analyze_report method from AIService
             try:
                 logger.info(f"PIPELINE: AI ANALYSIS - Using comprehensive analysis with FinBERT model")
-                analysis_result = self.ai_service.analyze_report(text)
+                # The analysis makes blocking inference calls, so it runs in a worker thread
+                analysis_result = await asyncio.to_thread(self.ai_service.analyze_report, document)
                 
                 # Add report_id to the result
                 analysis_result["report_id"] = report_id
+                analysis_result["lexicon_sentiment"] = lexicon_sentiment
                 
                 # Log analysis results
                 logger.info(f"PIPELINE: AI ANALYSIS - Analysis completed with status: {analysis_result.get('status', 'unknown')}")
@@ -334,7 +358,9 @@ class AnalysisService:
                 logger.info(f"PIPELINE: AI ANALYSIS - Falling back to component analysis")
                 
                 # If the comprehensive analysis fails, try individual components
-                return self._fallback_component_analysis(text, report_id)
+                analysis_result = await asyncio.to_thread(self._fallback_component_analysis, document, report_id)
+                analysis_result["lexicon_sentiment"] = lexicon_sentiment
+                return analysis_result
             
         except Exception as e:
             logger.error(f"PIPELINE: AI ANALYSIS - CRITICAL ERROR for report {report_id}: {str(e)}")
@@ -353,7 +379,49 @@ class AnalysisService:
                 }
             }
     
-    def _fallback_component_analysis(self, text: str, report_id: int) -> Dict[str, Any]:
+    def _analyze_lexicon_sentiment(self, document: Document, report_id: int) -> Optional[Dict[str, Any]]:
+        """Score lexicon sentiment of a report per page and section (None if it fails)."""
+        try:
+            start_time = time.time()
+            lexicon_sentiment = self.sentiment_analyzer.analyze(document)
+            logger.info(
+                f"PIPELINE: LEXICON SENTIMENT - {lexicon_sentiment['document']['sentiment']} "
+                f"({len(lexicon_sentiment['sections'])} sections, {len(lexicon_sentiment['pages'])} pages) "
+                f"in {time.time() - start_time:.3f} seconds for report {report_id}"
+            )
+            return lexicon_sentiment
+        except Exception as e:
+            logger.error(f"PIPELINE: LEXICON SENTIMENT - Error for report {report_id}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _lexicon_sentiment_rows(report_id: int, lexicon_sentiment: Optional[Dict[str, Any]]) -> List[SentimentAnalysisCreate]:
+        """Build SentimentAnalysis rows: the whole report (no section), each section, and each page with lexicon hits."""
+        if not lexicon_sentiment:
+            return []
+        
+        units = [(None, lexicon_sentiment["document"])]
+        units.extend(lexicon_sentiment["sections"].items())
+        units.extend(
+            (f"page_{page['page_number']}", page)
+            for page in lexicon_sentiment["pages"] if page["positive"] or page["negative"] or page["uncertainty"]
+        )
+        return [
+            SentimentAnalysisCreate(
+                report_id=report_id,
+                section=section,
+                sentiment=scores["sentiment"],
+                score=scores["score"],
+                distribution=sentiment_distribution(scores),
+                insight=(
+                    f"{scores['positive']} positive, {scores['negative']} negative and "
+                    f"{scores['uncertainty']} uncertainty terms in {scores['words']} words"
+                )
+            )
+            for section, scores in units
+        ]
+    
+    def _fallback_component_analysis(self, text: Union[str, Document], report_id: int) -> Dict[str, Any]:
         """Fallback to component-by-component analysis if comprehensive analysis fails."""
         logger.info(f"Using fallback component analysis for report ID: {report_id}")
         analysis_result = {
@@ -580,6 +648,12 @@ class AnalysisService:
             else:
                 logger.warning(f"No summaries to store for report ID: {report_id}")
             
+            # Lexicon sentiment of the report, its sections and pages
+            sentiment_rows = self._lexicon_sentiment_rows(report_id, analysis.get("lexicon_sentiment"))
+            if sentiment_rows:
+                self.db_service.create_sentiment_analyses_batch(db, sentiment_rows)
+                logger.info(f"Stored {len(sentiment_rows)} sentiment analyses for report ID: {report_id}")
+            
             # Update report status based on analysis status
             status = analysis.get("status", "completed")
             if status == "error" or status == "failed":
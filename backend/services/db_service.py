@@ -133,7 +133,8 @@ class DBService:
                 file_name=report.file_name,
                 upload_date=datetime.now(),
                 processing_status=report.processing_status,
-                page_count=report.page_count
+                page_count=report.page_count,
+                content_hash=report.content_hash
             )
             db.add(db_report)
             db.commit()
@@ -186,6 +187,107 @@ class DBService:
             logger.error(f"Error getting report: {str(e)}")
             raise
     
+    @staticmethod
+    def get_report_by_content_hash(db: Session, content_hash: str) -> Optional[Report]:
+        """
+        Get the report previously uploaded with the same PDF bytes.
+        
+        Completed reports are preferred over reports still being processed;
+        failed reports are never returned.
+        
+        Args:
+            db: Database session
+            content_hash: SHA-256 of the PDF bytes
+            
+        Returns:
+            The most recent matching report, or None
+        """
+        try:
+            reports = (
+                db.query(Report)
+                .filter(Report.content_hash == content_hash, Report.processing_status != "failed")
+                .order_by(desc(Report.upload_date))
+                .all()
+            )
+            for report in reports:
+                if report.processing_status == "completed":
+                    return report
+            return reports[0] if reports else None
+        except Exception as e:
+            logger.error(f"Error getting report by content hash: {str(e)}")
+            raise
+    
+    @staticmethod
+    def clone_report_analysis(db: Session, source_report_id: int, target_report_id: int) -> Optional[Report]:
+        """
+        Copy the analysis results of a report onto another report of the same PDF.
+        
+        Metrics, summaries, entities, sentiment analyses and risk assessments are
+        copied in one transaction and the target report is marked completed, so
+        a re-uploaded filing does not go through extraction and inference again.
+        
+        Args:
+            db: Database session
+            source_report_id: ID of the completed report to copy from
+            target_report_id: ID of the report to copy onto
+            
+        Returns:
+            Updated target report, or None if either report was not found
+        """
+        try:
+            source = db.query(Report).filter(Report.id == source_report_id).first()
+            target = db.query(Report).filter(Report.id == target_report_id).first()
+            if not source or not target:
+                return None
+            
+            for metric in source.metrics:
+                db.add(Metric(
+                    report_id=target.id,
+                    name=metric.name,
+                    value=metric.value,
+                    unit=metric.unit,
+                    category=metric.category
+                ))
+            for summary in source.summaries:
+                db.add(Summary(report_id=target.id, category=summary.category, content=summary.content))
+            for entity in source.entities:
+                db.add(Entity(
+                    report_id=target.id,
+                    entity_type=entity.entity_type,
+                    text=entity.text,
+                    score=entity.score,
+                    section=entity.section
+                ))
+            for sentiment in source.sentiment_analyses:
+                db.add(SentimentAnalysis(
+                    report_id=target.id,
+                    section=sentiment.section,
+                    sentiment=sentiment.sentiment,
+                    score=sentiment.score,
+                    distribution=sentiment.distribution,
+                    insight=sentiment.insight
+                ))
+            for risk in source.risk_assessments:
+                db.add(RiskAssessment(
+                    report_id=target.id,
+                    overall_score=risk.overall_score,
+                    categories=risk.categories,
+                    primary_factors=risk.primary_factors,
+                    insight=risk.insight
+                ))
+            
+            target.page_count = source.page_count
+            target.processing_status = "completed"
+            
+            db.commit()
+            db.refresh(target)
+            logger.info(f"Cloned analysis of report {source.id} onto report {target.id}")
+            return target
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error cloning report analysis: {str(e)}")
+            raise
+    
     @staticmethod
     def get_reports_by_company(db: Session, company_id: int, skip: int = 0, limit: int = 100) -> List[Report]:
         """Get all reports for a company with pagination."""
@@ -642,6 +744,32 @@ class DBService:
             logger.error(f"Error creating sentiment analysis: {str(e)}")
             raise
     
+    @staticmethod
+    def create_sentiment_analyses_batch(
+        db: Session, 
+        sentiments: List[SentimentAnalysisCreate]
+    ) -> List[SentimentAnalysis]:
+        """Create multiple sentiment analyses (e.g. per section and page) in one commit."""
+        try:
+            db_sentiments = [
+                SentimentAnalysis(
+                    report_id=sentiment.report_id,
+                    section=sentiment.section,
+                    sentiment=sentiment.sentiment,
+                    score=sentiment.score,
+                    distribution=sentiment.distribution,
+                    insight=sentiment.insight
+                )
+                for sentiment in sentiments
+            ]
+            db.add_all(db_sentiments)
+            db.commit()
+            return db_sentiments
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating sentiment analyses batch: {str(e)}")
+            raise
+    
     @staticmethod
     def create_risk_assessment(db: Session, risk: RiskAssessmentCreate) -> RiskAssessment:
         """Create a new risk assessment."""
@@ -669,8 +797,13 @@ class DBService:
     
     @staticmethod
     def get_sentiment_analysis_by_report_id(db: Session, report_id: int) -> Optional[SentimentAnalysis]:
-        """Get sentiment analysis for a report."""
-        return db.query(SentimentAnalysis).filter(SentimentAnalysis.report_id == report_id).first()
+        """Get the sentiment analysis of a whole report (rows per section or page come after it)."""
+        return (
+            db.query(SentimentAnalysis)
+            .filter(SentimentAnalysis.report_id == report_id)
+            .order_by(SentimentAnalysis.section.isnot(None), SentimentAnalysis.id)
+            .first()
+        )
     
     @staticmethod
     def get_risk_assessment_by_report_id(db: Session, report_id: int) -> Optional[RiskAssessment]:
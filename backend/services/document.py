@@ -0,0 +1,162 @@
+import re
+import bisect
+import logging
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Same sentence boundary the analysis code used with re.split
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Separator between page texts in the full document text (see PageStore.get_full_text)
+PAGE_SEPARATOR = "\n\n"
+
+Span = Tuple[int, int]
+
+
+class Document:
+    """
+    Report text with lazily computed views shared by all analysis stages.
+
+    The raw text is kept once; the lowercased copy, page offsets, sentence
+    offsets and chunk plans are computed on first use and then reused, so
+    stages that need them no longer lowercase, re-split or re-chunk the full
+    text themselves. Sentences and chunks are kept as (start, end) offsets
+    into the text and only sliced out when a stage actually reads them.
+
+    Usage:
+        document = Document.from_pages(page_texts)
+        for start, end in document.sentence_spans:
+            sentence_lower = document.lower[start:end]
+    """
+
+    __slots__ = ("text", "_lower", "_page_offsets", "_sentence_spans", "_chunk_plans", "_derived")
+
+    def __init__(self, text: str, page_offsets: Optional[List[int]] = None):
+        """
+        Args:
+            text: Full document text
+            page_offsets: Start offset of every page in the text (a single
+                page starting at 0 if unknown)
+        """
+        self.text = text or ""
+        self._lower: Optional[str] = None
+        self._page_offsets = page_offsets
+        self._sentence_spans: Optional[List[Span]] = None
+        self._chunk_plans: Dict[Tuple[Optional[int], int, int], List[Span]] = {}
+        self._derived: Dict[str, object] = {}
+
+    @classmethod
+    def from_pages(cls, page_texts: Iterable[str]) -> "Document":
+        """Build a document from page texts, joined the same way as PageStore.get_full_text."""
+        page_texts = [text or "" for text in page_texts]
+        return cls(
+            "".join(text + PAGE_SEPARATOR for text in page_texts),
+            page_offsets=page_offsets_from_texts(page_texts)
+        )
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def lower(self) -> str:
+        """
+        Lowercased copy of the text (computed once).
+
+        The copy always has the same length as the text, so offsets into the
+        text (sentences, chunks, matches) can be used on it directly.
+        """
+        if self._lower is None:
+            lower = self.text.lower()
+            if len(lower) != len(self.text):
+                # A few characters (e.g. "İ") lowercase to several; keep those as they are
+                lower = "".join(c if len(c.lower()) != 1 else c.lower() for c in self.text)
+            self._lower = lower
+        return self._lower
+
+    @property
+    def page_offsets(self) -> List[int]:
+        """Start offset of every page in the text."""
+        if self._page_offsets is None:
+            self._page_offsets = [0]
+        return self._page_offsets
+
+    def page_number_at(self, offset: int) -> int:
+        """Get the 1-indexed page holding a text offset."""
+        return bisect.bisect_right(self.page_offsets, offset)
+
+    @property
+    def sentence_spans(self) -> List[Span]:
+        """(start, end) offsets of every sentence (computed once)."""
+        if self._sentence_spans is None:
+            spans = []
+            start = 0
+            for match in SENTENCE_BOUNDARY_PATTERN.finditer(self.text):
+                spans.append((start, match.start()))
+                start = match.end()
+            spans.append((start, len(self.text)))
+            self._sentence_spans = spans
+        return self._sentence_spans
+
+    def iter_sentences(self) -> Iterator[str]:
+        """Yield sentence texts, sliced out one at a time."""
+        for start, end in self.sentence_spans:
+            yield self.text[start:end]
+
+    def sentence_index_at(self, offset: int) -> int:
+        """Get the index of the sentence holding (or preceding) a text offset."""
+        return max(bisect.bisect_right(self.sentence_spans, (offset, float("inf"))) - 1, 0)
+
+    def chunk_plan(self, chunk_size: Optional[int] = None, overlap_size: int = 200, max_tokens: int = 1024) -> List[Span]:
+        """
+        Get the (start, end) offsets of the model input chunks (computed once per setting).
+
+        Args:
+            chunk_size: Optional maximum size of each chunk in characters
+            overlap_size: Number of characters to overlap between chunks
+            max_tokens: Maximum number of tokens per chunk
+
+        Returns:
+            Chunk spans in document order
+        """
+        key = (chunk_size, overlap_size, max_tokens)
+        plan = self._chunk_plans.get(key)
+        if plan is None:
+            # Imported here: nlp_utils accepts Documents and imports this module
+            from services.nlp_utils import plan_chunks
+            plan = plan_chunks(self.text, chunk_size, overlap_size, max_tokens)
+            self._chunk_plans[key] = plan
+        return plan
+
+    def iter_chunks(self, chunk_size: Optional[int] = None, overlap_size: int = 200, max_tokens: int = 1024) -> Iterator[str]:
+        """Yield the chunks of the chunk plan, sliced out one at a time."""
+        for start, end in self.chunk_plan(chunk_size, overlap_size, max_tokens):
+            yield self.text[start:end]
+
+    def get_derived(self, key: str) -> Optional[object]:
+        """Get a result previously computed from this document (None if absent)."""
+        return self._derived.get(key)
+
+    def set_derived(self, key: str, value: object) -> None:
+        """Record a result computed from this document for later stages."""
+        self._derived[key] = value
+
+
+def page_offsets_from_texts(page_texts: Iterable[str], separator: str = PAGE_SEPARATOR) -> List[int]:
+    """Compute page start offsets for page texts joined with a trailing separator each (read one at a time)."""
+    offsets = []
+    offset = 0
+    for text in page_texts:
+        offsets.append(offset)
+        offset += len(text) + len(separator)
+    return offsets or [0]
+
+
+def as_document(text: Union[str, Document, None]) -> Document:
+    """Wrap plain text in a Document; Documents are returned unchanged."""
+    if isinstance(text, Document):
+        return text
+    return Document(text or "")
@@ -0,0 +1,171 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cache entries changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+
+class ExtractionCache:
+    """
+    Persistent, content-addressed cache of PDF extraction results.
+
+    Entries are keyed by the SHA-256 of the PDF bytes and the text backend
+    that extracted them, so a report that is re-uploaded under another name
+    (or reprocessed after a failure) reuses the per-page text and tables,
+    metadata and financial page detection of the earlier run, while text from
+    one backend is never served after PDF_TEXT_BACKEND changes. Each entry is
+    one JSON file; the cache directory is kept under a size limit by evicting
+    the least recently used entries (by file mtime, which is refreshed on
+    every hit).
+
+    Configuration (environment):
+        EXTRACTION_CACHE_ENABLED: "true" (default) or "false"
+        EXTRACTION_CACHE_DIR: Cache directory (default ./cache/extraction)
+        EXTRACTION_CACHE_MAX_MB: Maximum total size of the cache (default 512)
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.getenv(
+            "EXTRACTION_CACHE_DIR",
+            os.path.join(os.getcwd(), "cache", "extraction")
+        )
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("EXTRACTION_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ExtractionCache"]:
+        """Create a cache from environment settings, or None if caching is disabled."""
+        if os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        return cls()
+
+    def _entry_path(self, content_hash: str, text_backend: Optional[str] = None) -> str:
+        key = f"{content_hash}.{text_backend}" if text_backend else content_hash
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, content_hash: str, text_backend: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load the cache entry for a document.
+
+        Args:
+            content_hash: SHA-256 of the PDF bytes
+            text_backend: Text backend the entry was extracted with
+
+        Returns:
+            The cached entry, or None on a miss
+        """
+        entry_path = self._entry_path(content_hash, text_backend)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {content_hash}: {str(e)}")
+            self._remove(entry_path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Refresh the entry's position in the LRU order
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, content_hash: str, entry: Dict[str, Any], text_backend: Optional[str] = None) -> None:
+        """
+        Store the cache entry for a document, then enforce the size limit.
+
+        Args:
+            content_hash: SHA-256 of the PDF bytes
+            entry: JSON-serializable extraction results
+            text_backend: Text backend the entry was extracted with
+        """
+        entry = dict(entry, version=CACHE_FORMAT_VERSION)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file and rename so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # default=str covers numpy scalars that can appear in extracted tables
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, self._entry_path(content_hash, text_backend))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def _list_entries(self) -> List[Tuple[float, int, str]]:
+        """List (mtime, size, path) of all cache entries, oldest first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = self._list_entries()
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total_size <= self.max_bytes:
+                    break
+                self._remove(path)
+                total_size -= size
+                self.evictions += 1
+                logger.info(f"Evicted extraction cache entry {os.path.basename(path)}")
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current size of the cache."""
+        entries = self._list_entries()
+
+        return {
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,311 @@
+import logging
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from services.document import Document, as_document
+
+logger = logging.getLogger(__name__)
+
+# Everything but letters separates words
+_SEPARATORS = str.maketrans({chr(c): " " for c in range(128) if not chr(c).isalpha()})
+
+# Words that carry no topic; they are left out of the sentence vectors
+STOP_WORDS = frozenset("""
+    a about above after again against all also am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have having
+    he her here hers him his how i if in into is it its itself just may me might more most must my no nor not
+    now of off on once only or other our ours out over own same shall she should so some such than that the
+    their theirs them then there these they this those through to too under until up upon very was we were
+    what when where which while who whom why will with within without would you your yours
+""".split())
+
+# Words shorter than this are left out as well (units, initials, roman numerals)
+MIN_WORD_LENGTH = 3
+
+
+class SentenceMatrix:
+    """
+    Sparse TF-IDF vectors of the candidate sentences of a document.
+
+    The matrix is stored as coordinate arrays sorted by row (row, column,
+    value), which is all the centrality iteration and the diversity check
+    need; rows are L2-normalized, so a dot product of two rows is their
+    cosine similarity.
+    """
+
+    def __init__(
+        self,
+        spans: List[Tuple[int, int]],
+        rows: np.ndarray,
+        columns: np.ndarray,
+        values: np.ndarray,
+        vocabulary: Dict[str, int]
+    ):
+        self.spans = spans
+        self.rows = rows
+        self.columns = columns
+        self.values = values
+        self.vocabulary = vocabulary
+        self.row_starts = np.searchsorted(rows, np.arange(len(spans) + 1))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.spans), len(self.vocabulary)
+
+    def row(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (columns, values) of one sentence vector."""
+        start, end = self.row_starts[index], self.row_starts[index + 1]
+        return self.columns[start:end], self.values[start:end]
+
+    def multiply(self, vector: np.ndarray) -> np.ndarray:
+        """Get X @ vector for a vector over the vocabulary."""
+        return np.bincount(self.rows, weights=self.values * vector[self.columns], minlength=self.shape[0])
+
+    def multiply_transposed(self, vector: np.ndarray) -> np.ndarray:
+        """Get X.T @ vector for a vector over the sentences."""
+        return np.bincount(self.columns, weights=self.values * vector[self.rows], minlength=self.shape[1])
+
+
+class ExtractiveSummarizer:
+    """
+    Summarize a document locally by picking its most central sentences.
+
+    Candidate sentences (from the document's shared sentence offsets) become
+    sparse TF-IDF vectors; sentences are ranked with TextRank, i.e. PageRank
+    over the graph of their cosine similarities. The similarity graph is
+    never built: every power iteration multiplies by X and X.T in NumPy, so
+    a step costs one pass over the non-zero entries however many sentences
+    the report has. Sentences are then picked by rank, skipping those too
+    similar to an already picked one or over the length budget, and joined
+    in document order. No model or inference call is involved.
+
+    Usage:
+        result = get_extractive_summarizer().summarize(document, max_sentences=10)
+        result["summary"], result["sentences"]
+    """
+
+    def __init__(
+        self,
+        damping: float = 0.85,
+        max_iterations: int = 100,
+        tolerance: float = 1e-6,
+        min_sentence_chars: int = 40,
+        max_sentence_chars: int = 400,
+        diversity_threshold: float = 0.5
+    ):
+        """
+        Args:
+            damping: PageRank damping factor
+            max_iterations: Maximum number of power iterations
+            tolerance: L1 change of the scores at which the iteration stops
+            min_sentence_chars: Shorter sentences (headings, fragments) are not candidates
+            max_sentence_chars: Longer sentences (run-on tables, lists) are not candidates;
+                when no sentence fits both limits (a short text), every sentence is a candidate
+            diversity_threshold: A sentence whose cosine similarity to an
+                already picked sentence exceeds this is skipped
+        """
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.min_sentence_chars = min_sentence_chars
+        self.max_sentence_chars = max_sentence_chars
+        self.diversity_threshold = diversity_threshold
+        self._cache_key = f"sentence_matrix:{id(self)}"
+
+    def sentence_matrix(self, text: Union[str, Document]) -> SentenceMatrix:
+        """
+        Get the TF-IDF matrix of the candidate sentences, cached on the Document.
+
+        Args:
+            text: Text or Document to vectorize
+
+        Returns:
+            SentenceMatrix of the candidate sentences
+        """
+        document = as_document(text)
+        matrix = document.get_derived(self._cache_key)
+        if matrix is None:
+            matrix = self._vectorize(document, self.min_sentence_chars, self.max_sentence_chars)
+            if matrix.shape[0] == 0:
+                # A short text: rank all its sentences rather than return nothing
+                matrix = self._vectorize(document, 1, None)
+            document.set_derived(self._cache_key, matrix)
+        return matrix
+
+    def rank(self, text: Union[str, Document], focus_terms: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Get the TextRank score of every candidate sentence.
+
+        Args:
+            text: Text or Document to rank
+            focus_terms: Words or phrases whose sentences the ranking leans
+                towards (the random jumps of PageRank only land on them)
+
+        Returns:
+            Scores (summing to 1) in the order of SentenceMatrix.spans
+        """
+        matrix = self.sentence_matrix(text)
+        count = matrix.shape[0]
+        if count == 0:
+            return np.zeros(0)
+
+        # Random jumps land on the sentences with focus terms (by their number), or anywhere without any
+        teleport = np.ones(count)
+        focus_ids = self._focus_ids(matrix, focus_terms)
+        if focus_ids.size:
+            hits = np.bincount(matrix.rows, weights=np.isin(matrix.columns, focus_ids), minlength=count)
+            if hits.any():
+                teleport = hits
+        teleport = teleport / teleport.sum()
+
+        # Weighted degree of every sentence: row sums of X @ X.T without the self-similarity of 1
+        degree = matrix.multiply(matrix.multiply_transposed(np.ones(count))) - 1.0
+        connected = degree > 1e-9
+        inverse_degree = np.divide(1.0, degree, out=np.zeros(count), where=connected)
+
+        scores = teleport.copy()
+        for _ in range(self.max_iterations):
+            weighted = scores * inverse_degree
+            spread = matrix.multiply(matrix.multiply_transposed(weighted)) - weighted
+            dangling = scores[~connected].sum()
+            updated = (1.0 - self.damping) * teleport + self.damping * (np.maximum(spread, 0.0) + dangling * teleport)
+            updated /= updated.sum()
+            change = np.abs(updated - scores).sum()
+            scores = updated
+            if change < self.tolerance:
+                break
+        return scores
+
+    def summarize(
+        self,
+        text: Union[str, Document],
+        max_sentences: int = 10,
+        max_chars: Optional[int] = None,
+        focus_terms: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Summarize a text (or Document) with its most central sentences.
+
+        Args:
+            text: Text or Document to summarize
+            max_sentences: Maximum number of sentences in the summary
+            max_chars: Maximum length of the summary (None for no limit)
+            focus_terms: Words or phrases the summary should lean towards
+
+        Returns:
+            Dictionary with the "summary" text, the picked "sentences" (dicts
+            with "text", "start", "end" and "score", in document order) and
+            "method"
+        """
+        document = as_document(text)
+        matrix = self.sentence_matrix(document)
+        scores = self.rank(document, focus_terms)
+
+        # Greedy picks by rank; after each pick, the similarity of every sentence
+        # to its closest picked sentence is updated with one matrix product
+        picked: List[int] = []
+        lengths = np.array([end - start + 1 for start, end in matrix.spans], dtype=np.int64)
+        budget = max_chars + 1 if max_chars is not None else np.iinfo(np.int64).max
+        available = np.ones(len(lengths), dtype=bool)
+        closest = np.zeros(len(lengths))
+        while len(picked) < max_sentences:
+            eligible = available & (closest <= self.diversity_threshold) & (lengths <= budget)
+            if not eligible.any():
+                break
+            index = int(np.argmax(np.where(eligible, scores, -1.0)))
+            picked.append(index)
+            available[index] = False
+            budget -= lengths[index]
+            columns, values = matrix.row(index)
+            vector = np.zeros(matrix.shape[1])
+            vector[columns] = values
+            np.maximum(closest, matrix.multiply(vector), out=closest)
+
+        sentences = []
+        for index in sorted(picked):
+            start, end = matrix.spans[index]
+            sentences.append({
+                "text": " ".join(document.text[start:end].split()),
+                "start": start,
+                "end": end,
+                "score": round(float(scores[index]), 6)
+            })
+
+        # Without a single content word there is nothing to rank: the text is kept as it is
+        if not sentences and document.text.strip():
+            text = " ".join(document.text.split())
+            if max_chars is None or len(text) <= max_chars:
+                sentences.append({"text": text, "start": 0, "end": len(document.text), "score": 0.0})
+        return {
+            "summary": " ".join(sentence["text"] for sentence in sentences),
+            "sentences": sentences,
+            "method": "extractive"
+        }
+
+    def _vectorize(self, document: Document, min_chars: int, max_chars: Optional[int]) -> SentenceMatrix:
+        # Tokenize every candidate sentence from one translated copy of the lowercased text
+        separated = document.lower.translate(_SEPARATORS)
+        spans = []
+        lengths = []
+        tokens = []
+        for start, end in document.sentence_spans:
+            stripped_length = len(document.text[start:end].strip())
+            if stripped_length < min_chars or (max_chars is not None and stripped_length > max_chars):
+                continue
+            words = separated[start:end].split()
+            spans.append((start, end))
+            lengths.append(len(words))
+            tokens.extend(words)
+
+        # Term ids; stop words take the first ids so they are dropped with one comparison
+        stop_words = sorted(STOP_WORDS)
+        stop_count = len(stop_words)
+        vocabulary = {word: index for index, word in enumerate(stop_words + sorted(set(tokens) - STOP_WORDS))}
+        term_ids = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        word_lengths = np.fromiter(map(len, vocabulary), dtype=np.int64, count=len(vocabulary))
+        row_ids = np.repeat(np.arange(len(spans), dtype=np.int64), lengths)
+        keep = (term_ids >= stop_count) & (word_lengths[term_ids] >= MIN_WORD_LENGTH)
+
+        # Term counts per (sentence, term), sorted by sentence
+        vocabulary_size = len(vocabulary)
+        pairs, counts = np.unique(row_ids[keep] * vocabulary_size + term_ids[keep], return_counts=True)
+        rows, columns = np.divmod(pairs, vocabulary_size)
+
+        # Sentences left without a content word are no candidates
+        has_terms = np.zeros(len(spans), dtype=bool)
+        has_terms[rows] = True
+        if not has_terms.all():
+            spans = [span for span, kept in zip(spans, has_terms.tolist()) if kept]
+            rows = (np.cumsum(has_terms) - 1)[rows]
+
+        # Sublinear term frequency times smoothed inverse document frequency, rows L2-normalized
+        document_frequency = np.bincount(columns, minlength=vocabulary_size)
+        idf = np.log((1.0 + len(spans)) / (1.0 + document_frequency)) + 1.0
+        values = (1.0 + np.log(counts)) * idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(spans)))
+        values /= norms[rows]
+
+        logger.info(f"Vectorized {len(spans)} candidate sentences over {int(np.count_nonzero(document_frequency))} terms")
+        return SentenceMatrix(spans, rows, columns, values, vocabulary)
+
+    def _focus_ids(self, matrix: SentenceMatrix, focus_terms: Optional[Iterable[str]]) -> np.ndarray:
+        """Get the vocabulary ids of the content words of the focus terms."""
+        if not focus_terms:
+            return np.zeros(0, dtype=np.int64)
+        words = " ".join(focus_terms).lower().translate(_SEPARATORS).split()
+        return np.array(sorted({
+            matrix.vocabulary[word] for word in words
+            if word in matrix.vocabulary and word not in STOP_WORDS and len(word) >= MIN_WORD_LENGTH
+        }), dtype=np.int64)
+
+
+_default_summarizer: Optional[ExtractiveSummarizer] = None
+
+
+def get_extractive_summarizer() -> ExtractiveSummarizer:
+    """Get the shared extractive summarizer."""
+    global _default_summarizer
+    if _default_summarizer is None:
+        _default_summarizer = ExtractiveSummarizer()
+    return _default_summarizer
@@ -1,12 +1,28 @@
 import os
 import shutil
+import hashlib
 import logging
+import tempfile
 from typing import Optional, Dict, Any
 from fastapi import UploadFile
 from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
+# Every PDF starts with this marker (readers tolerate it anywhere in the first 1024 bytes)
+PDF_HEADER = b"%PDF-"
+PDF_HEADER_SEARCH_BYTES = 1024
+
+
+class UploadRejectedError(Exception):
+    """An upload was refused because of its content; status_code is the HTTP status to return."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 class FileService:
     """Service for handling file operations."""
     
@@ -51,6 +67,94 @@ class FileService:
                 "success": False
             }
     
+    @staticmethod
+    async def stream_upload(
+        file: UploadFile,
+        destination_path: str,
+        max_bytes: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream an uploaded PDF to disk in fixed-size chunks without blocking the event loop.
+        
+        The body is copied chunk by chunk into a temporary file next to the
+        destination; reads, hashing and writes run in the thread pool, so memory
+        stays at one chunk per upload. The first chunk must carry the %PDF
+        header and the upload is aborted as soon as it exceeds max_bytes. The
+        temporary file is renamed onto the destination only once complete, so
+        other readers never see a partial PDF.
+        
+        Args:
+            file: The uploaded file
+            destination_path: The path where the file should be saved
+            max_bytes: Maximum accepted size (defaults to UPLOAD_MAX_MB, 100 MB)
+            chunk_size: Bytes copied at a time (defaults to UPLOAD_CHUNK_KB, 1024 KB)
+            
+        Returns:
+            Dictionary with filename, path, size and sha256 of the saved file
+            
+        Raises:
+            UploadRejectedError: If the file is empty, not a PDF (400) or too large (413)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("UPLOAD_MAX_MB", "100")) * 1024 * 1024)
+        if chunk_size is None:
+            chunk_size = int(os.getenv("UPLOAD_CHUNK_KB", "1024")) * 1024
+        
+        destination_dir = os.path.dirname(destination_path) or "."
+        os.makedirs(destination_dir, exist_ok=True)
+        
+        # Same directory as the destination so the final rename is atomic
+        fd, tmp_path = tempfile.mkstemp(dir=destination_dir, suffix=".part")
+        digest = hashlib.sha256()
+        size = 0
+        
+        def write_chunk(buffer, chunk: bytes) -> None:
+            digest.update(chunk)
+            buffer.write(chunk)
+        
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                while True:
+                    chunk = await file.read(chunk_size)
+                    if not chunk:
+                        break
+                    
+                    if size == 0 and PDF_HEADER not in chunk[:PDF_HEADER_SEARCH_BYTES]:
+                        raise UploadRejectedError("File is not a valid PDF")
+                    
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadRejectedError(
+                            f"File exceeds the maximum upload size of {max_bytes // (1024 * 1024)} MB",
+                            status_code=413
+                        )
+                    
+                    await run_in_threadpool(write_chunk, buffer, chunk)
+                
+                if size == 0:
+                    raise UploadRejectedError("File is empty")
+                
+                await run_in_threadpool(os.fsync, buffer.fileno())
+            
+            os.replace(tmp_path, destination_path)
+        except BaseException:
+            # Also covers cancellation when the client disconnects mid-upload
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        logger.info(f"Upload streamed to {destination_path} ({size} bytes, sha256 {digest.hexdigest()[:12]})")
+        
+        return {
+            "filename": file.filename,
+            "path": destination_path,
+            "size": size,
+            "sha256": digest.hexdigest()
+        }
+    
     @staticmethod
     def delete_file(file_path: str) -> bool:
         """
@@ -3,8 +3,10 @@ import logging
 import re
 import json
 import time
-import random
-from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import threading
+import contextlib
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 import requests
 from dotenv import load_dotenv
 from huggingface_hub import InferenceClient, InferenceTimeoutError
@@ -12,18 +14,96 @@ from huggingface_hub.errors import HTTPError
 
 # Import shared utilities
 from services.nlp_utils import (
-    chunk_text, 
     fallback_sentiment_analysis,
     extract_basic_entities,
     estimate_tokens,
     extract_risk_factors_with_regex
 )
+from services.document import Document, as_document
+from services.section_index import get_section_index
+from services.extractive_summarizer import get_extractive_summarizer
+from services.inference_cache import get_inference_cache
+from services.resilience import RetryPolicy, CircuitOpenError, get_circuit_breaker
+from services.service_registry import CredentialCheck
+from services.inference_backends import (
+    REMOTE_BACKEND,
+    InferenceBackend,
+    get_local_inference_backend,
+    parse_task_backends
+)
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Summary engines: "model" calls the summarization models, "extractive" picks
+# sentences locally without any inference call, "auto" uses the models when the
+# API key is valid and the extractive summarizer otherwise
+SUMMARY_ENGINES = ("auto", "model", "extractive")
+
+# Words the extractive fallback summary leans towards
+SUMMARY_FOCUS_TERMS = [
+    "key", "important", "significant", "highlight", "report", "financial",
+    "revenue", "profit", "loss", "growth", "decline", "increase", "decrease",
+    "billion", "million", "percent", "quarterly", "annual", "fiscal", "year"
+]
+
+# Tasks whose endpoints accept a list of inputs and return one result list per input
+BATCHED_TASKS = ("text-classification", "token-classification")
+
+
+class PayloadTooLargeError(Exception):
+    """A batched request was rejected as too large (HTTP 413); the batch has to be split."""
+
+
+def parse_model_limits(value: str) -> Dict[str, int]:
+    """Parse per-model limits written as "model=limit,model=limit" (e.g. HF_MODEL_CONCURRENCY)."""
+    limits = {}
+    for item in value.split(","):
+        model_name, _, limit = item.strip().rpartition("=")
+        if model_name and limit.strip().isdigit():
+            limits[model_name.strip()] = max(int(limit), 1)
+        elif item.strip():
+            logger.warning(f"Ignoring malformed model limit {item.strip()}")
+    return limits
+
+
+_inference_loop: Optional[asyncio.AbstractEventLoop] = None
+_inference_loop_lock = threading.Lock()
+
+
+def get_inference_loop() -> asyncio.AbstractEventLoop:
+    """Get the process-wide event loop inference requests run on, started on first use."""
+    global _inference_loop
+    with _inference_loop_lock:
+        if _inference_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="inference-loop", daemon=True).start()
+            _inference_loop = loop
+        return _inference_loop
+
+
+def run_coroutine(coroutine) -> Any:
+    """
+    Run a coroutine on the shared inference loop and wait for its result.
+    
+    All inference requests of the process run on this one loop, so the
+    request limits (HF_MAX_CONCURRENCY, HF_MODEL_CONCURRENCY) hold across
+    reports analyzed at the same time. Works from sync code and from inside
+    another running event loop, but not from the inference loop itself.
+    """
+    loop = get_inference_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coroutine.close()
+        raise RuntimeError("run_coroutine cannot wait for the inference loop from the loop itself")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
 class HuggingFaceService:
     """Service for interacting with HuggingFace models using InferenceClient."""
     
@@ -46,9 +126,17 @@ class HuggingFaceService:
         # Smaller model for fallback - will use less tokens, be faster
         self.fallback_summarization_model = "facebook/bart-base"
         
+        # Summary engine used when generate_summary is not given one
+        self.summary_engine = os.getenv("SUMMARY_ENGINE", "auto").lower()
+        if self.summary_engine not in SUMMARY_ENGINES:
+            logger.warning(f"Unknown SUMMARY_ENGINE {self.summary_engine}, using auto")
+            self.summary_engine = "auto"
+        self.extractive_summarizer = get_extractive_summarizer()
+        
         # Flan-T5-XL is good for detailed tasks, but can timeout - use smaller version for fallback
         
         self.t5_model = "google/flan-t5-base"
+        self.fallback_t5_model = "google/flan-t5-small"
         
         # Standard NER model
         self.ner_model = "dslim/bert-base-NER"
@@ -56,17 +144,24 @@ class HuggingFaceService:
         # Create InferenceClient with API key (more robust handling than direct calls)
         self.inference_client = InferenceClient(provider = "hf-inference", api_key=self.api_key)
         
-        # Validate API key
-        self.is_api_key_valid = self._validate_api_key()
+        # The API key is validated on first use, not here (the check is an inference call)
+        self._api_key_check = CredentialCheck("HuggingFace inference", self._validate_api_key)
         
-        # Configure chunking parameters - reduced from default for reliability
-        self.chunk_size = int(os.getenv("CHUNK_SIZE", "1600"))  # Reduced from 2000/4000
+        # Configure chunking parameters - chunks are packed close to max_input_tokens;
+        # CHUNK_SIZE optionally caps their size in characters as well
+        self.chunk_size = int(os.getenv("CHUNK_SIZE", "0")) or None
         self.overlap_size = int(os.getenv("OVERLAP_SIZE", "200"))
         
         # Configure token limits for different models
         self.max_input_tokens = int(os.getenv("MAX_INPUT_TOKENS", "1024"))
         self.max_output_tokens = int(os.getenv("MAX_OUTPUT_TOKENS", "512"))
         
+        # FinBERT and the NER model take at most 512 tokens, so classification chunks get their
+        # own plan with a smaller token budget and a character cap (the word estimate
+        # undercounts WordPiece tokens of numbers like "$1,002.2")
+        self.classification_max_tokens = int(os.getenv("HF_CLASSIFICATION_MAX_TOKENS", "512"))
+        self.classification_chunk_chars = int(os.getenv("HF_CLASSIFICATION_CHUNK_CHARS", "1600")) or None
+        
         # Configure timeout parameters (in seconds) - used for direct requests, not InferenceClient
         self.request_timeout = float(os.getenv("HF_REQUEST_TIMEOUT", "15.0"))  # 15 seconds default timeout
         self.generation_timeout = float(os.getenv("HF_GENERATION_TIMEOUT", "30.0"))  # 30 seconds for generation
@@ -74,9 +169,122 @@ class HuggingFaceService:
         # Configure retry parameters
         self.max_retries = int(os.getenv("MAX_API_RETRIES", "3"))
         self.max_chunk_retries = int(os.getenv("MAX_CHUNK_RETRIES", "2"))
+        self.retry_policy = RetryPolicy()
+        
+        # Configure concurrent chunk requests: at most max_concurrency requests in flight,
+        # and per model its HF_MODEL_CONCURRENCY limit (model_max_concurrency by default)
+        self.max_concurrency = max(int(os.getenv("HF_MAX_CONCURRENCY", "8")), 1)
+        self.model_max_concurrency = max(int(os.getenv("HF_MODEL_MAX_CONCURRENCY", "4")), 1)
+        self.model_concurrency = parse_model_limits(os.getenv("HF_MODEL_CONCURRENCY", ""))
+        # Semaphores of the shared inference loop, created there on first use
+        self._request_pool: Optional[asyncio.Semaphore] = None
+        self._model_slots: Dict[str, asyncio.Semaphore] = {}
+        
+        # Configure batching of classification and NER chunks: a request carries up to
+        # batch_max_items chunks and batch_max_bytes of input; a model rejecting a batch
+        # as too large gets a lower item limit from then on
+        self.batch_max_items = max(int(os.getenv("HF_BATCH_MAX_ITEMS", "16")), 1)
+        self.batch_max_bytes = max(int(os.getenv("HF_BATCH_MAX_BYTES", "262144")), 1)
+        self._batch_item_limits: Dict[str, int] = {}
+        
+        # Chunks of a report analyzed for sentiment and entities (0 for all)
+        self.max_classification_chunks = int(os.getenv("HF_MAX_CLASSIFICATION_CHUNKS", "64"))
+        
+        # Results of identical requests are reused from the process-wide inference cache
+        self.inference_cache = get_inference_cache()
+        
+        # Inference backend per task: "remote" (the hosted InferenceClient) or a registered
+        # backend such as "local"; INFERENCE_BACKEND is the default, INFERENCE_TASK_BACKENDS
+        # overrides it per task
+        self.inference_backends: Dict[str, InferenceBackend] = {"local": get_local_inference_backend()}
+        self.default_backend = os.getenv("INFERENCE_BACKEND", REMOTE_BACKEND).lower()
+        self.task_backends = parse_task_backends(os.getenv("INFERENCE_TASK_BACKENDS", ""))
+        for task, backend in [("*", self.default_backend), *self.task_backends.items()]:
+            if backend != REMOTE_BACKEND and backend not in self.inference_backends:
+                logger.warning(f"Unknown inference backend {backend} for {task}, using {REMOTE_BACKEND}")
         
         logger.info(f"HuggingFaceService initialized with chunk_size={self.chunk_size}, timeout={self.request_timeout}s")
     
+    @property
+    def is_api_key_valid(self) -> bool:
+        """Whether the API key works; validated on first use and cached (see CredentialCheck)."""
+        return self._api_key_check.is_valid
+    
+    @is_api_key_valid.setter
+    def is_api_key_valid(self, valid: bool) -> None:
+        self._api_key_check.set(valid)
+    
+    def task_backend(self, task: str) -> str:
+        """Get the name of the inference backend that runs a task ("remote" for the hosted API)."""
+        backend = self.task_backends.get(task, self.default_backend)
+        return backend if backend in self.inference_backends else REMOTE_BACKEND
+    
+    def can_run(self, task: str) -> bool:
+        """Whether requests of a task reach a model: a local backend, or the hosted API with a valid key."""
+        return self.task_backend(task) != REMOTE_BACKEND or self.is_api_key_valid
+    
+    def warm_up_local_models(self) -> Dict[str, bool]:
+        """
+        Load the models of the tasks that run on a local backend, ahead of the first report.
+        
+        Returns:
+            Whether each model is ready, by task
+        """
+        task_models = {
+            "text-classification": self.finbert_model,
+            "token-classification": self.ner_model,
+            "summarization": self.summarization_model,
+            "text-generation": self.t5_model
+        }
+        return {
+            task: self.inference_backends[self.task_backend(task)].warm_up(model_name, task)
+            for task, model_name in task_models.items() if self.task_backend(task) != REMOTE_BACKEND
+        }
+    
+    def _chunk_plan(self, document: Document, task: str = "summarization") -> List[Tuple[int, int]]:
+        """
+        Get the (start, end) spans of the model input chunks of a document for a task.
+        
+        Each plan is computed once per document and cached on it, so tasks with
+        the same input limits run on the same chunks without re-chunking the
+        text. Classification tasks (FinBERT, NER) have a 512-token limit and
+        share one plan; generation tasks share the MAX_INPUT_TOKENS plan. Tasks
+        slice out only the chunks they actually send.
+        
+        Args:
+            document: Document to chunk
+            task: Task the chunks are for
+            
+        Returns:
+            Chunk spans in document order
+        """
+        chunk_size, max_tokens = self.chunk_size, self.max_input_tokens
+        if task in BATCHED_TASKS:
+            max_tokens = min(max_tokens, self.classification_max_tokens)
+            caps = [cap for cap in (chunk_size, self.classification_chunk_chars) if cap]
+            chunk_size = min(caps) if caps else None
+        plan = document.chunk_plan(chunk_size, self.overlap_size, max_tokens)
+        logger.info(f"Using plan of {len(plan)} chunks for {task} (max {max_tokens} tokens per chunk)")
+        return plan
+    
+    def _classification_chunks(self, plan: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Get the chunks analyzed for sentiment and entities.
+        
+        All chunks up to HF_MAX_CLASSIFICATION_CHUNKS; longer reports are
+        sampled evenly so the whole report is represented.
+        
+        Args:
+            plan: Chunk spans of the document
+        
+        Returns:
+            Chunk spans in document order
+        """
+        limit = self.max_classification_chunks
+        if limit <= 0 or len(plan) <= limit:
+            return plan
+        return [plan[i * len(plan) // limit] for i in range(limit)]
+        
     def _validate_api_key(self) -> bool:
         """
         Validate the HuggingFace API key.
@@ -133,225 +341,678 @@ class HuggingFaceService:
             TimeoutError: If the API call times out
             Exception: For other errors
         """
-        # If API key is not valid, use mock responses
-        if not self.is_api_key_valid:
+        # If the task runs remotely and the API key is not valid, use mock responses
+        if not self.can_run(task):
             logger.warning(f"API key is not valid. Using mock response for {task}.")
             return self._get_mock_response(model_name, task, inputs)
         
-        # Use class-level max_retries if none specified
+        # Use class-level max_retries if none specified; local models are not retried
         if max_retries is None:
-            max_retries = self.max_retries
+            max_retries = self.max_retries if self.task_backend(task) == REMOTE_BACKEND else 1
         
+        # Answer from the inference cache; a batch only sends its uncached items
+        cached, missing = self._cache_lookup(model_name, task, inputs, kwargs)
+        if not missing:
+            return cached
+        if isinstance(inputs, list) and len(missing) < len(inputs):
+            fresh = self._request_with_retries(model_name, task, [inputs[i] for i in missing], max_retries, kwargs)
+            return self._merge_cached(cached, missing, fresh)
+        return self._request_with_retries(model_name, task, inputs, max_retries, kwargs)
+    
+    def _request_with_retries(
+        self,
+        model_name: str,
+        task: str,
+        inputs: Union[str, List[str]],
+        max_retries: int,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Make up to max_retries attempts of a request, blocking between them; see _call_inference_api."""
         # Add estimated token count
-        estimated_tokens = estimate_tokens(inputs)
+        estimated_tokens = self._estimate_input_tokens(inputs)
         logger.info(f"Calling HuggingFace API for {task} with {estimated_tokens} estimated tokens")
         
-        attempts = 0
-        last_error = None
-        base_wait_time = 2
+        for attempts in range(1, max_retries + 1):
+            # While the model's circuit is open, skip the remaining attempts
+            if not get_circuit_breaker(model_name).allow_request():
+                return self._open_circuit_fallback(model_name, task, inputs, kwargs)
+            done, result, inputs = self._inference_attempt(model_name, task, inputs, attempts, max_retries, kwargs)
+            if done:
+                return result
+            
+            # Wait before retry if not the last attempt
+            if attempts < max_retries:
+                wait_time = self._retry_wait_time(attempts)
+                logger.info(f"Waiting {wait_time:.2f}s before retry {attempts+1}/{max_retries}")
+                time.sleep(wait_time)
         
-        while attempts < max_retries:
-            attempts += 1
-            try:
-                # Prepare task-specific parameters
-                task_kwargs = {}
-                
-                # Copy parameters from kwargs
-                for key, value in kwargs.items():
-                    task_kwargs[key] = value
-                
-                # Adjust max tokens for all models to avoid errors
-                if "max_new_tokens" in task_kwargs and task_kwargs["max_new_tokens"] > 250:
-                    logger.info(f"Limiting max_new_tokens to 250 for {model_name}")
-                    task_kwargs["max_new_tokens"] = 250
-                elif "max_length" in task_kwargs and task_kwargs["max_length"] > 250:
-                    logger.info(f"Limiting max_length to 250 for {model_name}")
-                    task_kwargs["max_length"] = 250
-                
-                # Set default parameters if not provided
-                if task == "summarization":
-                    if "max_new_tokens" not in task_kwargs and "max_length" not in task_kwargs:
-                        task_kwargs["max_new_tokens"] = min(self.max_output_tokens, 250)  # Ensure within limits
-                    if "min_length" not in task_kwargs:
-                        task_kwargs["min_length"] = 30
-                    if "do_sample" not in task_kwargs:
-                        task_kwargs["do_sample"] = False
-                
-                elif task == "text-generation":
-                    if "max_new_tokens" not in task_kwargs and "max_length" not in task_kwargs:
-                        task_kwargs["max_new_tokens"] = min(self.max_output_tokens, 250)  # Ensure within limits
-                    if "temperature" not in task_kwargs:
-                        task_kwargs["temperature"] = 0.7
-                    if "do_sample" not in task_kwargs:
-                        task_kwargs["do_sample"] = True
-                
-                # Call the appropriate InferenceClient method based on task
-                if task == "text-classification":
-                    response = self.inference_client.text_classification(
-                        inputs,
-                        model=model_name
-                    )
-                    return response
-                    
-                elif task == "summarization":
-                    # For summarization, use the post method directly
-                    # This is more compatible with different versions of the library
-                    payload = {
-                        "inputs": inputs
-                    }
-                    
-                    # Add parameters if provided
-                    if task_kwargs:
-                        payload["parameters"] = {}
-                        if "max_new_tokens" in task_kwargs:
-                            # Ensure max_new_tokens is within limits
-                            payload["parameters"]["max_new_tokens"] = min(task_kwargs["max_new_tokens"], 250)
-                        if "min_length" in task_kwargs:
-                            payload["parameters"]["min_length"] = task_kwargs["min_length"]
-                        if "do_sample" in task_kwargs:
-                            payload["parameters"]["do_sample"] = task_kwargs["do_sample"]
-                    
-                    response = self.inference_client.post(
-                        json=payload,
-                        model=model_name
-                    )
-                    
-                    # Parse the response
-                    if isinstance(response, dict) and "summary_text" in response:
-                        return response
-                    elif isinstance(response, str):
-                        return {"summary_text": response}
-                    else:
-                        return {"summary_text": str(response)}
-                    
-                elif task == "text-generation":
-                    # Extract only the parameters that are valid for text generation
-                    text_gen_kwargs = {
-                        "model": model_name
-                    }
-                    
-                    # Add valid parameters for text generation
-                    if "max_new_tokens" in task_kwargs:
-                        # Ensure max_new_tokens is within limits
-                        text_gen_kwargs["max_new_tokens"] = min(task_kwargs["max_new_tokens"], 250)
-                    if "temperature" in task_kwargs:
-                        text_gen_kwargs["temperature"] = task_kwargs["temperature"]
-                    if "do_sample" in task_kwargs:
-                        text_gen_kwargs["do_sample"] = task_kwargs["do_sample"]
-                    
-                    response = self.inference_client.text_generation(
-                        inputs,
-                        **text_gen_kwargs
-                    )
-                    return {"generated_text": response}
-                    
-                elif task == "token-classification":
-                    response = self.inference_client.token_classification(
-                        inputs,
-                        model=model_name
+        # All attempts failed
+        logger.error(f"All {max_retries} API call attempts failed for model {model_name}, task {task}")
+        
+        # Return mock response as last resort fallback
+        logger.info("Using mock response as final fallback")
+        return self._get_mock_response(model_name, task, inputs)
+    
+    async def _call_inference_api_async(
+        self,
+        model_name: str,
+        task: str,
+        inputs: str,
+        max_retries: int = None,
+        **kwargs
+    ) -> Any:
+        """
+        Call the HuggingFace API without blocking the event loop.
+        
+        Same behavior as _call_inference_api, but each attempt runs in a worker
+        thread while holding a request slot (see _request_slot), and the
+        backoff between attempts is an asyncio sleep that holds no slot, so
+        other chunks keep going while one waits to retry.
+        
+        Args:
+            model_name: Name of the model to use
+            task: Task type ('text-classification', 'summarization', 'text-generation', etc.)
+            inputs: Text to process
+            max_retries: Maximum number of retries
+            **kwargs: Additional parameters for the task
+            
+        Returns:
+            API response based on task type
+        """
+        if not self.can_run(task):
+            logger.warning(f"API key is not valid. Using mock response for {task}.")
+            return self._get_mock_response(model_name, task, inputs)
+        
+        if max_retries is None:
+            max_retries = self.max_retries if self.task_backend(task) == REMOTE_BACKEND else 1
+        
+        cached, missing = self._cache_lookup(model_name, task, inputs, kwargs)
+        if not missing:
+            return cached
+        if isinstance(inputs, list) and len(missing) < len(inputs):
+            fresh = await self._request_with_retries_async(
+                model_name, task, [inputs[i] for i in missing], max_retries, kwargs
+            )
+            return self._merge_cached(cached, missing, fresh)
+        return await self._request_with_retries_async(model_name, task, inputs, max_retries, kwargs)
+    
+    async def _request_with_retries_async(
+        self,
+        model_name: str,
+        task: str,
+        inputs: Union[str, List[str]],
+        max_retries: int,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Make up to max_retries attempts of a request without blocking; see _call_inference_api_async."""
+        estimated_tokens = self._estimate_input_tokens(inputs)
+        logger.info(f"Calling HuggingFace API for {task} with {estimated_tokens} estimated tokens")
+        
+        for attempts in range(1, max_retries + 1):
+            if not get_circuit_breaker(model_name).allow_request():
+                return await self._open_circuit_fallback_async(model_name, task, inputs, kwargs)
+            async with self._request_slot(model_name):
+                done, result, inputs = await asyncio.to_thread(
+                    self._inference_attempt, model_name, task, inputs, attempts, max_retries, kwargs
+                )
+            if done:
+                return result
+            
+            if attempts < max_retries:
+                wait_time = self._retry_wait_time(attempts)
+                logger.info(f"Waiting {wait_time:.2f}s before retry {attempts+1}/{max_retries}")
+                await asyncio.sleep(wait_time)
+        
+        logger.error(f"All {max_retries} API call attempts failed for model {model_name}, task {task}")
+        logger.info("Using mock response as final fallback")
+        return self._get_mock_response(model_name, task, inputs)
+    
+    @contextlib.asynccontextmanager
+    async def _request_slot(self, model_name: str):
+        """
+        Hold a request slot of the model and of the shared pool while a request is in flight.
+        
+        The semaphores belong to the shared inference loop (see run_coroutine), so
+        the limits hold for all requests of the process, not only one call's.
+        """
+        if self._request_pool is None:
+            self._request_pool = asyncio.Semaphore(self.max_concurrency)
+        if model_name not in self._model_slots:
+            self._model_slots[model_name] = asyncio.Semaphore(
+                self.model_concurrency.get(model_name, self.model_max_concurrency)
+            )
+        # Wait for the model's slot first, so no shared slot is held while waiting for it
+        async with self._model_slots[model_name]:
+            async with self._request_pool:
+                yield
+    
+    async def _map_chunks_async(
+        self,
+        model_name: str,
+        task: str,
+        inputs: List[str],
+        accept: Optional[Callable[[Any], bool]] = None,
+        chunk_retries: int = 1,
+        fallback_model: Optional[str] = None,
+        fallback_kwargs: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> List[Any]:
+        """Send one request per chunk concurrently; see _map_chunks."""
+        async def process(index: int, chunk_inputs: str) -> Any:
+            for attempt in range(1, chunk_retries + 1):
+                try:
+                    result = await self._call_inference_api_async(model_name, task, chunk_inputs, **kwargs)
+                    if accept is None or accept(result):
+                        return result
+                    logger.error(f"Empty {task} result for chunk {index+1} (attempt {attempt})")
+                except Exception as e:
+                    logger.error(f"Error in {task} for chunk {index+1} (attempt {attempt}): {str(e)}")
+                if attempt < chunk_retries:
+                    wait_time = self._retry_wait_time(attempt)
+                    logger.info(f"Waiting {wait_time:.2f}s before retrying chunk {index+1}")
+                    await asyncio.sleep(wait_time)
+            
+            if fallback_model and fallback_model != model_name:
+                try:
+                    logger.info(f"Trying fallback model {fallback_model} for chunk {index+1}")
+                    result = await self._call_inference_api_async(
+                        fallback_model, task, chunk_inputs, **(fallback_kwargs or kwargs)
                     )
-                    return response
-                    
+                    if accept is None or accept(result):
+                        return result
+                except Exception as fallback_error:
+                    logger.error(f"Fallback model also failed for chunk {index+1}: {str(fallback_error)}")
+            return None
+        
+        return await asyncio.gather(*(process(index, chunk_inputs) for index, chunk_inputs in enumerate(inputs)))
+    
+    def _map_chunks(
+        self,
+        model_name: str,
+        task: str,
+        inputs: List[str],
+        accept: Optional[Callable[[Any], bool]] = None,
+        chunk_retries: int = 1,
+        fallback_model: Optional[str] = None,
+        fallback_kwargs: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Run one inference request per chunk, concurrently, and collect the results in chunk order.
+        
+        Requests fan out over a bounded pool (HF_MAX_CONCURRENCY requests in
+        flight, and per model its HF_MODEL_CONCURRENCY limit), so a component
+        takes about as long as its slowest chunk rather than the sum of all.
+        Retries wait without holding a request slot. HF_MAX_CONCURRENCY=1
+        processes the chunks one at a time.
+        
+        Args:
+            model_name: Name of the model to use
+            task: Task type
+            inputs: Inputs of the chunks
+            accept: Check a result must pass (e.g. non-empty); failing results are retried
+            chunk_retries: Attempts per chunk (each is a full _call_inference_api call)
+            fallback_model: Model to try once when all attempts of a chunk failed
+            fallback_kwargs: Task parameters for the fallback model (defaults to kwargs)
+            **kwargs: Additional parameters for the task
+            
+        Returns:
+            Result per chunk in chunk order; None for chunks that failed
+        """
+        return run_coroutine(self._map_chunks_async(
+            model_name, task, inputs, accept, chunk_retries, fallback_model, fallback_kwargs, **kwargs
+        ))
+    
+    def _plan_batches(self, model_name: str, inputs: List[str]) -> List[List[int]]:
+        """
+        Group chunk indices into batches within the item and payload size limits.
+        
+        Args:
+            model_name: Name of the model the batches are for
+            inputs: Inputs of the chunks
+            
+        Returns:
+            Batches of chunk indices, in chunk order
+        """
+        max_items = min(self.batch_max_items, self._batch_item_limits.get(model_name, self.batch_max_items))
+        batches = []
+        batch: List[int] = []
+        batch_bytes = 0
+        for index, chunk_inputs in enumerate(inputs):
+            size = len(chunk_inputs.encode("utf-8")) + 4  # Quotes and separator in the JSON payload
+            if batch and (len(batch) >= max_items or batch_bytes + size > self.batch_max_bytes):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(index)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _map_chunks_batched_async(self, model_name: str, task: str, inputs: List[str]) -> List[Any]:
+        """Send the chunks in batched requests concurrently; see _map_chunks_batched."""
+        results: List[Any] = [None] * len(inputs)
+        
+        async def process(batch: List[int]) -> None:
+            try:
+                if len(batch) == 1:
+                    batch_results = [await self._call_inference_api_async(model_name, task, inputs[batch[0]])]
                 else:
-                    raise ValueError(f"Unsupported task type: {task}")
-                    
-            except InferenceTimeoutError as e:
-                logger.warning(f"API timeout on attempt {attempts}: {str(e)}")
-                last_error = e
+                    batch_results = await self._call_inference_api_async(
+                        model_name, task, [inputs[index] for index in batch]
+                    )
+            except PayloadTooLargeError as e:
+                # Remember the smaller batch size for this model and send both halves
+                half = len(batch) // 2
+                self._batch_item_limits[model_name] = min(self._batch_item_limits.get(model_name, len(batch)), half)
+                logger.warning(f"{str(e)}, splitting into batches of at most {half}")
+                await asyncio.gather(process(batch[:half]), process(batch[half:]))
+                return
+            except Exception as e:
+                logger.error(f"Error in {task} for chunks {batch[0]+1}-{batch[-1]+1}: {str(e)}")
+                return
+            for index, result in zip(batch, batch_results):
+                results[index] = result
+        
+        batches = self._plan_batches(model_name, inputs)
+        logger.info(f"Sending {len(inputs)} chunks for {task} in {len(batches)} batched requests")
+        await asyncio.gather(*(process(batch) for batch in batches))
+        return results
+    
+    def _map_chunks_batched(self, model_name: str, task: str, inputs: List[str]) -> List[Any]:
+        """
+        Run a classification or NER model over many chunks with few requests.
+        
+        Chunks are packed into batched requests (HF_BATCH_MAX_ITEMS inputs and
+        HF_BATCH_MAX_BYTES of text at most); the endpoint returns one result
+        per input. Batches are sent concurrently like _map_chunks. A batch the
+        endpoint rejects as too large is split in half, and the model keeps
+        the smaller batch size for later requests.
+        
+        Args:
+            model_name: Name of the model to use
+            task: "text-classification" or "token-classification"
+            inputs: Inputs of the chunks
+            
+        Returns:
+            Result per chunk in chunk order; None for chunks that failed
+        """
+        return run_coroutine(self._map_chunks_batched_async(model_name, task, inputs))
+    
+    @staticmethod
+    def _split_batch_response(response: Any, size: int) -> List[Any]:
+        """Split the response of a batched request into one result list per input."""
+        if isinstance(response, (bytes, str)):
+            response = json.loads(response)
+        # A batch of one may come back unnested
+        if size == 1 and isinstance(response, list) and response and isinstance(response[0], dict):
+            response = [response]
+        if not isinstance(response, list) or len(response) != size:
+            raise ValueError(f"Expected {size} results from batched request, got {type(response).__name__}")
+        return [result if isinstance(result, list) else [result] for result in response]
+    
+    def _cache_lookup(
+        self,
+        model_name: str,
+        task: str,
+        inputs: Union[str, List[str]],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Any, List[int]]:
+        """
+        Look up single or batched inputs in the inference cache.
+        
+        Args:
+            model_name: Name of the model
+            task: Task type
+            inputs: Text, or list of texts of a batch
+            kwargs: Task parameters
+            
+        Returns:
+            (cached, missing): the cached result (per-item list with None for
+            misses for a batch) and the indices of the inputs still to request
+            (for a single input, [0] on a miss)
+        """
+        params = self._cache_params(task, kwargs)
+        if not isinstance(inputs, list):
+            cached = self.inference_cache.get(model_name, task, params, inputs) if self.inference_cache else None
+            return cached, [] if cached is not None else [0]
+        if self.inference_cache is None:
+            return [None] * len(inputs), list(range(len(inputs)))
+        cached = self.inference_cache.get_many(model_name, task, params, inputs)
+        return cached, [i for i, result in enumerate(cached) if result is None]
+    
+    def _cache_params(self, task: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the parameters a result is cached under; results of local backends are kept apart."""
+        backend = self.task_backend(task)
+        return kwargs if backend == REMOTE_BACKEND else {**kwargs, "backend": backend}
+    
+    @staticmethod
+    def _merge_cached(cached: List[Any], missing: List[int], fresh: List[Any]) -> List[Any]:
+        """Fill the missing items of a partially cached batch with the fresh results."""
+        merged = list(cached)
+        for index, result in zip(missing, fresh):
+            merged[index] = result
+        return merged
+    
+    @staticmethod
+    def _estimate_input_tokens(inputs: Union[str, List[str]]) -> int:
+        """Estimate the tokens of single or batched inputs."""
+        if isinstance(inputs, list):
+            return sum(estimate_tokens(item) for item in inputs)
+        return estimate_tokens(inputs)
+    
+    def _retry_wait_time(self, attempts: int) -> float:
+        """Exponential backoff with jitter before the next attempt (see RetryPolicy)."""
+        return self.retry_policy.delay(attempts)
+    
+    def _fallback_model(self, model_name: str, task: str) -> Optional[str]:
+        """Get the smaller model that stands in for a model, if the task has one."""
+        if task == "summarization" and model_name != self.fallback_summarization_model:
+            return self.fallback_summarization_model
+        if task == "text-generation" and "t5" in model_name and model_name != self.fallback_t5_model:
+            return self.fallback_t5_model
+        return None
+    
+    def _open_circuit_fallback(
+        self,
+        model_name: str,
+        task: str,
+        inputs: Union[str, List[str]],
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """
+        Answer a request to a model whose circuit breaker is open, without calling it.
+        
+        The request goes to the task's fallback model (itself guarded by its own
+        breaker) or, for NER, to the local entity extraction. Other tasks raise
+        CircuitOpenError, so callers use their local fallback at once.
+        
+        Args:
+            model_name: Name of the model whose circuit is open
+            task: Task type
+            inputs: Text, or list of texts of a batch
+            kwargs: Task parameters
+            
+        Returns:
+            Result of the fallback
+            
+        Raises:
+            CircuitOpenError: If the task has no fallback
+        """
+        fallback_model = self._fallback_model(model_name, task)
+        if fallback_model:
+            logger.info(f"Circuit open for {model_name}, using fallback model {fallback_model}")
+            return self._call_inference_api(fallback_model, task, inputs, max_retries=1, **kwargs)
+        if task == "token-classification":
+            logger.info(f"Circuit open for {model_name}, using basic entity extraction")
+            return self._basic_entities(inputs)
+        raise CircuitOpenError(model_name, get_circuit_breaker(model_name).retry_in())
+    
+    async def _open_circuit_fallback_async(
+        self,
+        model_name: str,
+        task: str,
+        inputs: Union[str, List[str]],
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Answer a request to a model whose circuit breaker is open; see _open_circuit_fallback."""
+        fallback_model = self._fallback_model(model_name, task)
+        if fallback_model:
+            logger.info(f"Circuit open for {model_name}, using fallback model {fallback_model}")
+            return await self._call_inference_api_async(fallback_model, task, inputs, max_retries=1, **kwargs)
+        return self._open_circuit_fallback(model_name, task, inputs, kwargs)
+    
+    @staticmethod
+    def _basic_entities(inputs: Union[str, List[str]]) -> Any:
+        """Extract entities locally in the NER response format (per item for a batch)."""
+        def basic_entities(item: str) -> List[Dict[str, Any]]:
+            return [
+                {"entity_group": entity_type, "score": 0.8, "word": entity}
+                for entity_type, entity_list in extract_basic_entities(item).items()
+                for entity in entity_list
+            ]
+        if isinstance(inputs, list):
+            return [basic_entities(item) for item in inputs]
+        return basic_entities(inputs)
+    
+    def _inference_attempt(
+        self,
+        model_name: str,
+        task: str,
+        inputs: str,
+        attempts: int,
+        max_retries: int,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[bool, Any, str]:
+        """
+        Make one attempt of an inference API call.
+        
+        Args:
+            model_name: Name of the model to use
+            task: Task type
+            inputs: Text to process
+            attempts: Number of this attempt (1-based)
+            max_retries: Maximum number of attempts
+            kwargs: Additional parameters for the task
+            
+        Returns:
+            (done, result, inputs): whether a result (possibly from a fallback)
+            was obtained, the result, and the inputs for the next attempt
+            (shortened after index errors)
+        """
+        breaker = get_circuit_breaker(model_name)
+        try:
+            result = self._send_request(model_name, task, inputs, kwargs)
+            breaker.record_success()
+            if self.inference_cache is not None:
+                self.inference_cache.put(model_name, task, self._cache_params(task, kwargs), inputs, result)
+            return True, result, inputs
                 
-                # If fallback is available and this is the last attempt, try fallback model
+        except (InferenceTimeoutError, TimeoutError, requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            logger.warning(f"API timeout on attempt {attempts}: {str(e)}")
+            breaker.record_failure()
+            
+            # If fallback is available and this is the last attempt, try fallback model
+            fallback_model = self._fallback_model(model_name, task)
+            if attempts == max_retries - 1 and fallback_model:
+                try:
+                    logger.info(f"Trying fallback model: {fallback_model}")
+                    return True, self._call_inference_api(
+                        model_name=fallback_model,
+                        task=task,
+                        inputs=inputs,
+                        max_retries=1,
+                        **kwargs
+                    ), inputs
+                except Exception as fallback_error:
+                    logger.error(f"Fallback model also failed: {str(fallback_error)}")
+            
+        except HTTPError as e:
+            status_code = getattr(e.response, 'status_code', None)
+            # Server errors and rate limits count against the model; a rejected request (4xx) does not
+            # show whether the model is healthy, so it is recorded neither way
+            if status_code is None or status_code >= 500 or status_code == 429:
+                breaker.record_failure()
+            
+            # A batch too large for the endpoint is split by the caller
+            if status_code == 413 and isinstance(inputs, list) and len(inputs) > 1:
+                raise PayloadTooLargeError(f"Batch of {len(inputs)} inputs too large for model {model_name}")
+            
+            # Handle 503 Service Unavailable errors specifically
+            if status_code == 503:
+                logger.warning(f"Service unavailable (503) for model {model_name} on attempt {attempts}: {str(e)}")
+                
+                # If this is the last attempt, try fallback mechanisms
                 if attempts == max_retries - 1:
                     try:
-                        if task == "summarization" and model_name != self.fallback_summarization_model:
-                            logger.info(f"Trying fallback summarization model: {self.fallback_summarization_model}")
-                            return self._call_inference_api(
-                                model_name=self.fallback_summarization_model,
-                                task=task,
-                                inputs=inputs,
-                                max_retries=1,
-                                **kwargs
-                            )
-                        elif task == "text-generation" and "t5" in model_name and model_name != self.fallback_t5_model:
-                            logger.info(f"Trying fallback T5 model: {self.fallback_t5_model}")
-                            return self._call_inference_api(
-                                model_name=self.fallback_t5_model,
-                                task=task,
-                                inputs=inputs,
-                                max_retries=1,
-                                **kwargs
-                            )
+                        logger.info(f"Service unavailable for {model_name}, trying fallback...")
+                        if task == "token-classification" and model_name == self.ner_model:
+                            # For NER, use basic entity extraction as fallback
+                            logger.info("Using basic entity extraction as fallback for NER")
+                            return True, self._basic_entities(inputs), inputs
+                        # Add other fallbacks for different tasks as needed
                     except Exception as fallback_error:
-                        logger.error(f"Fallback model also failed: {str(fallback_error)}")
-                
-            except HTTPError as e:
-                status_code = getattr(e.response, 'status_code', None)
-                
-                # Handle 503 Service Unavailable errors specifically
-                if status_code == 503:
-                    logger.warning(f"Service unavailable (503) for model {model_name} on attempt {attempts}: {str(e)}")
-                    last_error = e
-                    
-                    # If this is the last attempt, try fallback mechanisms
-                    if attempts == max_retries - 1:
-                        try:
-                            logger.info(f"Service unavailable for {model_name}, trying fallback...")
-                            if task == "token-classification" and model_name == self.ner_model:
-                                # For NER, use basic entity extraction as fallback
-                                logger.info("Using basic entity extraction as fallback for NER")
-                                from services.nlp_utils import extract_basic_entities
-                                entities = extract_basic_entities(inputs)
-                                return [
-                                    {"entity_group": entity_type, "score": 0.8, "word": entity}
-                                    for entity_type, entity_list in entities.items()
-                                    for entity in entity_list
-                                ]
-                            # Add other fallbacks for different tasks as needed
-                        except Exception as fallback_error:
-                            logger.error(f"Fallback mechanism also failed: {str(fallback_error)}")
+                        logger.error(f"Fallback mechanism also failed: {str(fallback_error)}")
+            
+            elif "INDEX_OUT_OF_BOUNDS" in str(e) or "out of DATA bounds" in str(e):
+                logger.error(f"Index out of bounds error on attempt {attempts}: {str(e)}")
                 
-                elif "INDEX_OUT_OF_BOUNDS" in str(e) or "out of DATA bounds" in str(e):
-                    logger.error(f"Index out of bounds error on attempt {attempts}: {str(e)}")
-                    last_error = e
-                    
-                    # If this is not the last attempt, reduce the input
-                    if attempts < max_retries:
-                        # Try with shorter input
-                        if len(inputs) > 500:
-                            cut_ratio = 0.7  # Cut 30% of the input
-                            logger.info(f"Reducing input length from {len(inputs)} to {int(len(inputs) * cut_ratio)}")
-                            
-                            # For first cut, try to cut from the end
-                            if attempts == 1:
-                                inputs = inputs[:int(len(inputs) * cut_ratio)]
-                            # For second cut, try to cut from both ends
-                            else:
-                                start_cut = int(len(inputs) * 0.15)
-                                end_cut = int(len(inputs) * 0.85)
-                                inputs = inputs[start_cut:end_cut]
-                    else:
-                        raise Exception(f"Index bounds error after {attempts} attempts: {str(e)}")
+                # If this is not the last attempt, reduce the input
+                if attempts < max_retries:
+                    # Try with shorter input
+                    if len(inputs) > 500:
+                        cut_ratio = 0.7  # Cut 30% of the input
+                        logger.info(f"Reducing input length from {len(inputs)} to {int(len(inputs) * cut_ratio)}")
+                        
+                        # For first cut, try to cut from the end
+                        if attempts == 1:
+                            inputs = inputs[:int(len(inputs) * cut_ratio)]
+                        # For second cut, try to cut from both ends
+                        else:
+                            start_cut = int(len(inputs) * 0.15)
+                            end_cut = int(len(inputs) * 0.85)
+                            inputs = inputs[start_cut:end_cut]
                 else:
-                    logger.error(f"API error on attempt {attempts}: {str(e)}")
-                    last_error = e
-                    
-            except Exception as e:
-                logger.error(f"API call error on attempt {attempts}: {str(e)}")
-                last_error = e
-                
-            # Wait before retry if not the last attempt
-            if attempts < max_retries:
-                # Exponential backoff with jitter
-                jitter = random.uniform(0, 0.5)  # Add random jitter between 0-0.5
-                wait_time = (base_wait_time * (2 ** (attempts - 1))) * (1 + jitter)
-                logger.info(f"Waiting {wait_time:.2f}s before retry {attempts+1}/{max_retries}")
-                time.sleep(wait_time)
+                    raise Exception(f"Index bounds error after {attempts} attempts: {str(e)}")
             else:
-                # All attempts failed
-                logger.error(f"All {max_retries} API call attempts failed for model {model_name}, task {task}")
+                logger.error(f"API error on attempt {attempts}: {str(e)}")
                 
-                # Return mock response as last resort fallback
-                logger.info("Using mock response as final fallback")
-                return self._get_mock_response(model_name, task, inputs)
+        except Exception as e:
+            logger.error(f"API call error on attempt {attempts}: {str(e)}")
+            breaker.record_failure()
+        
+        return False, None, inputs
+    
+    def _send_request(self, model_name: str, task: str, inputs: Union[str, List[str]], kwargs: Dict[str, Any]) -> Any:
+        """
+        Send one request to the task's inference backend (no retries or fallbacks).
+        
+        Args:
+            model_name: Name of the model to use
+            task: Task type
+            inputs: Text to process, or a list of texts for batched tasks
+            kwargs: Additional parameters for the task
+            
+        Returns:
+            API response based on task type
+        """
+        # Prepare task-specific parameters
+        task_kwargs = {}
+        
+        # Copy parameters from kwargs
+        for key, value in kwargs.items():
+            task_kwargs[key] = value
+        
+        # Adjust max tokens for all models to avoid errors
+        if "max_new_tokens" in task_kwargs and task_kwargs["max_new_tokens"] > 250:
+            logger.info(f"Limiting max_new_tokens to 250 for {model_name}")
+            task_kwargs["max_new_tokens"] = 250
+        elif "max_length" in task_kwargs and task_kwargs["max_length"] > 250:
+            logger.info(f"Limiting max_length to 250 for {model_name}")
+            task_kwargs["max_length"] = 250
+        
+        # Set default parameters if not provided
+        if task == "summarization":
+            if "max_new_tokens" not in task_kwargs and "max_length" not in task_kwargs:
+                task_kwargs["max_new_tokens"] = min(self.max_output_tokens, 250)  # Ensure within limits
+            if "min_length" not in task_kwargs:
+                task_kwargs["min_length"] = 30
+            if "do_sample" not in task_kwargs:
+                task_kwargs["do_sample"] = False
+        
+        elif task == "text-generation":
+            if "max_new_tokens" not in task_kwargs and "max_length" not in task_kwargs:
+                task_kwargs["max_new_tokens"] = min(self.max_output_tokens, 250)  # Ensure within limits
+            if "temperature" not in task_kwargs:
+                task_kwargs["temperature"] = 0.7
+            if "do_sample" not in task_kwargs:
+                task_kwargs["do_sample"] = True
+        
+        # Tasks on a local backend run in-process with the same parameters
+        backend = self.task_backend(task)
+        if backend != REMOTE_BACKEND:
+            return self.inference_backends[backend].infer(model_name, task, inputs, task_kwargs)
+        
+        # Batched request: a list of inputs in one payload, one result list per input
+        if isinstance(inputs, list):
+            if task not in BATCHED_TASKS:
+                raise ValueError(f"Task {task} does not support batched inputs")
+            response = self.inference_client.post(
+                json={"inputs": inputs, "options": {"wait_for_model": True}},
+                model=model_name,
+                task=task
+            )
+            return self._split_batch_response(response, len(inputs))
+        
+        # Call the appropriate InferenceClient method based on task
+        if task == "text-classification":
+            response = self.inference_client.text_classification(
+                inputs,
+                model=model_name
+            )
+            return response
+            
+        elif task == "summarization":
+            # For summarization, use the post method directly
+            # This is more compatible with different versions of the library
+            payload = {
+                "inputs": inputs
+            }
+            
+            # Add parameters if provided
+            if task_kwargs:
+                payload["parameters"] = {}
+                if "max_new_tokens" in task_kwargs:
+                    # Ensure max_new_tokens is within limits
+                    payload["parameters"]["max_new_tokens"] = min(task_kwargs["max_new_tokens"], 250)
+                if "min_length" in task_kwargs:
+                    payload["parameters"]["min_length"] = task_kwargs["min_length"]
+                if "do_sample" in task_kwargs:
+                    payload["parameters"]["do_sample"] = task_kwargs["do_sample"]
+            
+            response = self.inference_client.post(
+                json=payload,
+                model=model_name
+            )
+            
+            # Parse the response
+            if isinstance(response, dict) and "summary_text" in response:
+                return response
+            elif isinstance(response, str):
+                return {"summary_text": response}
+            else:
+                return {"summary_text": str(response)}
+            
+        elif task == "text-generation":
+            # Extract only the parameters that are valid for text generation
+            text_gen_kwargs = {
+                "model": model_name
+            }
+            
+            # Add valid parameters for text generation
+            if "max_new_tokens" in task_kwargs:
+                # Ensure max_new_tokens is within limits
+                text_gen_kwargs["max_new_tokens"] = min(task_kwargs["max_new_tokens"], 250)
+            if "temperature" in task_kwargs:
+                text_gen_kwargs["temperature"] = task_kwargs["temperature"]
+            if "do_sample" in task_kwargs:
+                text_gen_kwargs["do_sample"] = task_kwargs["do_sample"]
+            
+            response = self.inference_client.text_generation(
+                inputs,
+                **text_gen_kwargs
+            )
+            return {"generated_text": response}
+            
+        elif task == "token-classification":
+            response = self.inference_client.token_classification(
+                inputs,
+                model=model_name
+            )
+            return response
+            
+        else:
+            raise ValueError(f"Unsupported task type: {task}")
     
     def _get_mock_response(self, model_name: str, task: str, inputs: str) -> Any:
         """
@@ -367,6 +1028,10 @@ class HuggingFaceService:
         """
         logger.info(f"Generating mock response for model {model_name} and task {task}")
         
+        # Batched inputs get one response per input
+        if isinstance(inputs, list):
+            return [self._get_mock_response(model_name, task, item) for item in inputs]
+        
         # Generate appropriate mock response based on the task
         if task == "text-classification" and "finbert" in model_name:
             # Mock sentiment analysis response
@@ -393,7 +1058,7 @@ class HuggingFaceService:
             # Generic mock response
             return {"result": "Mock response for testing purposes"}
     
-    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+    def analyze_sentiment(self, text: Union[str, Document]) -> Dict[str, Any]:
         """
         Analyze sentiment of financial text using HuggingFace models.
         
@@ -403,28 +1068,20 @@ class HuggingFaceService:
         Returns:
             Dictionary with sentiment analysis results
         """
+        text = as_document(text)
         logger.info(f"Analyzing sentiment of text with length {len(text)}")
         
         try:
-            # Break into chunks if text is long
-            chunks = chunk_text(text, self.chunk_size, self.overlap_size, self.max_input_tokens)
+            # Break into chunks if text is long (shared plan, chunks sliced on use)
+            plan = self._chunk_plan(text, "text-classification")
             
             # Process each chunk
-            chunk_results = []
-            for i, chunk in enumerate(chunks[:5]):  # Limit to first 5 chunks for efficiency
-                logger.info(f"Processing chunk {i+1}/{min(len(chunks), 5)} for sentiment analysis")
-                
-                try:
-                    # Call the FinBERT API
-                    result = self._call_inference_api(
-                        model_name=self.finbert_model,
-                        task="text-classification",
-                        inputs=chunk
-                    )
-                    chunk_results.append(result)
-                except Exception as e:
-                    logger.error(f"Error analyzing sentiment for chunk {i+1}: {str(e)}")
-                    # Continue with other chunks
+            chunks = [text.text[start:end] for start, end in self._classification_chunks(plan)]
+            logger.info(f"Processing {len(chunks)} chunks for sentiment analysis")
+            
+            # Call the FinBERT API with batches of chunks; failed chunks are skipped
+            results = self._map_chunks_batched(self.finbert_model, "text-classification", chunks)
+            chunk_results = [result for result in results if result is not None]
             
             # Combine results from all chunks
             if chunk_results:
@@ -484,7 +1141,7 @@ class HuggingFaceService:
             # Use fallback sentiment analysis
             return fallback_sentiment_analysis(text)
     
-    def extract_entities(self, text: str) -> Dict[str, Any]:
+    def extract_entities(self, text: Union[str, Document]) -> Dict[str, Any]:
         """
         Extract named entities from text using HuggingFace models.
         
@@ -494,28 +1151,22 @@ class HuggingFaceService:
         Returns:
             Dictionary with extracted entities
         """
+        text = as_document(text)
         logger.info(f"Extracting entities from text with length {len(text)}")
         
         try:
-            # Break into chunks if text is long
-            chunks = chunk_text(text, self.chunk_size, self.overlap_size, self.max_input_tokens)
+            # Break into chunks if text is long (shared plan, chunks sliced on use)
+            plan = self._chunk_plan(text, "token-classification")
             
             # Process each chunk
             all_entities = []
-            for i, chunk in enumerate(chunks[:3]):  # Limit to first 3 chunks for efficiency
-                logger.info(f"Processing chunk {i+1}/{min(len(chunks), 3)} for entity extraction")
-                
-                try:
-                    # Call the NER API
-                    result = self._call_inference_api(
-                        model_name=self.ner_model,
-                        task="token-classification",
-                        inputs=chunk
-                    )
+            chunks = [text.text[start:end] for start, end in self._classification_chunks(plan)]
+            logger.info(f"Processing {len(chunks)} chunks for entity extraction")
+            
+            # Call the NER API with batches of chunks, entities stay in chunk order
+            for result in self._map_chunks_batched(self.ner_model, "token-classification", chunks):
+                if result is not None:
                     all_entities.extend(result)
-                except Exception as e:
-                    logger.error(f"Error extracting entities for chunk {i+1}: {str(e)}")
-                    # Continue with other chunks
             
             # Process and organize entities
             if all_entities:
@@ -593,7 +1244,7 @@ class HuggingFaceService:
             # Use fallback entity extraction
             return {"entities": extract_basic_entities(text), "method": "fallback"}
     
-    def analyze_risk(self, text: str) -> Dict[str, Any]:
+    def analyze_risk(self, text: Union[str, Document]) -> Dict[str, Any]:
         """
         Analyze risk factors in financial text.
         
@@ -603,32 +1254,44 @@ class HuggingFaceService:
         Returns:
             Dictionary with risk analysis results
         """
+        text = as_document(text)
         logger.info(f"Analyzing risks in text with length {len(text)}")
         
         try:
             # Use T5 model to analyze risks
             prompt = "Identify the top risk factors mentioned in this financial report: "
             
-            # Break into chunks if text is long
-            chunks = chunk_text(text, self.chunk_size, self.overlap_size, self.max_input_tokens)
+            # Break into chunks if text is long (shared plan, chunks sliced on use)
+            plan = self._chunk_plan(text)
+            
+            # Only sample the risk factors section when the report has one
+            risk_span = get_section_index(text).span("risk_factors")
+            if risk_span:
+                section_start, section_end = risk_span
+                plan = [
+                    (max(start, section_start), min(end, section_end))
+                    for start, end in plan if start < section_end and end > section_start
+                ]
             
             # Take a representative sample of the text
             sample_text = ""
-            if len(chunks) > 3:
+            if len(plan) > 3:
                 # Use first, middle, and last chunk
-                sample_text = chunks[0] + "\n...\n" + chunks[len(chunks)//2] + "\n...\n" + chunks[-1]
+                sample_spans = [plan[0], plan[len(plan)//2], plan[-1]]
+                sample_text = "\n...\n".join(text.text[start:end] for start, end in sample_spans)
             else:
-                sample_text = "\n".join(chunks)
+                sample_text = "\n".join(text.text[start:end] for start, end in plan)
             
             # Call the T5 API
             input_text = prompt + sample_text[:3000]  # Reduced from 4000 to improve reliability
             try:
-                result = self._call_inference_api(
+                # Retries wait on the event loop rather than blocking the thread
+                result = run_coroutine(self._call_inference_api_async(
                     model_name=self.t5_model,
                     task="text-generation",
                     inputs=input_text,
                     max_output_tokens=self.max_output_tokens
-                )
+                ))
                 
                 # Process results
                 risk_text = result.get("generated_text", "")
@@ -715,31 +1378,55 @@ class HuggingFaceService:
         normalized_score = min(total_score / (len(risk_factors) * 2), 1.0)
         return normalized_score
     
-    def generate_summary(self, text: str, metrics_dict: Dict[str, Any] = None) -> Dict[str, Any]:
+    def resolve_summary_engine(self, engine: Optional[str] = None) -> str:
         """
-        Generate a summary using Hugging Face models.
+        Resolve a summary engine name to the engine that will run.
+        
+        Args:
+            engine: "auto", "model" or "extractive" (defaults to SUMMARY_ENGINE)
+            
+        Returns:
+            "model" or "extractive"
+        """
+        engine = (engine or self.summary_engine).lower()
+        if engine not in SUMMARY_ENGINES:
+            raise ValueError(f"Unknown summary engine {engine}, expected one of {', '.join(SUMMARY_ENGINES)}")
+        if engine == "auto":
+            return "model" if self.can_run("summarization") else "extractive"
+        return engine
+    
+    def generate_summary(
+        self,
+        text: Union[str, Document],
+        metrics_dict: Dict[str, Any] = None,
+        engine: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a summary using Hugging Face models or the local extractive summarizer.
         
         Args:
             text (str): The text content of the annual report
             metrics_dict (dict): Optional dictionary of metrics from database
+            engine (str): "auto", "model" or "extractive" (defaults to SUMMARY_ENGINE);
+                the extractive engine makes no inference calls
             
         Returns:
             Dict[str, Any]: A structured summary of the annual report with metrics
         """
+        text = as_document(text)
+        if self.resolve_summary_engine(engine) == "extractive":
+            logger.info(f"Generating extractive summary for text of length {len(text)}")
+            return self._fallback_summary_generation(text, metrics_dict)
+        
         try:
             logger.info(f"Generating summary for text of length {len(text)} using HuggingFace models")
             
             # Use the configured summarization model
             model_name = self.summarization_model
             
-            # Chunk the text to handle large reports - using updated token limit
-            chunks = chunk_text(
-                text, 
-                chunk_size=self.chunk_size, 
-                overlap_size=self.overlap_size,
-                max_tokens=self.max_input_tokens
-            )
-            logger.info(f"Split text into {len(chunks)} chunks for summary generation")
+            # Chunk the text to handle large reports (shared plan, chunks sliced on use)
+            plan = self._chunk_plan(text)
+            logger.info(f"Split text into {len(plan)} chunks for summary generation")
             
             # Create metrics text if provided
             metrics_text = ""
@@ -750,79 +1437,29 @@ class HuggingFaceService:
                         metrics_text += f"- {key.replace('_', ' ').title()}: {value}\n"
                 metrics_text += "\n"
             
-            # Process each chunk and combine results
-            summaries = []
-            failed_chunks = []
-            
-            for i, chunk in enumerate(chunks[:5]):  # Limit to first 5 chunks for efficiency
-                logger.info(f"Processing chunk {i+1}/{min(len(chunks), 5)} for summary")
-                
-                # Create a prompt that includes metrics if available
-                if i == 0 and metrics_text:  # Only include metrics for first chunk
-                    prompt = f"{metrics_text}Summarize the following text: {chunk}"
+            # Create a prompt per chunk, including metrics for the first one only
+            prompts = []
+            for i, (start, end) in enumerate(plan[:5]):  # Limit to first 5 chunks for efficiency
+                chunk = text.text[start:end]
+                if i == 0 and metrics_text:
+                    prompts.append(f"{metrics_text}Summarize the following text: {chunk}")
                 else:
-                    prompt = f"Summarize the following text: {chunk}"
-                
-                # Try to process this chunk with multiple retries
-                chunk_success = False
-                chunk_attempts = 0
-                
-                while not chunk_success and chunk_attempts < self.max_chunk_retries:
-                    chunk_attempts += 1
-                    try:
-                        # Call the model API with explicit max_length
-                        result = self._call_inference_api(
-                            model_name=model_name,
-                            task="summarization",
-                            inputs=prompt,
-                            max_new_tokens=self.max_output_tokens
-                        )
-                        
-                        # Extract summary text
-                        summary_text = result.get("summary_text", "")
-                        if summary_text:
-                            summaries.append(summary_text)
-                            chunk_success = True
-                            logger.info(f"Successfully processed chunk {i+1}/{min(len(chunks), 5)}")
-                        else:
-                            raise Exception("Empty summary text returned")
-                        
-                    except Exception as e:
-                        logger.error(f"Error generating summary for chunk {i+1} (attempt {chunk_attempts}): {str(e)}")
-                        
-                        # If this is the last retry with primary model, try fallback model
-                        if chunk_attempts >= self.max_chunk_retries - 1 and model_name != self.fallback_summarization_model:
-                            try:
-                                logger.info(f"Trying fallback summarization model for chunk {i+1}")
-                                result = self._call_inference_api(
-                                    model_name=self.fallback_summarization_model,
-                                    task="summarization",
-                                    inputs=prompt,
-                                    max_new_tokens=self.max_output_tokens // 2,  # Shorter summary from fallback
-                                )
-                                
-                                summary_text = result.get("summary_text", "")
-                                if summary_text:
-                                    summaries.append(summary_text)
-                                    chunk_success = True
-                                    logger.info(f"Successfully processed chunk {i+1} with fallback model")
-                                else:
-                                    raise Exception("Empty summary text returned from fallback model")
-                                    
-                            except Exception as fallback_error:
-                                logger.error(f"Fallback model also failed for chunk {i+1}: {str(fallback_error)}")
-                                # Add to failed chunks and continue
-                                failed_chunks.append(i)
-                        
-                        # If not yet at retry limit, wait before retrying
-                        elif chunk_attempts < self.max_chunk_retries:
-                            # Wait before retry
-                            wait_time = 2 ** chunk_attempts  # Exponential backoff
-                            logger.info(f"Waiting {wait_time}s before retrying chunk {i+1}")
-                            time.sleep(wait_time)
-                        else:
-                            # Add to failed chunks and continue
-                            failed_chunks.append(i)
+                    prompts.append(f"Summarize the following text: {chunk}")
+            logger.info(f"Processing {len(prompts)} chunks for summary")
+            
+            # Summarize all chunks concurrently; a chunk is retried, then tried once with the fallback model
+            results = self._map_chunks(
+                model_name,
+                "summarization",
+                prompts,
+                accept=lambda result: bool(result.get("summary_text", "")),
+                chunk_retries=self.max_chunk_retries,
+                fallback_model=self.fallback_summarization_model,
+                fallback_kwargs={"max_new_tokens": self.max_output_tokens // 2},  # Shorter summary from fallback
+                max_new_tokens=self.max_output_tokens
+            )
+            summaries = [result["summary_text"] for result in results if result is not None]
+            failed_chunks = [i for i, result in enumerate(results) if result is None]
             
             # Check if there are any summaries
             if summaries:
@@ -836,7 +1473,7 @@ class HuggingFaceService:
                 return {
                     "summary": combined_summary,
                     "method": "bart",
-                    "chunks_processed": len(chunks) - len(failed_chunks),
+                    "chunks_processed": len(plan) - len(failed_chunks),
                     "chunks_failed": len(failed_chunks)
                 }
             else:
@@ -849,7 +1486,7 @@ class HuggingFaceService:
             # Use fallback summary generation
             return self._fallback_summary_generation(text, metrics_dict)
     
-    def _fallback_summary_generation(self, text: str, metrics_dict: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _fallback_summary_generation(self, text: Union[str, Document], metrics_dict: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Generate a summary using fallback methods when API calls fail.
         
@@ -862,36 +1499,9 @@ class HuggingFaceService:
         """
         logger.info("Using fallback method for summary generation")
         
-        # Split into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        # Extract important sentences
-        important_sentences = []
-        
-        # Keywords to look for
-        important_keywords = [
-            "key", "important", "significant", "highlight", "report", "financial",
-            "revenue", "profit", "loss", "growth", "decline", "increase", "decrease",
-            "billion", "million", "percent", "quarterly", "annual", "fiscal", "year"
-        ]
-        
-        # Go through sentences and score them based on keywords
-        sentence_scores = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 10 or len(sentence) > 200:
-                continue
-                
-            score = 0
-            for keyword in important_keywords:
-                if keyword in sentence.lower():
-                    score += 1
-            
-            sentence_scores.append((sentence, score))
-        
-        # Sort by score and take top sentences
-        sentence_scores.sort(key=lambda x: x[1], reverse=True)
-        top_sentences = [s[0] for s in sentence_scores[:10]]
+        # Rank sentences locally with the extractive summarizer
+        result = self.extractive_summarizer.summarize(text, max_sentences=10, focus_terms=SUMMARY_FOCUS_TERMS)
+        top_sentences = [sentence["text"] for sentence in result["sentences"]]
         
         # Add metrics information if available
         if metrics_dict and isinstance(metrics_dict, dict):
@@ -907,5 +1517,5 @@ class HuggingFaceService:
         
         return {
             "summary": summary,
-            "method": "fallback_extraction"
+            "method": "extractive"
         } 
\ No newline at end of file
@@ -0,0 +1,267 @@
+import os
+import time
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# The hosted InferenceClient; HuggingFaceService sends these requests itself
+REMOTE_BACKEND = "remote"
+
+# Tasks a local backend can run
+LOCAL_TASKS = ("text-classification", "token-classification", "summarization", "text-generation")
+
+
+def parse_task_backends(value: str) -> Dict[str, str]:
+    """Parse per-task backends written as "task=backend,task=backend" (e.g. INFERENCE_TASK_BACKENDS)."""
+    backends = {}
+    for item in value.split(","):
+        task, _, backend = item.strip().partition("=")
+        if task.strip() and backend.strip():
+            backends[task.strip()] = backend.strip().lower()
+        elif item.strip():
+            logger.warning(f"Ignoring malformed task backend {item.strip()}")
+    return backends
+
+
+class InferenceBackend:
+    """
+    Interface of an inference backend HuggingFaceService can send requests to.
+
+    A backend runs one request at a time per call and returns results in the
+    format of the hosted API, so callers do not depend on where a model runs:
+    text-classification gives a list of {"label", "score"} per input,
+    token-classification a list of {"entity_group", "score", "word", "start",
+    "end"} per input, summarization {"summary_text"} and text-generation
+    {"generated_text"}. A list of inputs gives a list with one result per input.
+    """
+
+    name = "base"
+
+    def infer(self, model_name: str, task: str, inputs: Union[str, List[str]], parameters: Dict[str, Any]) -> Any:
+        """
+        Run a model on single or batched inputs.
+
+        Args:
+            model_name: Name of the model (as on the HuggingFace Hub)
+            task: Task type
+            inputs: Text to process, or a list of texts
+            parameters: Task parameters (max_new_tokens, min_length, do_sample, ...)
+
+        Returns:
+            Result in the format of the hosted API
+        """
+        raise NotImplementedError
+
+    def warm_up(self, model_name: str, task: str) -> bool:
+        """Prepare a model ahead of its first request; True if it is ready."""
+        return True
+
+
+class LocalInferenceBackend(InferenceBackend):
+    """
+    Run models in-process on the CPU with transformers.
+
+    Models are loaded from a local directory, never downloaded: the model
+    "ProsusAI/finbert" is read from LOCAL_MODEL_DIR/ProsusAI/finbert (or
+    LOCAL_MODEL_DIR/ProsusAI--finbert), as written by save_pretrained or
+    `huggingface-cli download --local-dir`. A loaded model stays in memory
+    for the life of the process, so only the first report pays for loading
+    it. Batched inputs run through the pipeline in batches of
+    LOCAL_BATCH_SIZE; calls to one model are serialized, as the model
+    already uses all its threads. torch and transformers are imported when
+    the first model is loaded, so the API starts without them.
+
+    Configuration (environment):
+        LOCAL_MODEL_DIR: Directory of the local models (default ./local_models)
+        LOCAL_MODEL_PATHS: Per-model directories as "model=path" pairs separated by commas
+        LOCAL_MODEL_QUANTIZE: "int8" for dynamically quantized int8 linear layers, "none" (default)
+        LOCAL_BATCH_SIZE: Inputs per forward pass (default 8)
+        LOCAL_MODEL_THREADS: torch CPU threads, 0 for torch's default (default 0)
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        quantize: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        threads: Optional[int] = None
+    ):
+        self.model_dir = model_dir or os.getenv("LOCAL_MODEL_DIR", os.path.join(os.getcwd(), "local_models"))
+        self.model_paths = {}
+        for item in os.getenv("LOCAL_MODEL_PATHS", "").split(","):
+            model_name, _, path = item.strip().rpartition("=")
+            if model_name and path:
+                self.model_paths[model_name.strip()] = path.strip()
+        self.quantize = (quantize or os.getenv("LOCAL_MODEL_QUANTIZE", "none")).lower()
+        if self.quantize not in ("none", "int8"):
+            logger.warning(f"Unknown LOCAL_MODEL_QUANTIZE {self.quantize}, using none")
+            self.quantize = "none"
+        self.batch_size = max(batch_size or int(os.getenv("LOCAL_BATCH_SIZE", "8")), 1)
+        self.threads = threads if threads is not None else int(os.getenv("LOCAL_MODEL_THREADS", "0"))
+
+        self._pipelines: Dict[Tuple[str, str], Any] = {}
+        self._model_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def resolve_model_path(self, model_name: str) -> str:
+        """
+        Get the local directory of a model.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            Path of the directory holding the model's config and weights
+
+        Raises:
+            FileNotFoundError: If the model is not in the local model directory
+        """
+        candidates = [self.model_paths[model_name]] if model_name in self.model_paths else [
+            os.path.join(self.model_dir, model_name),
+            os.path.join(self.model_dir, model_name.replace("/", "--"))
+        ]
+        for path in candidates:
+            if os.path.isfile(os.path.join(path, "config.json")):
+                return path
+        raise FileNotFoundError(f"Local model {model_name} not found (looked in {', '.join(candidates)})")
+
+    def infer(self, model_name: str, task: str, inputs: Union[str, List[str]], parameters: Dict[str, Any]) -> Any:
+        if task not in LOCAL_TASKS:
+            raise ValueError(f"Task {task} is not supported by the local backend")
+        runner = self._pipeline(model_name, task)
+        items = inputs if isinstance(inputs, list) else [inputs]
+        call_kwargs = self._call_kwargs(runner, task, parameters)
+        with self._model_locks[(model_name, task)]:
+            outputs = runner(items, batch_size=self.batch_size, **call_kwargs)
+        results = [self._format(task, output) for output in outputs]
+        return results if isinstance(inputs, list) else results[0]
+
+    def warm_up(self, model_name: str, task: str) -> bool:
+        try:
+            self._pipeline(model_name, task)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load local model {model_name} for {task}: {str(e)}")
+            return False
+
+    def loaded_models(self) -> List[Dict[str, str]]:
+        """Get the models kept in memory."""
+        with self._lock:
+            return [{"model": model_name, "task": task} for model_name, task in self._pipelines]
+
+    def _pipeline(self, model_name: str, task: str) -> Any:
+        """Get the pipeline of a model, loading it on first use."""
+        key = (model_name, task)
+        runner = self._pipelines.get(key)
+        if runner is not None:
+            return runner
+        with self._lock:
+            if key not in self._model_locks:
+                self._model_locks[key] = threading.Lock()
+        # Loading holds the model's lock, so concurrent first requests load it once
+        with self._model_locks[key]:
+            runner = self._pipelines.get(key)
+            if runner is None:
+                runner = self._load(model_name, task)
+                with self._lock:
+                    self._pipelines[key] = runner
+        return runner
+
+    def _load(self, model_name: str, task: str) -> Any:
+        # Imported lazily: torch and transformers take seconds to import and are only needed here
+        import torch
+        from transformers import (
+            AutoConfig, AutoTokenizer, AutoModelForSequenceClassification,
+            AutoModelForTokenClassification, AutoModelForSeq2SeqLM, AutoModelForCausalLM, pipeline
+        )
+
+        start_time = time.time()
+        path = self.resolve_model_path(model_name)
+        if self.threads > 0:
+            torch.set_num_threads(self.threads)
+
+        config = AutoConfig.from_pretrained(path)
+        if task == "text-classification":
+            model_class, pipeline_task = AutoModelForSequenceClassification, "text-classification"
+        elif task == "token-classification":
+            model_class, pipeline_task = AutoModelForTokenClassification, "token-classification"
+        elif config.is_encoder_decoder:
+            model_class = AutoModelForSeq2SeqLM
+            pipeline_task = "summarization" if task == "summarization" else "text2text-generation"
+        else:
+            model_class, pipeline_task = AutoModelForCausalLM, "text-generation"
+
+        tokenizer = AutoTokenizer.from_pretrained(path)
+        model = model_class.from_pretrained(path)
+        model.eval()
+        if self.quantize == "int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        runner = pipeline(pipeline_task, model=model, tokenizer=tokenizer, device=-1)
+        weights = "int8" if self.quantize == "int8" else "full-precision"
+        logger.info(
+            f"Loaded local model {model_name} for {task} from {path} "
+            f"({weights} weights) in {time.time() - start_time:.2f} seconds"
+        )
+        return runner
+
+    @staticmethod
+    def _call_kwargs(runner: Any, task: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate task parameters to pipeline arguments."""
+        if task == "text-classification":
+            return {"top_k": None, "truncation": True}
+        if task == "token-classification":
+            call_kwargs = {"aggregation_strategy": "simple"}
+            # Inputs longer than the model's window are split into overlapping windows
+            tokenizer = runner.tokenizer
+            if tokenizer.is_fast and tokenizer.model_max_length < 100000:
+                call_kwargs["stride"] = min(128, tokenizer.model_max_length // 4)
+            return call_kwargs
+        call_kwargs = {"truncation": True}
+        for key in ("max_new_tokens", "max_length", "min_length", "do_sample", "temperature"):
+            if key in parameters:
+                call_kwargs[key] = parameters[key]
+        if not call_kwargs.get("do_sample"):
+            call_kwargs.pop("temperature", None)
+        if task == "text-generation" and runner.task == "text-generation":
+            call_kwargs["return_full_text"] = False
+        return call_kwargs
+
+    @staticmethod
+    def _format(task: str, output: Any) -> Any:
+        """Convert a pipeline output to the format of the hosted API."""
+        if task == "text-classification":
+            return [{"label": item["label"], "score": float(item["score"])} for item in output]
+        if task == "token-classification":
+            return [
+                {
+                    "entity_group": item["entity_group"],
+                    "score": float(item["score"]),
+                    "word": item["word"],
+                    "start": int(item["start"]) if item.get("start") is not None else None,
+                    "end": int(item["end"]) if item.get("end") is not None else None
+                }
+                for item in output
+            ]
+        if isinstance(output, list):
+            output = output[0]
+        if task == "summarization":
+            return {"summary_text": output.get("summary_text", output.get("generated_text", ""))}
+        return {"generated_text": output.get("generated_text", "")}
+
+
+_local_backend: Optional[LocalInferenceBackend] = None
+_local_backend_lock = threading.Lock()
+
+
+def get_local_inference_backend() -> LocalInferenceBackend:
+    """Get the process-wide local backend, whose loaded models are shared by all services."""
+    global _local_backend
+    with _local_backend_lock:
+        if _local_backend is None:
+            _local_backend = LocalInferenceBackend()
+        return _local_backend
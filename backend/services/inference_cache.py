@@ -0,0 +1,316 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cached results changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+
+def cache_key(model_name: str, task: str, params: Optional[Dict[str, Any]], inputs: str) -> str:
+    """
+    Build the cache key of one inference input.
+
+    Args:
+        model_name: Name of the model
+        task: Task type
+        params: Task parameters; None values are dropped and keys sorted, so
+            equivalent parameter dicts give the same key
+        inputs: Input text
+
+    Returns:
+        Hex digest identifying model, task, parameters and input
+    """
+    normalized = {key: value for key, value in (params or {}).items() if value is not None}
+    input_hash = hashlib.sha256(inputs.encode("utf-8")).hexdigest()
+    description = json.dumps(
+        [CACHE_FORMAT_VERSION, model_name, task, normalized, input_hash], sort_keys=True, default=str
+    )
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+class InferenceCache:
+    """
+    Two-tier cache of inference results: an in-process LRU over an SQLite file.
+
+    Results are keyed by model, task, normalized parameters and the hash of
+    the input text, so identical chunks (reprocessed reports, boilerplate
+    shared across years, repeated summary requests) are answered without an
+    inference call. Batched inputs are cached per item, so a batch only sends
+    the items that are not cached yet. The in-process tier holds the most
+    recently used results of this process; the SQLite tier is shared by all
+    processes using the same file and survives restarts. Entries expire after
+    a TTL, and the least recently used entries are evicted when the file
+    exceeds its size limit.
+
+    Configuration (environment):
+        INFERENCE_CACHE_ENABLED: "true" (default) or "false"
+        INFERENCE_CACHE_PATH: SQLite file (default ./cache/inference.sqlite3)
+        INFERENCE_CACHE_MAX_MB: Maximum size of the cached results on disk (default 256)
+        INFERENCE_CACHE_MEMORY_ENTRIES: Results kept in process memory (default 2048)
+        INFERENCE_CACHE_TTL_HOURS: Age after which results expire, 0 for never (default 720)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        memory_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.path = path or os.getenv(
+            "INFERENCE_CACHE_PATH",
+            os.path.join(os.getcwd(), "cache", "inference.sqlite3")
+        )
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("INFERENCE_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        if memory_entries is None:
+            memory_entries = int(os.getenv("INFERENCE_CACHE_MEMORY_ENTRIES", "2048"))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("INFERENCE_CACHE_TTL_HOURS", "720")) * 3600
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disk_bytes: Optional[int] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["InferenceCache"]:
+        """Create a cache from environment settings, or None if caching is disabled."""
+        if os.getenv("INFERENCE_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        return cls()
+
+    def get(self, model_name: str, task: str, params: Optional[Dict[str, Any]], inputs: str) -> Optional[Any]:
+        """
+        Look up the result of one input.
+
+        Args:
+            model_name: Name of the model
+            task: Task type
+            params: Task parameters
+            inputs: Input text
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        key = cache_key(model_name, task, params, inputs)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._is_expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return json.loads(entry[1])
+                del self._memory[key]
+
+            row = self._read(key, now)
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row)
+            self.disk_hits += 1
+            return json.loads(row[1])
+
+    def get_many(
+        self,
+        model_name: str,
+        task: str,
+        params: Optional[Dict[str, Any]],
+        inputs: List[str]
+    ) -> List[Optional[Any]]:
+        """Look up the results of several inputs (None for each miss)."""
+        return [self.get(model_name, task, params, item) for item in inputs]
+
+    def put(
+        self,
+        model_name: str,
+        task: str,
+        params: Optional[Dict[str, Any]],
+        inputs: Union[str, List[str]],
+        result: Any
+    ) -> None:
+        """
+        Store the result of an input, or the per-item results of a batch.
+
+        Errors are logged, never raised: a failing cache must not fail the call.
+
+        Args:
+            model_name: Name of the model
+            task: Task type
+            params: Task parameters
+            inputs: Input text, or the list of batched input texts
+            result: Result, or the list of per-item results of a batch
+        """
+        if isinstance(inputs, list):
+            items = list(zip(inputs, result))
+        else:
+            items = [(inputs, result)]
+        try:
+            now = time.time()
+            rows = []
+            for item_inputs, item_result in items:
+                value = json.dumps(item_result, default=str)
+                rows.append((cache_key(model_name, task, params, item_inputs), model_name, task, value,
+                             len(value), now, now))
+            with self._lock:
+                for key, _, _, value, _, created, _ in rows:
+                    self._remember(key, (created, value))
+                self._write(rows)
+                self.stores += len(rows)
+        except Exception as e:
+            logger.warning(f"Could not cache {task} result of {model_name}: {str(e)}")
+
+    def clear(self) -> None:
+        """Remove all cached results from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            connection = self._connect(create=False)
+            if connection is not None:
+                connection.execute("DELETE FROM results")
+                connection.commit()
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current size of both tiers."""
+        with self._lock:
+            connection = self._connect(create=False)
+            disk_entries, disk_bytes = 0, 0
+            if connection is not None:
+                disk_entries, disk_bytes = connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_max_entries": self.memory_entries,
+                "disk_entries": disk_entries,
+                "disk_size_bytes": disk_bytes,
+                "disk_max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None,
+                "stores": self.stores,
+                "expired": self.expired,
+                "evictions": self.evictions
+            }
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        """Put an entry in the in-process tier, dropping its least recently used entries."""
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        """Open the SQLite file once; without create, a missing file is not created."""
+        if self._connection is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, model TEXT, task TEXT, value TEXT, size INTEGER, "
+                "created REAL, accessed REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _read(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Read an entry from the SQLite tier, refreshing its LRU position (None if absent or expired)."""
+        try:
+            connection = self._connect(create=False)
+            if connection is None:
+                return None
+            row = connection.execute("SELECT created, value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self._is_expired(row[0], now):
+                connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                connection.commit()
+                self.expired += 1
+                self._disk_bytes = None
+                return None
+            connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            connection.commit()
+            return row[0], row[1]
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading inference cache {self.path}: {str(e)}")
+            return None
+
+    def _write(self, rows: List[Tuple[str, str, str, str, int, float, float]]) -> None:
+        """Write entries to the SQLite tier, then enforce the TTL and size limit."""
+        connection = self._connect()
+        connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        connection.commit()
+        if self._disk_bytes is None:
+            self._disk_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        else:
+            self._disk_bytes += sum(row[4] for row in rows)
+        if self._disk_bytes > self.max_bytes:
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Delete expired entries, then least recently used ones until the file holds 90% of its limit."""
+        if self.ttl_seconds > 0:
+            deleted = connection.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self.expired += max(deleted, 0)
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        if total > target:
+            for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+                if total <= target:
+                    break
+                victims.append((key,))
+                total -= size
+            connection.executemany("DELETE FROM results WHERE key = ?", victims)
+            self.evictions += len(victims)
+            logger.info(f"Evicted {len(victims)} inference cache entries")
+        connection.commit()
+        self._disk_bytes = total
+
+
+_default_cache: Optional[InferenceCache] = None
+_default_cache_loaded = False
+
+
+def get_inference_cache() -> Optional[InferenceCache]:
+    """Get the process-wide inference cache (None if INFERENCE_CACHE_ENABLED is false)."""
+    global _default_cache, _default_cache_loaded
+    if not _default_cache_loaded:
+        _default_cache = InferenceCache.from_env()
+        _default_cache_loaded = True
+    return _default_cache
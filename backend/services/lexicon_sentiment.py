@@ -0,0 +1,211 @@
+import logging
+import itertools
+from typing import List, Dict, Any, Iterable, Optional, Union
+
+import numpy as np
+
+from services.document import Document, as_document
+from services.section_index import get_section_index
+
+logger = logging.getLogger(__name__)
+
+# Finance sentiment lexicon (in the spirit of the Loughran-McDonald word lists).
+# Words are lemmas; regular inflections (-s, -es, -ed, -ing, -ies, ...) are added
+# when the lexicon is compiled, irregular forms are listed explicitly.
+FINANCE_LEXICON = {
+    "positive": """
+        achieve advance advantage attractive benefit beneficial boost breakthrough confident
+        efficient efficiency enhance exceed excellent expand expansion favorable favourable gain
+        grow grew grown growth improve improvement increase innovative innovation leadership
+        opportunity optimistic outperform positive profit profitable profitability progress
+        rebound recover recovery resilient resilience reward robust solid stability strength
+        strengthen strong stronger strongest success successful surpass upturn win won
+    """,
+    "negative": """
+        adverse adversely bankruptcy breach challenge challenging closure concern decline
+        decrease default deficit deteriorate deterioration difficult difficulty disrupt
+        disruption dispute downturn fail failure fall fell fallen fraud impair impairment
+        inability lawsuit liability litigation loss lose lost negative penalty poor recession
+        restructuring shortfall slowdown threat unable unfavorable unfavourable weak weaken
+        weakness worsen writedown
+    """,
+    "uncertainty": """
+        approximate approximately assume assumption contingency contingent depend dependent
+        doubt estimate exposure fluctuate fluctuation indefinite may might could perhaps
+        possible possibly predict probable risk risky speculative sudden uncertain uncertainty
+        unclear unknown unpredictable variable volatile volatility
+    """,
+}
+
+# Count columns: lexicon categories, then words outside the lexicon
+CATEGORIES = ["positive", "negative", "uncertainty"]
+_OTHER = len(CATEGORIES)
+
+# Everything but letters separates words
+_SEPARATORS = str.maketrans({chr(c): " " for c in range(128) if not chr(c).isalpha()})
+
+
+def _inflections(word: str) -> List[str]:
+    """Get a lemma and its regular inflections."""
+    forms = [word, word + "s", word + "es", word + "ed", word + "ing"]
+    if word.endswith("e"):
+        forms.extend([word + "d", word[:-1] + "ing"])
+    if word.endswith("y"):
+        forms.extend([word[:-1] + "ies", word[:-1] + "ied"])
+    return forms
+
+
+def sentiment_label(positive: float, negative: float) -> str:
+    """Label counts the way the lexicon fallback always has: one side must outweigh the other by half."""
+    if positive > negative * 1.5:
+        return "positive"
+    if negative > positive * 1.5:
+        return "negative"
+    return "neutral"
+
+
+class LexiconSentimentAnalyzer:
+    """
+    Score finance sentiment per page and section with a word lexicon.
+
+    The lowercased text is tokenized once (separators translated to spaces
+    and split in C), every token is mapped to its lexicon category with one
+    dictionary lookup, and NumPy turns the category codes into positive,
+    negative and uncertainty counts per text segment. Segments are the pieces
+    between page and section boundaries, so page and section totals are sums
+    of segment rows. Cheap enough to run on every report as a first pass.
+
+    Usage:
+        result = get_lexicon_sentiment_analyzer().analyze(document)
+        result["document"]["score"], result["sections"]["mdna"], result["pages"][0]
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, Union[str, Iterable[str]]]] = None):
+        """
+        Args:
+            lexicon: Words per category ("positive", "negative", "uncertainty"),
+                as lists or whitespace-separated strings; defaults to FINANCE_LEXICON
+        """
+        lexicon = lexicon if lexicon is not None else FINANCE_LEXICON
+        self.codes: Dict[str, int] = {}
+        for code, category in enumerate(CATEGORIES):
+            words = lexicon.get(category, [])
+            if isinstance(words, str):
+                words = words.split()
+            for word in words:
+                for form in _inflections(word.lower()):
+                    self.codes.setdefault(form, code)
+        self._cache_key = f"lexicon_sentiment:{id(self)}"
+
+    def analyze(self, text: Union[str, Document]) -> Dict[str, Any]:
+        """
+        Score a text (or Document); results are cached on the Document.
+
+        Args:
+            text: Text or Document to analyze
+
+        Returns:
+            Dictionary with "document" scores, "sections" scores by section
+            name (from the section index), "pages" scores in page order and
+            "method". Each score dict has the "positive", "negative",
+            "uncertainty" and total "words" counts, the net tone "score"
+            ((positive - negative) / (positive + negative), 0 without hits)
+            and a "sentiment" label
+        """
+        document = as_document(text)
+        result = document.get_derived(self._cache_key)
+        if result is None:
+            result = self._analyze(document)
+            document.set_derived(self._cache_key, result)
+        return result
+
+    def _analyze(self, document: Document) -> Dict[str, Any]:
+        text_length = len(document)
+        page_offsets = np.asarray(document.page_offsets, dtype=np.int64)
+        sections = get_section_index(document).sections
+
+        # Segments between all page and section boundaries
+        boundaries = set(document.page_offsets)
+        for section in sections:
+            boundaries.update((section["start"], section["end"]))
+        segment_starts = np.array(sorted(b for b in boundaries if 0 <= b < text_length) or [0], dtype=np.int64)
+        segment_ends = np.append(segment_starts[1:], text_length)
+
+        # Tokenize once and code every token by its lexicon category
+        separated = document.lower.translate(_SEPARATORS)
+        lengths = []
+        tokens = []
+        for start, end in zip(segment_starts.tolist(), segment_ends.tolist()):
+            words = separated[start:end].split()
+            lengths.append(len(words))
+            tokens.extend(words)
+        codes = np.fromiter(
+            map(self.codes.get, tokens, itertools.repeat(_OTHER)), dtype=np.int64, count=len(tokens)
+        )
+        segment_ids = np.repeat(np.arange(len(lengths)), lengths)
+        segment_counts = np.bincount(
+            segment_ids * (_OTHER + 1) + codes, minlength=len(lengths) * (_OTHER + 1)
+        ).reshape(len(lengths), _OTHER + 1)
+
+        # Pages: sum the segments starting on each page
+        segment_pages = np.searchsorted(page_offsets, segment_starts, side="right") - 1
+        page_counts = np.zeros((len(page_offsets), _OTHER + 1), dtype=np.int64)
+        np.add.at(page_counts, segment_pages, segment_counts)
+
+        # Sections: differences of the running segment totals, summed per section name
+        running = np.vstack([np.zeros((1, _OTHER + 1), dtype=np.int64), np.cumsum(segment_counts, axis=0)])
+        section_counts: Dict[str, np.ndarray] = {}
+        for section in sections:
+            first = np.searchsorted(segment_starts, section["start"])
+            last = np.searchsorted(segment_starts, section["end"])
+            counts = running[last] - running[first]
+            section_counts[section["section"]] = section_counts.get(section["section"], 0) + counts
+
+        pages = self._scores(page_counts)
+        for page_number, page in enumerate(pages, start=1):
+            page["page_number"] = page_number
+        section_names = list(section_counts)
+        section_scores = self._scores(np.array([section_counts[name] for name in section_names]).reshape(-1, _OTHER + 1))
+
+        return {
+            "document": self._scores(segment_counts.sum(axis=0, keepdims=True))[0],
+            "sections": dict(zip(section_names, section_scores)),
+            "pages": pages,
+            "method": "lexicon"
+        }
+
+    @staticmethod
+    def _scores(counts: np.ndarray) -> List[Dict[str, Any]]:
+        """Turn rows of category counts into score dicts."""
+        positive, negative = counts[:, 0], counts[:, 1]
+        hits = positive + negative
+        scores = np.divide(positive - negative, hits, out=np.zeros(len(counts)), where=hits > 0)
+        words = counts.sum(axis=1)
+        return [
+            {
+                "positive": int(row[0]),
+                "negative": int(row[1]),
+                "uncertainty": int(row[2]),
+                "words": int(total),
+                "score": round(float(score), 4),
+                "sentiment": sentiment_label(row[0], row[1])
+            }
+            for row, total, score in zip(counts.tolist(), words.tolist(), scores.tolist())
+        ]
+
+
+def sentiment_distribution(scores: Dict[str, Any]) -> Dict[str, float]:
+    """Share of positive, negative and uncertainty words among the lexicon hits of a score dict."""
+    hits = sum(scores[category] for category in CATEGORIES)
+    return {category: round(scores[category] / hits, 4) if hits else 0.0 for category in CATEGORIES}
+
+
+_default_analyzer: Optional[LexiconSentimentAnalyzer] = None
+
+
+def get_lexicon_sentiment_analyzer() -> LexiconSentimentAnalyzer:
+    """Get the shared analyzer for the built-in finance lexicon (compiled once)."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = LexiconSentimentAnalyzer()
+    return _default_analyzer
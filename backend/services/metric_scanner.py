@@ -0,0 +1,306 @@
+import os
+import re
+import json
+import logging
+from typing import List, Dict, Any, Iterable, Optional, Union
+
+from services.document import Document, as_document
+
+logger = logging.getLogger(__name__)
+
+# Unit words (as they appear in lowercased text) and the scale they stand for
+UNIT_SCALES = {
+    "thousand": ("thousand", 1_000),
+    "k": ("thousand", 1_000),
+    "million": ("million", 1_000_000),
+    "m": ("million", 1_000_000),
+    "billion": ("billion", 1_000_000_000),
+    "b": ("billion", 1_000_000_000),
+}
+
+# Built-in metric definitions. Patterns run on lowercased text, start at a word
+# and capture the amount in a "value" group and, optionally, its unit word in a
+# "unit" group. "keywords" lists the words (or word beginnings) a match can start
+# with; definitions without keywords are tried at every word instead.
+#   group "statement": metrics stated in prose ("revenue was $4.2 billion"), every occurrence
+#   group "line_item": financial statement lines ("Total assets ... 12,345"), used for KPIs
+DEFAULT_METRIC_DEFINITIONS = [
+    {
+        "name": "Revenue", "category": "Income Statement", "group": "statement",
+        "keywords": ["total", "revenue"],
+        "pattern": r'(?:total )?revenue(?:s)? (?:of|was|were|amounted to)? \$?(?P<value>\d+(?:\.\d+)?)\s?(?P<unit>million|billion|m|b|k|thousand)?'
+    },
+    {
+        "name": "Net Income", "category": "Income Statement", "group": "statement",
+        "keywords": ["net"],
+        "pattern": r'net income (?:of|was|were|amounted to)? \$?(?P<value>\d+(?:\.\d+)?)\s?(?P<unit>million|billion|m|b|k|thousand)?'
+    },
+    {
+        "name": "EPS", "category": "Financial Ratios", "group": "statement",
+        "keywords": ["earnings"],
+        "pattern": r'earnings per share (?:of|was|were|amounted to)? \$?(?P<value>\d+(?:\.\d+)?)'
+    },
+    {
+        "name": "Profit", "category": "Income Statement", "group": "statement",
+        "keywords": ["gross", "operating", "net"],
+        "pattern": r'(?:gross|operating|net) profit (?:of|was|were|amounted to)? \$?(?P<value>\d+(?:\.\d+)?)\s?(?P<unit>million|billion|m|b|k|thousand)?'
+    },
+    {"name": "revenue", "category": "Income Statement", "group": "line_item",
+     "keywords": ["total", "revenue"],
+     "pattern": r'(?:total\s+revenue|revenue)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "net_income", "category": "Income Statement", "group": "line_item",
+     "keywords": ["net"],
+     "pattern": r'(?:net\s+income|net\s+profit|net\s+earnings)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "total_assets", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["total"],
+     "pattern": r'(?:total\s+assets)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "total_liabilities", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["total"],
+     "pattern": r'(?:total\s+liabilities)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "total_equity", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["total", "shareholders"],
+     "pattern": r"(?:total\s+equity|shareholders['']?\s+equity)[^\n\d]+(?P<value>[\d,\.]+)"},
+    {"name": "current_assets", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["current"],
+     "pattern": r'(?:current\s+assets)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "current_liabilities", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["current"],
+     "pattern": r'(?:current\s+liabilities)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "inventory", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["inventor"],
+     "pattern": r'(?:inventory|inventories)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "cash", "category": "Balance Sheet", "group": "line_item",
+     "keywords": ["cash"],
+     "pattern": r'(?:cash\s+and\s+cash\s+equivalents|cash\s+equivalents)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "operating_income", "category": "Income Statement", "group": "line_item",
+     "keywords": ["operating", "income"],
+     "pattern": r'(?:operating\s+income|income\s+from\s+operations)[^\n\d]+(?P<value>[\d,\.]+)'},
+    {"name": "interest_expense", "category": "Income Statement", "group": "line_item",
+     "keywords": ["interest"],
+     "pattern": r'(?:interest\s+expense)[^\n\d]+(?P<value>[\d,\.]+)'},
+]
+
+# Named groups are only needed to read values; the combined scan pattern drops them
+_NAMED_GROUP_PATTERN = re.compile(r'\(\?P<\w+>')
+
+
+def parse_amount(value: str) -> Optional[float]:
+    """Parse an amount such as "1,234.5" (None if it is not a number)."""
+    try:
+        return float(value.replace(',', '').strip())
+    except ValueError:
+        return None
+
+
+class MetricDefinition:
+    """A named metric pattern; see DEFAULT_METRIC_DEFINITIONS for the fields."""
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        category: str = "Other",
+        group: str = "statement",
+        keywords: Optional[List[str]] = None
+    ):
+        self.name = name
+        self.category = category
+        self.group = group
+        self.keywords = [keyword.lower() for keyword in keywords or []]
+        self.source = pattern
+        self.pattern = re.compile(pattern)
+        if "value" not in self.pattern.groupindex:
+            raise ValueError(f"Metric pattern for {name} has no (?P<value>...) group")
+
+    @classmethod
+    def from_dict(cls, definition: Dict[str, Any]) -> "MetricDefinition":
+        return cls(
+            definition["name"],
+            definition["pattern"],
+            definition.get("category", "Other"),
+            definition.get("group", "statement"),
+            definition.get("keywords")
+        )
+
+
+class MetricScanner:
+    """
+    Find every metric candidate of a document in a single pass.
+
+    One compiled pattern finds, in a single pass over the lowercased text,
+    the words metric matches start with (the definitions' keywords). Only
+    there are the definitions that can start with that word tried, so each
+    definition yields the matches a separate re.finditer would (except that
+    matches never start inside a word), without scanning or lowercasing the
+    text once per pattern. Definitions without keywords are tried through a
+    combined lookahead at every word instead.
+
+    Usage:
+        scanner = get_metric_scanner()
+        for candidate in scanner.scan(document, group="line_item"):
+            print(candidate["name"], candidate["value_numeric"], candidate["start"])
+    """
+
+    def __init__(self, definitions: Optional[Iterable[Union[MetricDefinition, Dict[str, Any]]]] = None):
+        """
+        Args:
+            definitions: Metric definitions (MetricDefinition objects or dicts);
+                defaults to DEFAULT_METRIC_DEFINITIONS
+        """
+        if definitions is None:
+            definitions = DEFAULT_METRIC_DEFINITIONS
+        self.definitions = [
+            definition if isinstance(definition, MetricDefinition) else MetricDefinition.from_dict(definition)
+            for definition in definitions
+        ]
+
+        # Definition indices by the keyword their matches start with
+        keyword_definitions: Dict[str, List[int]] = {}
+        anchors = []
+        for index, definition in enumerate(self.definitions):
+            for keyword in definition.keywords:
+                keyword_definitions.setdefault(keyword, []).append(index)
+        # The alternation reports the longest keyword at a position; every shorter keyword
+        # matching there is a prefix of it, so its definitions are tried as well
+        self._keyword_definitions: Dict[str, List[int]] = {
+            keyword: sorted({
+                index
+                for length in range(1, len(keyword) + 1)
+                for index in keyword_definitions.get(keyword[:length], [])
+            })
+            for keyword in keyword_definitions
+        }
+        if keyword_definitions:
+            # Longest first, so the alternation reports the longest keyword
+            keywords = sorted(keyword_definitions, key=len, reverse=True)
+            anchors.append("(?P<keyword>" + "|".join(re.escape(keyword) for keyword in keywords) + ")")
+
+        self._open_definitions = [index for index, definition in enumerate(self.definitions) if not definition.keywords]
+        if self._open_definitions:
+            anchors.append("(?=" + "|".join(
+                "(?:" + _NAMED_GROUP_PATTERN.sub("(?:", self.definitions[index].source) + ")"
+                for index in self._open_definitions
+            ) + ")")
+
+        # Metrics start at a word
+        self._scan_pattern = re.compile("(?<![a-z0-9])(?:" + "|".join(anchors) + ")") if anchors else None
+        self._cache_key = f"metric_candidates:{id(self)}"
+
+    def scan(self, text: Union[str, Document], group: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Scan a text (or Document) for metric candidates.
+
+        Results are cached on the Document, so several stages can scan it.
+
+        Args:
+            text: Text or Document to scan
+            group: Only return candidates of this definition group
+
+        Returns:
+            Candidates in text order, each with the metric "name", "category",
+            "group", "start"/"end" offsets, the matched "value" string, its
+            "unit" and "scale", and "value_numeric" (value times scale, None if
+            the value is not a number)
+        """
+        document = as_document(text)
+        candidates = document.get_derived(self._cache_key)
+        if candidates is None:
+            candidates = self._scan(document.lower)
+            document.set_derived(self._cache_key, candidates)
+        if group is not None:
+            return [candidate for candidate in candidates if candidate["group"] == group]
+        return list(candidates)
+
+    def first_values(self, text: Union[str, Document], group: str) -> Dict[str, Optional[float]]:
+        """Get the value of the first candidate of every metric of a group (None if absent)."""
+        values = {definition.name: None for definition in self.definitions if definition.group == group}
+        seen = set()
+        for candidate in self.scan(text, group):
+            if candidate["name"] not in seen:
+                seen.add(candidate["name"])
+                values[candidate["name"]] = candidate["value_numeric"]
+        return values
+
+    def _scan(self, lower: str) -> List[Dict[str, Any]]:
+        candidates = []
+        if self._scan_pattern is None:
+            return candidates
+        definitions = self.definitions
+        keyword_definitions = self._keyword_definitions
+        # Mimic re.finditer per pattern: a match is only reported once the previous one ended
+        next_allowed = [0] * len(definitions)
+
+        for hit in self._scan_pattern.finditer(lower):
+            position = hit.start()
+            keyword = hit.group("keyword") if keyword_definitions else None
+            indices = keyword_definitions[keyword] if keyword else self._open_definitions
+            if keyword and self._open_definitions:
+                # A keyword may also be where a definition without keywords matches
+                indices = sorted(indices + self._open_definitions)
+            for index in indices:
+                if position < next_allowed[index]:
+                    continue
+                match = definitions[index].pattern.match(lower, position)
+                if match is None:
+                    continue
+                next_allowed[index] = max(match.end(), position + 1)
+                candidates.append(self._candidate(definitions[index], match))
+
+        return candidates
+
+    @staticmethod
+    def _candidate(definition: MetricDefinition, match: "re.Match") -> Dict[str, Any]:
+        value = match.group("value")
+        unit_word = match.groupdict().get("unit") or ""
+        unit, scale = UNIT_SCALES.get(unit_word, ("", 1))
+        amount = parse_amount(value)
+        return {
+            "name": definition.name,
+            "category": definition.category,
+            "group": definition.group,
+            "start": match.start(),
+            "end": match.end(),
+            "value": value,
+            "unit": unit,
+            "scale": scale,
+            "value_numeric": amount * scale if amount is not None else None
+        }
+
+
+def load_metric_definitions(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get the built-in metric definitions, extended by a JSON config file.
+
+    The file holds a list of definitions with "name", "pattern" and optional
+    "category", "group" and "keywords"; a definition with the name of a built-in one
+    replaces it, others are added.
+
+    Args:
+        path: Path of the JSON file (defaults to the METRIC_DEFINITIONS_PATH environment variable)
+
+    Returns:
+        List of definition dicts
+    """
+    definitions = {definition["name"]: definition for definition in DEFAULT_METRIC_DEFINITIONS}
+    path = path or os.getenv("METRIC_DEFINITIONS_PATH")
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for definition in json.load(f):
+                    MetricDefinition.from_dict(definition)  # Validate before accepting it
+                    definitions[definition["name"]] = definition
+            logger.info(f"Loaded metric definitions from {path}")
+        except Exception as e:
+            logger.error(f"Error loading metric definitions from {path}: {str(e)}")
+    return list(definitions.values())
+
+
+_default_scanner: Optional[MetricScanner] = None
+
+
+def get_metric_scanner() -> MetricScanner:
+    """Get the shared scanner for the configured metric definitions (compiled once)."""
+    global _default_scanner
+    if _default_scanner is None:
+        _default_scanner = MetricScanner(load_metric_definitions())
+    return _default_scanner
@@ -1,12 +1,19 @@
 import os
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import bisect
+from typing import List, Dict, Any, Optional, Tuple, Union
 import time
 import requests
 from datetime import datetime
 import math
 
+from services.document import Document, as_document
+from services.token_counter import TokenCounter, get_token_counter
+from services.metric_scanner import get_metric_scanner
+from services.section_index import get_section_index
+from services.lexicon_sentiment import get_lexicon_sentiment_analyzer, sentiment_label
+
 logger = logging.getLogger(__name__)
 
 def estimate_tokens(text: str) -> int:
@@ -31,177 +38,277 @@ def estimate_tokens(text: str) -> int:
     # Return conservative estimate plus 10% buffer
     return math.ceil(estimated_tokens * 1.1)
 
-def chunk_text(text: str, chunk_size: int = 1600, overlap_size: int = 200, max_tokens: int = 1024) -> List[str]:
+# Whitespace-separated words, the unit the chunker counts tokens in
+WORD_PATTERN = re.compile(r'\S+')
+
+# Closing quotes/brackets allowed after a sentence-ending punctuation mark
+SENTENCE_END_TRAILERS = '"\')]\u201d\u2019'
+
+# Chunks are cut at the last sentence end that keeps at least this share of the tokens
+MIN_FILL_RATIO = 0.8
+
+def _ends_sentence(word: str) -> bool:
+    return word.rstrip(SENTENCE_END_TRAILERS)[-1:] in ('.', '!', '?')
+
+def _word_start(window: str, index: int) -> int:
+    """Offset in window of its word number `index` (window starts with a word)."""
+    return len(window) - len(window.split(None, index)[index])
+
+def _plan_spans(
+    text: str, 
+    pos: int, 
+    counter: TokenCounter, 
+    budget: int, 
+    overlap_chars: int, 
+    max_chars: Optional[int], 
+    spans: List[Tuple[int, int]]
+) -> int:
     """
-    Split text into chunks for processing, respecting token limits.
+    Append the spans of the chunks of text[pos:] to spans, in a single pass.
+    
+    Each chunk is found with a few bulk operations on a window of about one
+    chunk of text: the window is split into words once, their running token
+    totals give the number of words that fit the budget, the chunk is cut at
+    the last sentence end that keeps it nearly full, and the next chunk starts
+    a few words earlier for overlap.
+    
+    Returns:
+        Offset where the next chunk starts (len(text) when done)
+    """
+    text_length = len(text)
+    overlap_budget = budget // 10  # At most 10% of a chunk is overlap
+    overlap_words = 0  # Words at pos already in the previous chunk
+    base_window = budget * counter.chars_per_unit
+    if max_chars:
+        base_window = min(base_window, max_chars)
+        overlap_chars = min(overlap_chars, max_chars // 10)
+    
+    while True:
+        match = WORD_PATTERN.search(text, pos)
+        if not match:
+            return text_length
+        pos = match.start()
+        
+        # Grow the window until it holds more than a chunk (or the rest of the text)
+        window_chars = base_window
+        while True:
+            window_end = min(pos + window_chars, text_length)
+            at_end = window_end == text_length
+            window = text[pos:window_end]
+            words = window.split()
+            if not at_end:
+                words.pop()  # May be cut off by the window
+            cumulative = counter.cumulative(words)
+            if at_end or (max_chars and window_chars >= max_chars) or (cumulative and cumulative[-1] > budget):
+                break
+            window_chars *= 2
+            if max_chars:
+                window_chars = min(window_chars, max_chars)
+        fitting = bisect.bisect_right(cumulative, budget)
+        
+        if fitting == 0:
+            # A single word over the budget (or the character cap): cut it evenly
+            word_end = pos + len(words[0]) if words else match.end()
+            word_tokens = cumulative[0] if words else counter.count(text[pos:word_end])
+            pieces = -(-word_tokens // budget)
+            if max_chars:
+                pieces = max(pieces, -(-(word_end - pos) // max_chars))
+            step = max(-(-(word_end - pos) // pieces), 1)
+            spans.extend((start, min(start + step, word_end)) for start in range(pos, word_end, step))
+            pos = word_end
+            overlap_words = 0
+            continue
+        
+        if at_end and fitting == len(words):
+            # The rest of the text fits in one chunk
+            spans.append((pos, pos + len(window.rstrip())))
+            return text_length
+        
+        # Cut after the last sentence end that keeps the chunk nearly full (and past the previous chunk)
+        cut = fitting
+        min_fill = cumulative[fitting - 1] * MIN_FILL_RATIO
+        i = fitting - 1
+        while i >= overlap_words and cumulative[i] >= min_fill:
+            if _ends_sentence(words[i]):
+                cut = i + 1
+                break
+            i -= 1
+        
+        # The chunk ends after word cut - 1; word cut (possibly cut off by the window) follows it
+        following_start = _word_start(window, cut)
+        end = len(window[:following_start].rstrip())
+        following = WORD_PATTERN.match(text, pos + following_start)
+        following_tokens = counter.count(following.group())
+        # A window has to reach into the word after it to keep it (the last word of a window may be cut off)
+        after = WORD_PATTERN.search(text, following.end())
+        following_reach = after.start() + 1 if after else text_length
+        
+        # Start the next chunk a few words back for overlap (always after this chunk's start),
+        # but not so far back that the next chunk cannot take the following word: next to a
+        # long word it would end where this one does
+        next_word = cut
+        next_start = following_start
+        overlap_length = 0
+        word_end = end
+        while next_word > 1:
+            word_start = word_end - len(words[next_word - 1])
+            overlap_length += len(words[next_word - 1]) + 1
+            overlap_tokens = cumulative[cut - 1] - cumulative[next_word - 2]
+            if overlap_length > overlap_chars or overlap_tokens > overlap_budget:
+                break
+            if overlap_tokens + following_tokens > budget:
+                break
+            if max_chars and following_reach - (pos + word_start) > max_chars:
+                break
+            next_word -= 1
+            next_start = word_end = word_start
+            while window[word_end - 1].isspace():
+                word_end -= 1
+        spans.append((pos, pos + end))
+        pos += next_start
+        overlap_words = cut - next_word
+
+def plan_chunks(
+    text: str, 
+    chunk_size: Optional[int] = None, 
+    overlap_size: int = 200, 
+    max_tokens: int = 1024, 
+    token_counter: Optional[TokenCounter] = None
+) -> List[Tuple[int, int]]:
+    """
+    Plan the chunks of a text as (start, end) offsets, packed close to the token limit.
+    
+    Single pass over the words of the text: tokens are counted once per word
+    (with the local tokenizer vocabulary if one is configured, otherwise with
+    the estimate_tokens heuristic) and chunks are cut at a sentence end near
+    the token limit.
     
     Args:
         text: Text to split into chunks
-        chunk_size: Target size of each chunk in characters
+        chunk_size: Optional maximum size of each chunk in characters
         overlap_size: Number of characters to overlap between chunks
         max_tokens: Maximum number of tokens per chunk (for model context limits)
+        token_counter: Token counter (defaults to get_token_counter())
         
     Returns:
-        List of text chunks
+        List of (start, end) offsets into text, in order
     """
-    if not text:
-        return []
-    
-    # Reduce chunk size to a safer default (1600 characters instead of ~4000)
-    char_limit = min(chunk_size, 1600)
-    
-    chunks = []
-    start = 0
+    counter = token_counter or get_token_counter()
+    spans: List[Tuple[int, int]] = []
+    _plan_spans(text, 0, counter, counter.budget(max_tokens), overlap_size, chunk_size, spans)
+    return spans
+
+def chunk_text(
+    text: str, 
+    chunk_size: Optional[int] = None, 
+    overlap_size: int = 200, 
+    max_tokens: int = 1024, 
+    token_counter: Optional[TokenCounter] = None
+) -> List[str]:
+    """
+    Split text into chunks for processing, respecting token limits.
     
-    while start < len(text):
-        end = min(start + char_limit, len(text))
-        
-        # If not at the end, try to break at a sentence boundary
-        if end < len(text):
-            # Look for sentence boundary within the last 20% of the chunk
-            boundary_search_start = max(start + int(char_limit * 0.8), start)
-            sentence_boundary = text.rfind('. ', boundary_search_start, end)
-            if sentence_boundary != -1:
-                end = sentence_boundary + 2  # Include the period and space
-        
-        # Get the chunk
-        chunk = text[start:end]
-        
-        # Check if this chunk might be too large in terms of tokens
-        estimated_token_count = estimate_tokens(chunk)
-        if estimated_token_count > max_tokens:
-            logger.warning(f"Chunk exceeds token limit ({estimated_token_count} > {max_tokens}). Splitting recursively.")
-            # Recursively split this chunk into smaller pieces
-            subchart_token_limit = max_tokens // 2  # Use half the token limit for sub-chunks
-            subchunk_char_size = len(chunk) // 2   # Use half the characters
-            subchunks = chunk_text(chunk, subchunk_char_size, overlap_size // 2, subchart_token_limit)
-            chunks.extend(subchunks)
-        else:
-            chunks.append(chunk)
+    Args:
+        text: Text to split into chunks
+        chunk_size: Optional maximum size of each chunk in characters
+        overlap_size: Number of characters to overlap between chunks
+        max_tokens: Maximum number of tokens per chunk (for model context limits)
+        token_counter: Token counter (defaults to get_token_counter())
         
-        # Calculate next start position with overlap
-        overlap = min(overlap_size, char_limit // 10)  # 10% overlap by default
-        start = end - overlap if end - overlap > start else end
+    Returns:
+        List of text chunks
+    """
+    chunks = [text[start:end] for start, end in plan_chunks(text, chunk_size, overlap_size, max_tokens, token_counter)]
     
     logger.info(f"Split text into {len(chunks)} chunks for processing (max {max_tokens} tokens per chunk)")
     return chunks
 
-def extract_metrics_with_regex(text: str) -> List[Dict[str, Any]]:
+def extract_metrics_with_regex(text: Union[str, Document]) -> List[Dict[str, Any]]:
     """
     Extract financial metrics using regex patterns.
     
+    The "statement" metric definitions of the shared metric scanner are
+    matched in one pass over the document's lowercased text.
+    
     Args:
-        text: Financial text to analyze
+        text: Financial text (or Document) to analyze
         
     Returns:
         List of dictionaries containing extracted metrics
     """
-    # Common financial metrics patterns
-    patterns = [
-        # Revenue pattern
-        r'(?:total )?revenue(?:s)? (?:of|was|were|amounted to)? \$?(\d+(?:\.\d+)?)\s?(million|billion|m|b|k|thousand)?',
-        # Net income pattern
-        r'net income (?:of|was|were|amounted to)? \$?(\d+(?:\.\d+)?)\s?(million|billion|m|b|k|thousand)?',
-        # EPS pattern
-        r'earnings per share (?:of|was|were|amounted to)? \$?(\d+(?:\.\d+)?)',
-        # Profit pattern
-        r'(?:gross|operating|net) profit (?:of|was|were|amounted to)? \$?(\d+(?:\.\d+)?)\s?(million|billion|m|b|k|thousand)?',
-    ]
+    document = as_document(text)
+    text = document.text
+    scanner = get_metric_scanner()
     
-    results = []
+    # Report metrics grouped by definition, in text order within each
+    definition_order = {definition.name: index for index, definition in enumerate(scanner.definitions)}
+    candidates = sorted(scanner.scan(document, group="statement"), key=lambda candidate: definition_order[candidate["name"]])
     
-    # Process each pattern
-    for pattern in patterns:
-        matches = re.finditer(pattern, text.lower())
-        for match in matches:
-            value = match.group(1)
-            unit = match.group(2) if len(match.groups()) > 1 and match.group(2) else ""
-            
-            # Determine metric name from the matched pattern
-            if "revenue" in pattern:
-                name = "Revenue"
-                category = "Income Statement"
-            elif "net income" in pattern:
-                name = "Net Income"
-                category = "Income Statement"
-            elif "earnings per share" in pattern:
-                name = "EPS"
-                category = "Financial Ratios"
-            elif "profit" in pattern:
-                name = "Profit"
-                category = "Income Statement"
-            else:
-                name = "Unknown Metric"
-                category = "Other"
-            
-            # Standardize unit
-            if unit:
-                unit = unit.lower()
-                if unit in ["m", "million"]:
-                    unit = "million"
-                    value_numeric = float(value) * 1_000_000
-                elif unit in ["b", "billion"]:
-                    unit = "billion"
-                    value_numeric = float(value) * 1_000_000_000
-                elif unit in ["k", "thousand"]:
-                    unit = "thousand"
-                    value_numeric = float(value) * 1_000
-                else:
-                    value_numeric = float(value)
-            else:
-                value_numeric = float(value)
-                unit = ""
-            
-            # Create metric object
-            metric = {
-                "name": name,
-                "value": value,
-                "value_numeric": value_numeric,
-                "unit": unit,
-                "category": category,
-                "context": text[max(0, match.start() - 50):min(len(text), match.end() + 50)]
-            }
-            
-            results.append(metric)
+    results = []
+    for candidate in candidates:
+        start, end = candidate["start"], candidate["end"]
+        
+        # Create metric object
+        metric = {
+            "name": candidate["name"],
+            "value": candidate["value"],
+            "value_numeric": candidate["value_numeric"],
+            "unit": candidate["unit"],
+            "category": candidate["category"],
+            "context": text[max(0, start - 50):min(len(text), end + 50)],
+            "start": start,
+            "end": end
+        }
+        
+        results.append(metric)
     
     return results
 
-def extract_risk_factors_with_regex(text: str) -> List[str]:
+def extract_risk_factors_with_regex(text: Union[str, Document]) -> List[str]:
     """
     Extract risk factors from financial text using regex patterns.
     
     Args:
-        text: Financial text to analyze
+        text: Financial text (or Document) to analyze
         
     Returns:
         List of extracted risk factors
     """
-    # Common risk section headers
-    risk_section_patterns = [
-        r'(?:Item\s+)?1A\.?\s+Risk\s+Factors',
-        r'(?:ITEM\s+)?1A\.?\s+RISK\s+FACTORS',
-        r'Risk\s+Factors',
-        r'RISK\s+FACTORS',
-        r'Risks\s+and\s+Uncertainties',
-        r'RISKS\s+AND\s+UNCERTAINTIES'
-    ]
+    document = as_document(text)
+    text = document.text
     
-    # Find risk section
+    # The risk factors section from the document's section index
     risk_section_text = ""
-    for pattern in risk_section_patterns:
-        match = re.search(pattern, text)
-        if match:
-            # Extract text after the risk section header
-            section_start = match.end()
-            # Look for the next section header
-            next_section_match = re.search(r'(?:Item|ITEM)\s+\d+[AB]?\.', text[section_start:])
-            if next_section_match:
-                section_end = section_start + next_section_match.start()
-                risk_section_text = text[section_start:section_end]
-            else:
-                # If no next section, take a reasonable chunk
-                risk_section_text = text[section_start:section_start + 20000]  # Limit to ~20k chars
-            break
+    span = get_section_index(document).span("risk_factors")
+    if span:
+        section_start, section_end = span
+        if section_end == len(text):
+            # If no next section, take a reasonable chunk
+            section_end = min(section_end, section_start + 20000)  # Limit to ~20k chars
+        risk_section_text = text[section_start:section_end]
+    else:
+        # No risk factors heading: look for the header anywhere in the text
+        risk_section_patterns = [
+            r'(?:Item\s+)?1A\.?\s+Risk\s+Factors',
+            r'(?:ITEM\s+)?1A\.?\s+RISK\s+FACTORS',
+            r'Risk\s+Factors',
+            r'RISK\s+FACTORS',
+            r'Risks\s+and\s+Uncertainties',
+            r'RISKS\s+AND\s+UNCERTAINTIES'
+        ]
+        for pattern in risk_section_patterns:
+            match = re.search(pattern, text)
+            if match:
+                # Extract text after the risk section header
+                section_start = match.end()
+                # Look for the next section header
+                next_section_match = re.search(r'(?:Item|ITEM)\s+\d+[AB]?\.', text[section_start:])
+                if next_section_match:
+                    section_end = section_start + next_section_match.start()
+                    risk_section_text = text[section_start:section_end]
+                else:
+                    risk_section_text = text[section_start:section_start + 20000]
+                break
     
     # If no risk section found, return empty list
     if not risk_section_text:
@@ -228,16 +335,18 @@ def extract_risk_factors_with_regex(text: str) -> List[str]:
     unique_risks = list(set(risks))
     return unique_risks[:20]  # Limit to top 20 risks for manageability
 
-def extract_basic_entities(text: str) -> Dict[str, List[str]]:
+def extract_basic_entities(text: Union[str, Document]) -> Dict[str, List[str]]:
     """
     Extract basic entities using regex patterns.
     
     Args:
-        text: Text to analyze
+        text: Text (or Document) to analyze
         
     Returns:
         Dictionary with keys 'organizations' and 'locations' containing extracted entities
     """
+    text = as_document(text).text
+    
     # Common organization suffixes
     org_patterns = [
         r'\b[A-Z][a-zA-Z]+ (?:Inc|Corp|Corporation|Company|Co|Ltd|LLC)\b',
@@ -273,37 +382,30 @@ def extract_basic_entities(text: str) -> Dict[str, List[str]]:
         "locations": locations
     }
 
-def fallback_sentiment_analysis(text: str) -> Dict[str, Any]:
+def fallback_sentiment_analysis(text: Union[str, Document]) -> Dict[str, Any]:
     """
     Fallback method for sentiment analysis when API calls fail.
     
     Args:
-        text: Text to analyze
+        text: Text (or Document) to analyze
         
     Returns:
         Dictionary with sentiment analysis results
     """
     logger.info("Using fallback sentiment analysis method")
     
-    # Define positive and negative word lists
-    positive_words = ["increase", "growth", "profit", "success", "improve", "positive", 
-                     "advantage", "opportunity", "strong", "exceed", "gain"]
-    negative_words = ["decrease", "decline", "loss", "risk", "challenge", "negative", 
-                     "difficult", "weak", "fail", "threat", "liability"]
-    
-    # Count occurrences
-    positive_count = sum(text.lower().count(word) for word in positive_words)
-    negative_count = sum(text.lower().count(word) for word in negative_words)
+    # Count finance lexicon words; the result is shared with the per-page/section first pass
+    scores = get_lexicon_sentiment_analyzer().analyze(text)["document"]
+    positive_count = scores["positive"]
+    negative_count = scores["negative"]
     
     # Determine sentiment
-    if positive_count > negative_count * 1.5:
-        sentiment = "positive"
+    sentiment = sentiment_label(positive_count, negative_count)
+    if sentiment == "positive":
         explanation = "More positive terms than negative terms"
-    elif negative_count > positive_count * 1.5:
-        sentiment = "negative"
-        explanation = "More negative terms than negative terms"
+    elif sentiment == "negative":
+        explanation = "More negative terms than positive terms"
     else:
-        sentiment = "neutral" 
         explanation = "Balance of positive and negative terms"
     
     logger.info(f"Fallback sentiment result: {sentiment} (pos:{positive_count}, neg:{negative_count})")
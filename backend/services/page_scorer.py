@@ -0,0 +1,113 @@
+import re
+import logging
+from typing import List, Iterable, Set
+
+from services.page_store import PageStore
+
+logger = logging.getLogger(__name__)
+
+# Words that suggest a table holds financial data
+FINANCIAL_TABLE_KEYWORDS = [
+    'revenue', 'income', 'assets', 'liabilities', 'equity',
+    'cash', 'profit', 'loss', 'earnings', 'expense'
+]
+
+# One precompiled alternation instead of a fresh regex per keyword and table
+FINANCIAL_TABLE_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(keyword) for keyword in FINANCIAL_TABLE_KEYWORDS) + r')\b',
+    re.IGNORECASE
+)
+
+# Amounts such as 1,234  (56.7)  -3.2%  $10  2023
+NUMERIC_TOKEN_PATTERN = re.compile(r'^\(?[$€£]?[-–]?\d[\d,.]*%?\)?$')
+
+# Pages scoring below this are not worth running table extraction on
+TABLE_SCORE_THRESHOLD = 0.4
+
+
+def score_page(text: str) -> float:
+    """
+    Cheaply estimate how likely a page is to hold a financial table.
+
+    Uses only the already-extracted page text: the density of numeric tokens,
+    alignment hints (lines carrying several numbers, i.e. table rows) and a
+    single keyword alternation.
+
+    Args:
+        text: Extracted page text
+
+    Returns:
+        Score between 0 (prose or image-only page) and 1 (table-like page)
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+
+    numeric_tokens = 0
+    numeric_lines = 0
+    for line in text.splitlines():
+        line_numbers = sum(1 for token in line.split() if NUMERIC_TOKEN_PATTERN.match(token))
+        numeric_tokens += line_numbers
+        if line_numbers >= 2:
+            numeric_lines += 1
+
+    density = numeric_tokens / len(tokens)
+    has_keyword = FINANCIAL_TABLE_PATTERN.search(text) is not None
+
+    return (
+        0.5 * min(density / 0.2, 1.0)
+        + 0.3 * min(numeric_lines / 5, 1.0)
+        + 0.2 * has_keyword
+    )
+
+
+def is_table_candidate(text: str, threshold: float = TABLE_SCORE_THRESHOLD) -> bool:
+    """Check whether a page scores high enough to run table extraction on it."""
+    return score_page(text) >= threshold
+
+
+def is_financial_table(table: List[List[str]]) -> bool:
+    """Check whether an extracted table (header + at least one row) mentions financial terms."""
+    if not table or len(table) < 2:
+        return False
+    table_text = ' '.join(' '.join(str(cell) for cell in row if cell) for row in table)
+    return FINANCIAL_TABLE_PATTERN.search(table_text) is not None
+
+
+def find_financial_table_pages(
+    page_store: PageStore,
+    page_indices: Iterable[int],
+    prefilter: bool = True
+) -> Set[int]:
+    """
+    Find pages holding financial tables.
+
+    Args:
+        page_store: Page store of the document
+        page_indices: 0-indexed pages to check
+        prefilter: Skip table extraction on pages the text scorer rejects
+
+    Returns:
+        Set of 0-indexed pages with at least one financial table
+    """
+    table_pages = set()
+    skipped = 0
+
+    for i in page_indices:
+        if i % 50 == 0:
+            logger.info(f"Checking for tables on page {i}/{page_store.page_count}")
+
+        try:
+            if prefilter and not is_table_candidate(page_store.get_text(i)):
+                skipped += 1
+                continue
+
+            if any(is_financial_table(table) for table in page_store.get_tables(i)):
+                table_pages.add(i)
+        except Exception as e:
+            logger.warning(f"Error checking tables on page {i}: {str(e)}")
+            continue
+
+    if prefilter:
+        logger.info(f"Table pre-filter skipped {skipped} pages before table extraction")
+    return table_pages
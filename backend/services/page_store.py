@@ -0,0 +1,332 @@
+import logging
+import PyPDF2
+import pdfplumber
+from typing import List, Dict, Any, Optional, Iterable
+
+from services.extraction_cache import ExtractionCache
+from services.text_backends import TextBackend, open_text_backend, select_text_backend
+from utils.helpers import get_memory_usage_mb, hash_file
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_table(table: List[List[Any]]) -> List[List[str]]:
+    """Convert all cells of an extracted table to strings."""
+    return [[str(cell) if cell is not None else "" for cell in row] for row in table]
+
+
+class PageStore:
+    """
+    Per-document store that extracts each page's text and tables at most once.
+
+    A single PageStore is shared by every stage that reads the same PDF
+    (TOC detection, keyword scanning, table detection, selective extraction and
+    full-text analysis), so each page is parsed by PyPDF2 and pdfplumber only once
+    per report. The store also counts how many pages were actually parsed.
+
+    With an ExtractionCache, the store is pre-filled from the cache entry for the
+    PDF's content hash and configured text backend and writes newly extracted pages (and derived results such
+    as metadata and detected financial pages) back when it is closed.
+
+    pdfplumber's per-page layout caches are flushed as soon as a page's tables
+    are extracted. In low-memory mode the store also reopens its PDF handles
+    every `max_resident_pages` parsed pages, which releases the page objects
+    PyPDF2 and pdfplumber keep for the whole open document. With a memory
+    budget, table extraction is skipped (not failed) once the process has
+    grown by more than `memory_budget_mb` since the store was opened.
+
+    Page text comes from a pluggable text backend (see services.text_backends).
+    With `text_backend="auto"` the fastest available backend is timed on a few
+    sample pages and picked on the first text access; with
+    `compare_backend_quality` backends whose output drifts from PyPDF2's on
+    those pages are not considered.
+
+    Usage:
+        with PageStore(file_path) as page_store:
+            text = page_store.get_text(0)
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        cache: Optional[ExtractionCache] = None,
+        low_memory: bool = False,
+        max_resident_pages: int = 50,
+        memory_budget_mb: Optional[float] = None,
+        text_backend: str = "pypdf2",
+        compare_backend_quality: bool = False
+    ):
+        self.file_path = file_path
+
+        # Name of the text backend, or "auto" until one has been selected
+        self.text_backend = text_backend
+        # Cache entries are kept per configured backend ("auto" included)
+        self._cache_backend = text_backend
+        self.compare_backend_quality = compare_backend_quality
+        self._backend: Optional[TextBackend] = None
+
+        self._file = None
+        self._reader: Optional[PyPDF2.PdfReader] = None
+        self._plumber = None
+        self._page_count: Optional[int] = None
+
+        self._texts: Dict[int, str] = {}
+        self._tables: Dict[int, List[List[List[str]]]] = {}
+
+        # Results computed from the pages (metadata, financial pages, ...)
+        self._derived: Dict[str, Any] = {}
+
+        # Number of pages actually parsed per extractor
+        self.text_pages_parsed = 0
+        self.table_pages_parsed = 0
+
+        # Memory controls
+        self.low_memory = low_memory
+        self.max_resident_pages = max(1, max_resident_pages)
+        self._resident_pages = 0
+        self.memory_budget_mb = memory_budget_mb or None
+        self._baseline_memory_mb = get_memory_usage_mb() if self.memory_budget_mb else None
+        self.memory_budget_exceeded = False
+        self.table_pages_skipped = 0
+
+        self._cache = cache
+        self._dirty = False
+        self.content_hash: Optional[str] = None
+        self.cache_hit = False
+        if cache is not None:
+            self._load_from_cache()
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def reader(self) -> PyPDF2.PdfReader:
+        """Lazily opened PyPDF2 reader shared by all text extraction."""
+        if self._reader is None:
+            self._file = open(self.file_path, 'rb')
+            self._reader = PyPDF2.PdfReader(self._file)
+        return self._reader
+
+    @property
+    def backend(self) -> TextBackend:
+        """Lazily opened text backend, selected per document in auto mode."""
+        if self._backend is None:
+            if self.text_backend == "auto":
+                self.text_backend = self.get_derived("text_backend") or select_text_backend(
+                    self.file_path,
+                    check_quality=self.compare_backend_quality
+                )
+                self.set_derived("text_backend", self.text_backend)
+            self._backend = open_text_backend(self.text_backend, self.file_path)
+        return self._backend
+
+    @property
+    def page_count(self) -> int:
+        """Total number of pages in the document."""
+        if self._page_count is None:
+            self._page_count = len(self.reader.pages)
+            self._dirty = True
+        return self._page_count
+
+    @property
+    def text_pages_loaded(self) -> int:
+        """Number of pages whose text is held, whether parsed, added or read from the extraction cache."""
+        return len(self._texts)
+
+    def get_text(self, page_index: int) -> str:
+        """
+        Get the text of a page, extracting it on first access.
+
+        Args:
+            page_index: 0-indexed page number
+
+        Returns:
+            Extracted page text (empty string if the page has no text layer)
+        """
+        text = self._texts.get(page_index)
+        if text is None:
+            text = self.backend.extract_page(page_index)
+            self._texts[page_index] = text
+            self.text_pages_parsed += 1
+            self._dirty = True
+            self._page_released()
+        return text
+
+    def add_texts(self, page_texts: List[str], start: int = 0) -> None:
+        """
+        Record page texts that were extracted outside the store (e.g. by worker processes).
+
+        Args:
+            page_texts: Texts of consecutive pages
+            start: 0-indexed page number of the first text
+        """
+        for offset, text in enumerate(page_texts):
+            page_index = start + offset
+            if page_index not in self._texts:
+                self._texts[page_index] = text or ""
+                self.text_pages_parsed += 1
+                self._dirty = True
+
+    def get_tables(self, page_index: int) -> List[List[List[str]]]:
+        """
+        Get the tables on a page, extracting them with pdfplumber on first access.
+
+        Args:
+            page_index: 0-indexed page number
+
+        Returns:
+            List of tables, each a list of rows of string cells
+        """
+        tables = self._tables.get(page_index)
+        if tables is None:
+            if self.check_memory_budget():
+                # Degrade gracefully: no tables for this page, and nothing cached
+                self.table_pages_skipped += 1
+                return []
+
+            if self._plumber is None:
+                self._plumber = pdfplumber.open(self.file_path)
+            page = self._plumber.pages[page_index]
+            try:
+                raw_tables = page.extract_tables()
+            finally:
+                # Drop the page's characters and layout objects once its tables are out
+                page.flush_cache()
+            tables = [normalize_table(table) for table in raw_tables if table]
+            self._tables[page_index] = tables
+            self.table_pages_parsed += 1
+            self._dirty = True
+            self._page_released()
+        return tables
+
+    def check_memory_budget(self) -> bool:
+        """
+        Check whether the process has outgrown this document's memory budget.
+
+        Returns:
+            True once the budget has been exceeded (it stays exceeded for the
+            lifetime of the store)
+        """
+        if self.memory_budget_exceeded or self._baseline_memory_mb is None:
+            return self.memory_budget_exceeded
+
+        current_mb = get_memory_usage_mb()
+        if current_mb is not None and current_mb - self._baseline_memory_mb > self.memory_budget_mb:
+            self.memory_budget_exceeded = True
+            logger.warning(
+                f"Memory budget of {self.memory_budget_mb:.0f} MB exceeded for {self.file_path} "
+                f"({current_mb - self._baseline_memory_mb:.0f} MB used); skipping further table extraction"
+            )
+        return self.memory_budget_exceeded
+
+    def _page_released(self) -> None:
+        """Count a parsed page and, in low-memory mode, recycle the PDF handles when due."""
+        if not self.low_memory:
+            return
+        self._resident_pages += 1
+        if self._resident_pages >= self.max_resident_pages:
+            self._close_documents()
+            self._resident_pages = 0
+
+    def iter_texts(self, page_indices: Optional[Iterable[int]] = None) -> Iterable[str]:
+        """Yield page texts in order for the given pages (all pages by default)."""
+        if page_indices is None:
+            page_indices = range(self.page_count)
+        for page_index in page_indices:
+            yield self.get_text(page_index)
+
+    def get_full_text(self) -> str:
+        """Get the text of the whole document, pages separated by blank lines."""
+        return "".join(text + "\n\n" for text in self.iter_texts())
+
+    def get_derived(self, key: str) -> Optional[Any]:
+        """Get a result previously computed from this document (None if absent)."""
+        return self._derived.get(key)
+
+    def set_derived(self, key: str, value: Any) -> None:
+        """
+        Record a JSON-serializable result computed from this document.
+
+        Derived results are persisted with the pages when an extraction cache is used.
+        """
+        self._derived[key] = value
+        self._dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get extraction counters for this document."""
+        return {
+            "page_count": self.page_count,
+            "text_pages_parsed": self.text_pages_parsed,
+            "table_pages_parsed": self.table_pages_parsed,
+            "table_pages_skipped": self.table_pages_skipped,
+            "memory_budget_exceeded": self.memory_budget_exceeded,
+            "text_backend": self.text_backend,
+            "cache_hit": self.cache_hit
+        }
+
+    def _load_from_cache(self) -> None:
+        """Pre-fill the store from the extraction cache entry of this PDF."""
+        try:
+            self.content_hash = hash_file(self.file_path)
+            entry = self._cache.get(self.content_hash, self._cache_backend)
+        except Exception as e:
+            logger.warning(f"Extraction cache lookup failed for {self.file_path}: {str(e)}")
+            return
+
+        if not entry:
+            return
+
+        self.cache_hit = True
+        self._page_count = entry.get("page_count")
+        self._texts = {int(i): text for i, text in entry.get("texts", {}).items()}
+        self._tables = {int(i): tables for i, tables in entry.get("tables", {}).items()}
+        self._derived = entry.get("derived", {})
+        logger.info(
+            f"Extraction cache hit for {self.file_path}: {len(self._texts)} page texts, "
+            f"{len(self._tables)} page tables"
+        )
+
+    def _save_to_cache(self) -> None:
+        """Write the pages and derived results of this document to the extraction cache."""
+        if self._cache is None or self.content_hash is None or not self._dirty:
+            return
+        try:
+            self._cache.put(self.content_hash, {
+                "page_count": self._page_count,
+                "texts": {str(i): text for i, text in self._texts.items()},
+                "tables": {str(i): tables for i, tables in self._tables.items()},
+                "derived": self._derived
+            }, text_backend=self._cache_backend)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to write extraction cache entry for {self.file_path}: {str(e)}")
+
+    def close(self) -> None:
+        """
+        Close open file handles and persist new results to the extraction cache.
+        Cached text and tables stay available.
+        """
+        self._save_to_cache()
+        self._close_documents()
+
+    def _close_documents(self) -> None:
+        """Close the text backend and the PyPDF2 and pdfplumber documents; they are reopened on demand."""
+        if self._backend is not None:
+            try:
+                self._backend.close()
+            except Exception as e:
+                logger.warning(f"Error closing {self.text_backend} backend for {self.file_path}: {str(e)}")
+            self._backend = None
+        if self._plumber is not None:
+            try:
+                self._plumber.close()
+            except Exception as e:
+                logger.warning(f"Error closing pdfplumber document {self.file_path}: {str(e)}")
+            self._plumber = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._reader = None
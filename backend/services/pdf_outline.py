@@ -0,0 +1,220 @@
+import logging
+import re
+import PyPDF2
+from typing import List, Dict, Any, Optional, Tuple, Set
+
+logger = logging.getLogger(__name__)
+
+# Financial section titles looked for in bookmark outlines
+FINANCIAL_OUTLINE_KEYWORDS = [
+    "financial statements", "consolidated financial",
+    "balance sheet", "income statement", "statement of income",
+    "statement of operations", "statements of operations",
+    "cash flow", "statement of cash flows",
+    "statement of financial position", "notes to", "financial review",
+    "financial results", "financial performance", "selected financial data",
+    "management's discussion", "management’s discussion"
+]
+
+_FINANCIAL_OUTLINE_PATTERN = re.compile(
+    '|'.join(re.escape(keyword) for keyword in FINANCIAL_OUTLINE_KEYWORDS),
+    re.IGNORECASE
+)
+
+
+def _to_roman(number: int) -> str:
+    """Convert a positive integer to an uppercase Roman numeral."""
+    numerals = [
+        (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+        (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")
+    ]
+    result = []
+    for value, numeral in numerals:
+        count, number = divmod(number, value)
+        result.append(numeral * count)
+    return "".join(result)
+
+
+def _to_letters(number: int) -> str:
+    """Convert a positive integer to the PDF letter numbering (A..Z, AA..ZZ, ...)."""
+    letter = chr(ord("A") + (number - 1) % 26)
+    return letter * ((number - 1) // 26 + 1)
+
+
+def _format_label(style: Optional[str], prefix: str, number: int) -> str:
+    """Format a page label as described in the PDF spec (section 12.4.2)."""
+    if style == "/D":
+        numbering = str(number)
+    elif style == "/R":
+        numbering = _to_roman(number)
+    elif style == "/r":
+        numbering = _to_roman(number).lower()
+    elif style == "/A":
+        numbering = _to_letters(number)
+    elif style == "/a":
+        numbering = _to_letters(number).lower()
+    else:
+        numbering = ""
+    return prefix + numbering
+
+
+def _collect_number_tree(node: Any, entries: List[Tuple[int, Any]]) -> None:
+    """Collect (key, value) pairs from a PDF number tree."""
+    node = node.get_object()
+    if "/Nums" in node:
+        nums = node["/Nums"]
+        for i in range(0, len(nums) - 1, 2):
+            entries.append((int(nums[i]), nums[i + 1].get_object()))
+    for kid in node.get("/Kids", []):
+        _collect_number_tree(kid, entries)
+
+
+def get_page_labels(reader: PyPDF2.PdfReader) -> List[str]:
+    """
+    Get the printed label of every page (e.g. "iv", "12", "A-3").
+
+    Pages without a /PageLabels entry in the document catalog are labelled
+    with their 1-indexed physical page number.
+
+    Args:
+        reader: Open PyPDF2 reader
+
+    Returns:
+        One label per page, in physical page order
+    """
+    page_count = len(reader.pages)
+
+    # Newer PyPDF2/pypdf releases parse page labels themselves
+    labels = getattr(reader, "page_labels", None)
+    if labels is not None:
+        return list(labels)
+
+    default_labels = [str(i + 1) for i in range(page_count)]
+    try:
+        catalog = reader.trailer["/Root"]
+        if "/PageLabels" not in catalog:
+            return default_labels
+
+        ranges: List[Tuple[int, Any]] = []
+        _collect_number_tree(catalog["/PageLabels"], ranges)
+        if not ranges:
+            return default_labels
+        ranges.sort(key=lambda item: item[0])
+
+        labels = list(default_labels)
+        for n, (start, label_dict) in enumerate(ranges):
+            end = ranges[n + 1][0] if n + 1 < len(ranges) else page_count
+            style = label_dict.get("/S")
+            prefix = str(label_dict.get("/P", ""))
+            first_number = int(label_dict.get("/St", 1))
+            for page_index in range(max(start, 0), min(end, page_count)):
+                labels[page_index] = _format_label(style, prefix, first_number + page_index - start)
+        return labels
+    except Exception as e:
+        logger.warning(f"Could not read page labels: {str(e)}")
+        return default_labels
+
+
+def get_outline_entries(reader: PyPDF2.PdfReader) -> List[Dict[str, Any]]:
+    """
+    Flatten the bookmark outline into a list of entries in outline order.
+
+    Args:
+        reader: Open PyPDF2 reader
+
+    Returns:
+        List of dictionaries with title, page_index (0-indexed) and depth;
+        entries whose destination cannot be resolved are skipped
+    """
+    entries: List[Dict[str, Any]] = []
+
+    def walk(items: List[Any], depth: int) -> None:
+        for item in items:
+            if isinstance(item, list):
+                walk(item, depth + 1)
+                continue
+            try:
+                page_index = reader.get_destination_page_number(item)
+            except Exception:
+                continue
+            if page_index is None or page_index < 0:
+                continue
+            entries.append({
+                "title": str(item.title or "").strip(),
+                "page_index": page_index,
+                "depth": depth
+            })
+
+    try:
+        walk(reader.outline, 0)
+    except Exception as e:
+        logger.warning(f"Could not read document outline: {str(e)}")
+        return []
+    return entries
+
+
+def locate_financial_sections_from_outline(
+    reader: PyPDF2.PdfReader,
+    max_section_pages: int = 60
+) -> Optional[Set[int]]:
+    """
+    Locate financial section pages from the bookmark outline.
+
+    A matching outline entry covers the pages up to the next entry at the same
+    or a shallower depth (its own children lie inside the section).
+
+    Args:
+        reader: Open PyPDF2 reader
+        max_section_pages: Upper bound on the pages attributed to one entry
+
+    Returns:
+        Set of 0-indexed financial pages, or None if the outline is missing or
+        has no financial entries
+    """
+    entries = get_outline_entries(reader)
+    if not entries:
+        return None
+
+    page_count = len(reader.pages)
+    financial_pages: Set[int] = set()
+
+    for n, entry in enumerate(entries):
+        if not _FINANCIAL_OUTLINE_PATTERN.search(entry["title"]):
+            continue
+
+        start = entry["page_index"]
+        end = page_count
+        for following in entries[n + 1:]:
+            if following["depth"] <= entry["depth"]:
+                end = following["page_index"]
+                break
+
+        # Outlines are not always in page order; keep at least the entry's own page
+        end = min(max(end, start + 1), start + max_section_pages, page_count)
+        financial_pages.update(range(start, end))
+
+    return financial_pages or None
+
+
+def resolve_printed_page(page_labels: List[str], printed_page: str) -> Optional[int]:
+    """
+    Map a page number printed in a table of contents to a physical page index.
+
+    Args:
+        page_labels: Labels of all pages (see get_page_labels)
+        printed_page: Page number as printed in the TOC
+
+    Returns:
+        0-indexed physical page, or None if no page carries that label
+    """
+    printed_page = printed_page.strip()
+    try:
+        return page_labels.index(printed_page)
+    except ValueError:
+        pass
+
+    # Labels may be decorated with a prefix (e.g. "F-12")
+    for page_index, label in enumerate(page_labels):
+        if label.endswith(printed_page) and not label[:-len(printed_page)][-1:].isdigit():
+            return page_index
+    return None
@@ -3,13 +3,22 @@ import re
 import logging
 import PyPDF2
 import pdfplumber
-import tabula
-import pandas as pd
 from typing import List, Dict, Any, Tuple, Set, Optional
 from sqlalchemy.orm import Session
 
 from services.pdf_service import PDFService
-from services.ai_service import AIService
+from services.page_store import PageStore
+from services.page_scorer import find_financial_table_pages
+from services.table_extraction import TableExtractor
+from services.metric_scanner import get_metric_scanner
+from services.section_index import get_section_index, FINANCIAL_SECTIONS
+from services.document import Document
+from services.pdf_outline import (
+    get_page_labels,
+    locate_financial_sections_from_outline,
+    resolve_printed_page
+)
+from services.service_registry import get_ai_service
 from services.db_service import DBService
 from models.schemas import MetricCreate, SummaryCreate
 
@@ -20,8 +29,14 @@ class PDFProcessor:
     
     def __init__(self):
         self.pdf_service = PDFService()
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
         self.db_service = DBService()
+        
+        # Score page text before running table extraction on a page
+        self.table_prefilter = os.getenv("TABLE_PREFILTER_ENABLED", "true").lower() == "true"
+        
+        # Table extraction engine for financial pages (TABLE_EXTRACTION_ENGINE)
+        self.table_extractor = TableExtractor()
     
     def process_annual_report(self, file_path: str, report_id: int, db: Session) -> Dict[str, Any]:
         """
@@ -38,17 +53,35 @@ class PDFProcessor:
         try:
             logger.info(f"Starting selective processing of annual report: {file_path}")
             
-            # First pass: Identify financial sections
-            toc_pages, financial_pages = self.identify_financial_sections(file_path)
-            
-            if not financial_pages:
-                logger.warning(f"No financial sections identified in {file_path}")
-                return {"error": "No financial sections identified in the report"}
-            
-            logger.info(f"Identified {len(financial_pages)} financial pages")
-            
-            # Extract text and tables from financial sections only
-            financial_data = self.extract_financial_sections(file_path, financial_pages)
+            # Share one page store across all stages so each page is parsed once
+            with self.pdf_service.open_page_store(file_path) as page_store:
+                # First pass: Identify financial sections
+                toc_pages, financial_pages = self.identify_financial_sections(file_path, page_store)
+                
+                if not financial_pages:
+                    logger.warning(f"No financial sections identified in {file_path}")
+                    return {"error": "No financial sections identified in the report"}
+                
+                section_detection = page_store.get_derived("financial_sections").get("method", "unknown")
+                logger.info(f"Identified {len(financial_pages)} financial pages (detected via {section_detection})")
+                
+                # Extract text and tables from financial sections only
+                financial_data = self.extract_financial_sections(file_path, financial_pages, page_store)
+                
+                extraction_stats = page_store.get_stats()
+                logger.info(
+                    f"Parsed {extraction_stats['text_pages_parsed']} pages for text ({extraction_stats['text_backend']}) and "
+                    f"{extraction_stats['table_pages_parsed']} pages for tables "
+                    f"out of {extraction_stats['page_count']} for report {report_id}"
+                )
+                
+                table_timings = financial_data.get("table_timings", [])
+                for timing in table_timings:
+                    logger.info(
+                        f"Table engine {timing['engine']} took {timing['seconds']:.2f}s for "
+                        f"{timing['pages']} pages ({timing['tables']} tables, "
+                        f"{'ok' if timing['success'] else 'failed'}) for report {report_id}"
+                    )
             
             # Calculate financial KPIs
             kpis = self.calculate_financial_kpis(financial_data)
@@ -63,7 +96,10 @@ class PDFProcessor:
                 "success": True,
                 "financial_pages": financial_pages,
                 "kpis": kpis,
-                "insights": insights
+                "insights": insights,
+                "extraction_stats": extraction_stats,
+                "section_detection": section_detection,
+                "table_timings": table_timings
             }
             
         except Exception as e:
@@ -72,189 +108,208 @@ class PDFProcessor:
             self.db_service.update_report_status(db, report_id, "failed")
             raise
     
-    def identify_financial_sections(self, file_path: str) -> Tuple[List[int], Set[int]]:
+    def identify_financial_sections(
+        self, 
+        file_path: str, 
+        page_store: Optional[PageStore] = None
+    ) -> Tuple[List[int], Set[int]]:
         """
         First pass to identify pages containing financial information.
         
         Args:
             file_path: Path to the PDF file
+            page_store: Optional shared page store; a private one is used if omitted
             
         Returns:
             Tuple of (table of contents pages, financial section pages)
         """
+        if page_store is None:
+            with self.pdf_service.open_page_store(file_path) as own_store:
+                return self.identify_financial_sections(file_path, own_store)
+        
+        cached_sections = page_store.get_derived("financial_sections")
+        if cached_sections is not None:
+            logger.info("Using cached financial section detection")
+            return cached_sections["toc_pages"], set(cached_sections["financial_pages"])
+        
         financial_pages = set()
         toc_pages = []
         
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                total_pages = len(reader.pages)
-                
-                # Financial section keywords to look for
-                financial_keywords = [
-                    "financial statements", "consolidated financial", 
-                    "balance sheet", "income statement", "statement of income",
-                    "cash flow statement", "statement of cash flows",
-                    "statement of financial position", "notes to financial",
-                    "financial results", "financial review", "financial performance"
-                ]
+            # Bookmark outlines give section page ranges without reading any page content
+            outline_pages = locate_financial_sections_from_outline(page_store.reader)
+            if outline_pages:
+                logger.info(f"Located {len(outline_pages)} financial pages from the document outline")
+                self._record_financial_sections(page_store, "outline", toc_pages, outline_pages)
+                return toc_pages, outline_pages
+            
+            method = "toc"
+            total_pages = page_store.page_count
+            
+            # Printed TOC page numbers refer to page labels, not physical page indices
+            page_labels = get_page_labels(page_store.reader)
+            
+            # Financial section keywords to look for
+            financial_keywords = [
+                "financial statements", "consolidated financial", 
+                "balance sheet", "income statement", "statement of income",
+                "cash flow statement", "statement of cash flows",
+                "statement of financial position", "notes to financial",
+                "financial results", "financial review", "financial performance"
+            ]
+            
+            # Regex patterns for finding page references in TOC
+            toc_pattern = re.compile(r'(table\s+of\s+contents|index)', re.IGNORECASE)
+            page_ref_pattern = re.compile(
+                r'(' + '|'.join(financial_keywords) + r')\s*\.{0,3}\s*(\d+)', 
+                re.IGNORECASE
+            )
+            
+            # First scan for TOC pages
+            for i in range(min(20, total_pages)):  # Check first 20 pages for TOC
+                page_text = page_store.get_text(i)
+                if toc_pattern.search(page_text):
+                    toc_pages.append(i)
+                    
+                    # Extract page references from TOC
+                    for match in page_ref_pattern.finditer(page_text):
+                        page_index = resolve_printed_page(page_labels, match.group(2))
+                        if page_index is not None:
+                            financial_pages.add(page_index)
+            
+            # If no TOC found or few financial pages identified, scan all pages
+            if len(financial_pages) < 5:
+                logger.info("Few financial pages found from TOC, segmenting all pages into sections")
+                method = "sections"
                 
-                # Regex patterns for finding page references in TOC
-                toc_pattern = re.compile(r'(table\s+of\s+contents|index)', re.IGNORECASE)
-                page_ref_pattern = re.compile(
-                    r'(' + '|'.join(financial_keywords) + r')\s*\.{0,3}\s*(\d+)', 
-                    re.IGNORECASE
-                )
+                # One pass over the streamed pages builds the section index; the financial
+                # sections give their page ranges directly
+                page_stream = self.pdf_service.iter_pages(file_path, include_tables=False, page_store=page_store)
+                document = Document.from_pages(page_text for _, page_text, _ in page_stream)
+                section_index = get_section_index(document)
+                page_store.set_derived("section_index", section_index.to_list())
+                section_pages = section_index.page_indices(FINANCIAL_SECTIONS)
+                financial_pages.update(section_pages)
                 
-                # First scan for TOC pages
-                for i in range(min(20, total_pages)):  # Check first 20 pages for TOC
-                    page_text = reader.pages[i].extract_text()
-                    if toc_pattern.search(page_text):
-                        toc_pages.append(i)
-                        
-                        # Extract page references from TOC
-                        for match in page_ref_pattern.finditer(page_text):
-                            try:
-                                page_num = int(match.group(2))
-                                # Adjust for 0-indexing if needed
-                                if page_num <= total_pages:
-                                    financial_pages.add(page_num - 1)  # Convert to 0-indexed
-                            except ValueError:
-                                continue
-                
-                # If no TOC found or few financial pages identified, scan all pages
-                if len(financial_pages) < 5:
-                    logger.info("Few financial pages found from TOC, scanning all pages")
-                    
-                    # Scan each page for financial keywords
+                if not section_pages:
+                    # No financial section headings: classify pages by financial keywords
+                    method = "text_scan"
                     for i in range(total_pages):
-                        if i % 50 == 0:  # Log progress for large documents
-                            logger.info(f"Scanning page {i}/{total_pages}")
-                            
-                        page_text = reader.pages[i].extract_text().lower()
+                        page_text = page_store.get_text(i)
                         
-                        # Check for financial section headers
-                        if any(keyword.lower() in page_text for keyword in financial_keywords):
+                        # Check for financial section keywords
+                        if self._is_financial_page(page_text, financial_keywords):
                             financial_pages.add(i)
                             
                             # Also add the next few pages as they likely contain financial data
                             for j in range(1, 5):
                                 if i + j < total_pages:
                                     financial_pages.add(i + j)
-                
-                # Add pages with tables that look like financial tables
-                with pdfplumber.open(file_path) as pdf:
-                    for i in range(total_pages):
-                        if i % 50 == 0:
-                            logger.info(f"Checking for tables on page {i}/{total_pages}")
-                            
-                        if i not in financial_pages:  # Skip pages we've already identified
-                            try:
-                                page = pdf.pages[i]
-                                tables = page.extract_tables()
-                                
-                                if tables and len(tables) > 0:
-                                    # Check if any table has financial data indicators
-                                    for table in tables:
-                                        if table and len(table) > 1:  # At least header + one row
-                                            table_text = ' '.join([' '.join([str(cell) for cell in row if cell]) for row in table])
-                                            if any(re.search(r'\b' + re.escape(kw) + r'\b', table_text, re.IGNORECASE) for kw in [
-                                                'revenue', 'income', 'assets', 'liabilities', 'equity', 
-                                                'cash', 'profit', 'loss', 'earnings', 'expense'
-                                            ]):
-                                                financial_pages.add(i)
-                                                break
-                            except Exception as e:
-                                logger.warning(f"Error checking tables on page {i}: {str(e)}")
-                                continue
-                
-                logger.info(f"Identified {len(toc_pages)} TOC pages and {len(financial_pages)} financial pages")
-                return toc_pages, financial_pages
+            
+            # Add pages with tables that look like financial tables; the text scorer
+            # keeps prose and image-only pages away from pdfplumber's table extraction
+            remaining_pages = [i for i in range(total_pages) if i not in financial_pages]
+            financial_pages.update(
+                find_financial_table_pages(page_store, remaining_pages, prefilter=self.table_prefilter)
+            )
+            
+            logger.info(f"Identified {len(toc_pages)} TOC pages and {len(financial_pages)} financial pages ({method})")
+            self._record_financial_sections(page_store, method, toc_pages, financial_pages)
+            return toc_pages, financial_pages
                 
         except Exception as e:
             logger.error(f"Error identifying financial sections: {str(e)}")
             raise
     
-    def extract_financial_sections(self, file_path: str, financial_pages: Set[int]) -> Dict[str, Any]:
+    @staticmethod
+    def _record_financial_sections(
+        page_store: PageStore, 
+        method: str, 
+        toc_pages: List[int], 
+        financial_pages: Set[int]
+    ) -> None:
+        """Record detected financial sections and the detection path taken ("outline", "toc", "sections" or "text_scan")."""
+        page_store.set_derived("financial_sections", {
+            "method": method,
+            "toc_pages": toc_pages,
+            "financial_pages": sorted(financial_pages)
+        })
+    
+    @staticmethod
+    def _is_financial_page(page_text: str, financial_keywords: List[str]) -> bool:
+        """Check whether a page's text mentions any financial section keyword."""
+        page_text = page_text.lower()
+        return any(keyword.lower() in page_text for keyword in financial_keywords)
+    
+    def extract_financial_sections(
+        self, 
+        file_path: str, 
+        financial_pages: Set[int], 
+        page_store: Optional[PageStore] = None
+    ) -> Dict[str, Any]:
         """
         Extract text and tables from identified financial pages.
         
         Args:
             file_path: Path to the PDF file
             financial_pages: Set of page numbers (0-indexed) containing financial information
+            page_store: Optional shared page store; a private one is used if omitted
             
         Returns:
             Dictionary with extracted financial data
         """
+        if page_store is None:
+            with self.pdf_service.open_page_store(file_path) as own_store:
+                return self.extract_financial_sections(file_path, financial_pages, own_store)
+        
         result = {
             "text": "",
             "tables": [],
-            "page_texts": {}
+            "page_texts": {},
+            "table_timings": []
         }
         
         try:
-            # Extract text from financial pages
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
-                for i in sorted(financial_pages):
-                    try:
-                        page_text = reader.pages[i].extract_text()
-                        result["text"] += page_text + "\n\n"
-                        result["page_texts"][i] = page_text
-                    except Exception as e:
-                        logger.warning(f"Error extracting text from page {i}: {str(e)}")
-            
-            # Extract tables from financial pages using tabula-py
-            try:
-                # Convert 0-indexed to 1-indexed for tabula
-                tabula_pages = [i + 1 for i in financial_pages]
-                
-                # Extract tables
-                tables = tabula.read_pdf(
-                    file_path,
-                    pages=tabula_pages,
-                    multiple_tables=True,
-                    pandas_options={'header': None}
-                )
-                
-                # Process tables
-                for i, table in enumerate(tables):
-                    if not table.empty:
-                        # Clean table data
-                        table = table.fillna('')
-                        table_dict = {
-                            "table_id": i,
-                            "data": table.values.tolist()
-                        }
-                        result["tables"].append(table_dict)
-                
-                logger.info(f"Extracted {len(result['tables'])} tables from financial pages")
-                
-            except Exception as e:
-                logger.error(f"Error extracting tables with tabula: {str(e)}")
-                
-                # Fallback to pdfplumber for table extraction
-                logger.info("Falling back to pdfplumber for table extraction")
-                with pdfplumber.open(file_path) as pdf:
-                    table_id = 0
-                    for i in sorted(financial_pages):
-                        try:
-                            page = pdf.pages[i]
-                            tables = page.extract_tables()
-                            
-                            for table in tables:
-                                if table and len(table) > 0:
-                                    table_dict = {
-                                        "table_id": table_id,
-                                        "page": i,
-                                        "data": table
-                                    }
-                                    result["tables"].append(table_dict)
-                                    table_id += 1
-                        except Exception as e:
-                            logger.warning(f"Error extracting tables from page {i} with pdfplumber: {str(e)}")
-            
+            # Extract text from financial pages (already parsed pages come from the store)
+            text_parts = []
+            for i in sorted(financial_pages):
+                try:
+                    page_text = page_store.get_text(i)
+                    text_parts.append(page_text + "\n\n")
+                    result["page_texts"][i] = page_text
+                except Exception as e:
+                    logger.warning(f"Error extracting text from page {i}: {str(e)}")
+            result["text"] = "".join(text_parts)
+            
+            # Reuse tables extracted from the same pages in an earlier run
+            cached_tables = page_store.get_derived("financial_tables")
+            if (
+                cached_tables is not None 
+                and cached_tables["pages"] == sorted(financial_pages) 
+                and cached_tables.get("engine") == self.table_extractor.engine
+            ):
+                logger.info(f"Using {len(cached_tables['tables'])} cached tables from financial pages")
+                result["tables"] = cached_tables["tables"]
+                return result
+            
+            # Over the memory budget, finish the report without tables rather than crash
+            if page_store.check_memory_budget():
+                logger.warning(f"Skipping table extraction for {file_path}: memory budget exceeded")
+                result["table_extraction_skipped"] = "memory_budget"
+                return result
+            
+            # Extract tables from financial pages with the configured engine
+            result["tables"], result["table_timings"] = self.table_extractor.extract(
+                file_path, 
+                sorted(financial_pages), 
+                page_store=page_store
+            )
+            
+            page_store.set_derived("financial_tables", {
+                "engine": self.table_extractor.engine,
+                "pages": sorted(financial_pages),
+                "tables": result["tables"]
+            })
             return result
             
         except Exception as e:
@@ -274,33 +329,23 @@ class PDFProcessor:
         kpis = {}
         
         try:
-            # Extract financial values using regex patterns
+            # Extract financial values: the first amount of every statement line item,
+            # found in a single pass of the shared metric scanner
             text = financial_data["text"]
-            
-            # Helper function to find financial values
-            def find_value(pattern, text, default=None):
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                if match and match.group(1):
-                    # Clean the value and convert to float
-                    value_str = match.group(1).replace(',', '').strip()
-                    try:
-                        return float(value_str)
-                    except ValueError:
-                        return default
-                return default
+            values = get_metric_scanner().first_values(text, group="line_item")
             
             # Extract key financial figures
-            revenue = find_value(r'(?:total\s+revenue|revenue)[^\n\d]+([\d,\.]+)', text)
-            net_income = find_value(r'(?:net\s+income|net\s+profit|net\s+earnings)[^\n\d]+([\d,\.]+)', text)
-            total_assets = find_value(r'(?:total\s+assets)[^\n\d]+([\d,\.]+)', text)
-            total_liabilities = find_value(r'(?:total\s+liabilities)[^\n\d]+([\d,\.]+)', text)
-            total_equity = find_value(r"(?:total\s+equity|shareholders['']?\s+equity)[^\n\d]+([\d,\.]+)", text)
-            current_assets = find_value(r'(?:current\s+assets)[^\n\d]+([\d,\.]+)', text)
-            current_liabilities = find_value(r'(?:current\s+liabilities)[^\n\d]+([\d,\.]+)', text)
-            inventory = find_value(r'(?:inventory|inventories)[^\n\d]+([\d,\.]+)', text)
-            cash = find_value(r'(?:cash\s+and\s+cash\s+equivalents|cash\s+equivalents)[^\n\d]+([\d,\.]+)', text)
-            operating_income = find_value(r'(?:operating\s+income|income\s+from\s+operations)[^\n\d]+([\d,\.]+)', text)
-            interest_expense = find_value(r'(?:interest\s+expense)[^\n\d]+([\d,\.]+)', text)
+            revenue = values.get("revenue")
+            net_income = values.get("net_income")
+            total_assets = values.get("total_assets")
+            total_liabilities = values.get("total_liabilities")
+            total_equity = values.get("total_equity")
+            current_assets = values.get("current_assets")
+            current_liabilities = values.get("current_liabilities")
+            inventory = values.get("inventory")
+            cash = values.get("cash")
+            operating_income = values.get("operating_income")
+            interest_expense = values.get("interest_expense")
             
             # Store extracted values
             kpis["extracted_values"] = {
@@ -3,83 +3,328 @@ import logging
 import PyPDF2
 import pdfplumber
 import re
-from typing import List, Dict, Any, Tuple
+import math
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Callable, Iterator, Iterable
 from utils.helpers import sanitize_filename
+from services.page_store import PageStore, normalize_table
+from services.extraction_cache import ExtractionCache
+from services.text_backends import DEFAULT_TEXT_BACKEND, open_text_backend, select_text_backend, compare_text_backends
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+def _extract_text_range(
+    file_path: str, 
+    start: int, 
+    end: int, 
+    text_backend: str = DEFAULT_TEXT_BACKEND
+) -> List[str]:
+    """Extract the text of pages [start, end) with a text backend (runs in a worker process)."""
+    with open_text_backend(text_backend, file_path) as backend:
+        return [backend.extract_page(i) for i in range(start, end)]
+
+def _extract_layout_page(page, page_index: int) -> Dict[str, Any]:
+    """Extract text and string-normalized tables from a single pdfplumber page."""
+    text = page.extract_text()
+    tables = page.extract_tables()
+    
+    # Release the page's characters and layout objects; only the results are kept
+    page.flush_cache()
+    
+    # Process tables into a more usable format
+    processed_tables = [normalize_table(table) for table in tables if table]
+    
+    return {
+        "page_number": page_index + 1,
+        "text": text,
+        "tables": processed_tables
+    }
+
+def _extract_layout_range(file_path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """Extract text and tables of pages [start, end) with pdfplumber (runs in a worker process)."""
+    with pdfplumber.open(file_path) as pdf:
+        return [_extract_layout_page(pdf.pages[i], i) for i in range(start, end)]
+
 class PDFService:
     def __init__(self):
-        pass
+        # Parallel extraction settings
+        self.parallel_extraction = os.getenv("PDF_PARALLEL_EXTRACTION", "false").lower() == "true"
+        self.extraction_workers = int(os.getenv("PDF_EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+        self.parallel_min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "50"))
+        
+        # Content-addressed cache of extraction results (None when disabled)
+        self.extraction_cache = ExtractionCache.from_env()
+        
+        # Bounded-memory settings for very large reports
+        self.low_memory = os.getenv("PDF_LOW_MEMORY", "false").lower() == "true"
+        self.max_resident_pages = int(os.getenv("PDF_MAX_RESIDENT_PAGES", "50"))
+        self.memory_budget_mb = float(os.getenv("PDF_MEMORY_BUDGET_MB", "0")) or None
+        
+        # Text extraction backend: pypdf2, pdfplumber, pypdfium2 or auto (fastest per document, opt-in
+        # as the selection depends on timings and backends differ slightly in their output)
+        self.text_backend = os.getenv("PDF_TEXT_BACKEND", "pypdf2").lower()
+        self.compare_backend_quality = os.getenv("PDF_TEXT_BACKEND_COMPARE", "false").lower() == "true"
+    
+    def open_page_store(self, file_path: str) -> PageStore:
+        """
+        Open a page store for a PDF, backed by the extraction cache when enabled
+        and configured with the bounded-memory settings (PDF_LOW_MEMORY,
+        PDF_MAX_RESIDENT_PAGES, PDF_MEMORY_BUDGET_MB) and the text backend
+        (PDF_TEXT_BACKEND, PDF_TEXT_BACKEND_COMPARE).
+        
+        On a cache hit, pages, metadata and financial page detection from an earlier
+        run of the same PDF bytes are reused without parsing the document again.
+        """
+        return PageStore(
+            file_path, 
+            cache=self.extraction_cache, 
+            low_memory=self.low_memory, 
+            max_resident_pages=self.max_resident_pages, 
+            memory_budget_mb=self.memory_budget_mb, 
+            text_backend=self.text_backend, 
+            compare_backend_quality=self.compare_backend_quality
+        )
+    
+    def resolve_text_backend(self, file_path: str) -> str:
+        """
+        Get the text backend to use for a document, timing the candidates in auto mode.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Name of the text backend
+        """
+        if self.text_backend != "auto":
+            return self.text_backend
+        return select_text_backend(file_path, check_quality=self.compare_backend_quality)
+    
+    def compare_text_backends(self, file_path: str, sample_size: int = 5) -> Dict[str, Dict[str, Any]]:
+        """
+        Compare speed and output quality of the available text backends on sample pages.
+        
+        Args:
+            file_path: Path to the PDF file
+            sample_size: Number of pages to sample, spread over the document
+            
+        Returns:
+            Dictionary per backend with seconds_per_page, chars, empty_pages and
+            similarity to PyPDF2's output
+        """
+        comparison, _ = compare_text_backends(file_path, sample_size=sample_size)
+        return comparison
+    
+    def _should_parallelize(self, page_count: int, parallel: Optional[bool], workers: int) -> bool:
+        """Decide whether a document is worth sharding across processes."""
+        if parallel is None:
+            parallel = self.parallel_extraction and page_count >= self.parallel_min_pages
+        return parallel and workers > 1 and page_count > 1
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from a PDF file using PyPDF2."""
+    def _extract_sharded(
+        self, 
+        worker: Callable[[str, int, int], List[Any]], 
+        file_path: str, 
+        page_count: int, 
+        workers: int
+    ) -> List[Any]:
+        """
+        Shard page ranges across a process pool and reassemble the results in page order.
+        
+        Args:
+            worker: Module-level function extracting pages [start, end) of a file
+            file_path: Path to the PDF file
+            page_count: Total number of pages
+            workers: Number of worker processes
+            
+        Returns:
+            Per-page results in page order
+        """
+        # A few shards per worker keeps the pool busy when pages differ in cost
+        shard_size = max(1, math.ceil(page_count / (workers * 4)))
+        starts = list(range(0, page_count, shard_size))
+        ends = [min(start + shard_size, page_count) for start in starts]
+        
+        logger.info(f"Extracting {page_count} pages in {len(starts)} shards across {workers} processes")
+        with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+            # executor.map yields shard results in submission order
+            shard_results = executor.map(worker, [file_path] * len(starts), starts, ends)
+            return [page for shard in shard_results for page in shard]
+    
+    def extract_text_from_pdf(
+        self, 
+        file_path: str, 
+        page_store: Optional[PageStore] = None, 
+        parallel: Optional[bool] = None, 
+        max_workers: Optional[int] = None
+    ) -> str:
+        """
+        Extract text from a PDF file using the configured text backend.
+        
+        Args:
+            file_path: Path to the PDF file
+            page_store: Optional per-document page store; when given, pages already
+                parsed by earlier stages are reused instead of being extracted again
+            parallel: Shard pages across a process pool (defaults to PDF_PARALLEL_EXTRACTION
+                for documents of at least PDF_PARALLEL_MIN_PAGES pages)
+            max_workers: Number of worker processes (defaults to PDF_EXTRACTION_WORKERS)
+            
+        Returns:
+            Text of the whole document
+        """
         try:
+            workers = max_workers or self.extraction_workers
+            
+            if page_store is not None:
+                page_count = page_store.page_count
+                # Only shard a store without any text yet; a cache hit or earlier stage already has pages
+                if self._should_parallelize(page_count, parallel, workers) and page_store.text_pages_loaded == 0:
+                    try:
+                        worker = partial(_extract_text_range, text_backend=page_store.backend.name)
+                        page_texts = self._extract_sharded(worker, file_path, page_count, workers)
+                        page_store.add_texts(page_texts)
+                    except Exception as e:
+                        logger.warning(f"Parallel text extraction failed, continuing serially: {str(e)}")
+                return page_store.get_full_text()
+            
             with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                page_count = len(reader.pages)
-                
-                text = ""
-                for page_num in range(page_count):
-                    page = reader.pages[page_num]
-                    text += page.extract_text() + "\n\n"
-                
-                return text
+                page_count = len(PyPDF2.PdfReader(file).pages)
+            
+            if self._should_parallelize(page_count, parallel, workers):
+                try:
+                    worker = partial(_extract_text_range, text_backend=self.resolve_text_backend(file_path))
+                    page_texts = self._extract_sharded(worker, file_path, page_count, workers)
+                    return "".join(text + "\n\n" for text in page_texts)
+                except Exception as e:
+                    logger.warning(f"Parallel text extraction failed, falling back to serial: {str(e)}")
+            
+            return "".join(
+                text + "\n\n" 
+                for _, text, _ in self.iter_pages(file_path, include_tables=False)
+            )
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise
     
-    def extract_text_with_layout(self, file_path: str) -> List[Dict[str, Any]]:
-        """Extract text with layout information using pdfplumber."""
+    def iter_pages(
+        self, 
+        file_path: str, 
+        page_numbers: Optional[Iterable[int]] = None, 
+        include_tables: bool = True, 
+        page_store: Optional[PageStore] = None
+    ) -> Iterator[Tuple[int, str, List[List[List[str]]]]]:
+        """
+        Stream pages of a PDF as they are extracted.
+        
+        Text comes from the configured text backend and tables from pdfplumber. Without a page store,
+        nothing is kept once a page has been yielded (pdfplumber's per-page layout
+        cache is flushed), so consumers that process pages incrementally hold
+        roughly one page in memory at a time.
+        
+        Args:
+            file_path: Path to the PDF file
+            page_numbers: 0-indexed pages to extract, in the order to yield them
+                (all pages by default)
+            include_tables: Also extract tables; when False, tables are always empty
+            page_store: Optional per-document page store to read (and cache) pages through
+            
+        Yields:
+            Tuples of (page_number, text, tables), page_number being 1-indexed
+        """
+        if page_store is not None:
+            page_indices = range(page_store.page_count) if page_numbers is None else page_numbers
+            for i in page_indices:
+                tables = page_store.get_tables(i) if include_tables else []
+                yield i + 1, page_store.get_text(i), tables
+            return
+        
+        plumber = None
+        try:
+            with open_text_backend(self.resolve_text_backend(file_path), file_path) as backend:
+                page_indices = range(backend.page_count) if page_numbers is None else page_numbers
+                
+                for i in page_indices:
+                    text = backend.extract_page(i)
+                    tables = []
+                    if include_tables:
+                        if plumber is None:
+                            plumber = pdfplumber.open(file_path)
+                        page = plumber.pages[i]
+                        tables = [normalize_table(table) for table in page.extract_tables() if table]
+                        page.flush_cache()
+                    yield i + 1, text, tables
+        finally:
+            if plumber is not None:
+                plumber.close()
+    
+    def extract_text_with_layout(
+        self, 
+        file_path: str, 
+        parallel: Optional[bool] = None, 
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract text with layout information using pdfplumber.
+        
+        Args:
+            file_path: Path to the PDF file
+            parallel: Shard pages across a process pool (see extract_text_from_pdf)
+            max_workers: Number of worker processes (defaults to PDF_EXTRACTION_WORKERS)
+            
+        Returns:
+            List of page dictionaries with page_number, text and tables, in page order
+        """
         try:
-            pages = []
+            workers = max_workers or self.extraction_workers
+            
             with pdfplumber.open(file_path) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    text = page.extract_text()
-                    tables = page.extract_tables()
-                    
-                    # Process tables into a more usable format
-                    processed_tables = []
-                    for table in tables:
-                        if table:
-                            # Convert all cells to strings
-                            processed_table = [[str(cell) if cell is not None else "" for cell in row] for row in table]
-                            processed_tables.append(processed_table)
-                    
-                    pages.append({
-                        "page_number": i + 1,
-                        "text": text,
-                        "tables": processed_tables
-                    })
+                page_count = len(pdf.pages)
+                
+                if self._should_parallelize(page_count, parallel, workers):
+                    try:
+                        return self._extract_sharded(_extract_layout_range, file_path, page_count, workers)
+                    except Exception as e:
+                        logger.warning(f"Parallel layout extraction failed, falling back to serial: {str(e)}")
                 
-                return pages
+                return [_extract_layout_page(page, i) for i, page in enumerate(pdf.pages)]
         except Exception as e:
             logger.error(f"Error extracting text with layout from PDF: {str(e)}")
             raise
     
-    def get_pdf_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Extract metadata from a PDF file."""
+    def get_pdf_metadata(self, file_path: str, page_store: Optional[PageStore] = None) -> Dict[str, Any]:
+        """Extract metadata from a PDF file, reusing the page store's reader if given."""
         try:
+            if page_store is not None:
+                metadata = page_store.get_derived("metadata")
+                if metadata is None:
+                    metadata = self._format_metadata(page_store.reader)
+                    page_store.set_derived("metadata", metadata)
+                return metadata
+            
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
-                metadata = reader.metadata
-                page_count = len(reader.pages)
-                
-                return {
-                    "title": metadata.title if metadata and metadata.title else None,
-                    "author": metadata.author if metadata and metadata.author else None,
-                    "subject": metadata.subject if metadata and metadata.subject else None,
-                    "creator": metadata.creator if metadata and metadata.creator else None,
-                    "producer": metadata.producer if metadata and metadata.producer else None,
-                    "page_count": page_count
-                }
+                return self._format_metadata(reader)
         except Exception as e:
             logger.error(f"Error extracting metadata from PDF: {str(e)}")
             raise
     
+    def _format_metadata(self, reader: PyPDF2.PdfReader) -> Dict[str, Any]:
+        """Build the metadata dictionary from an open PyPDF2 reader."""
+        metadata = reader.metadata
+        page_count = len(reader.pages)
+        
+        return {
+            "title": metadata.title if metadata and metadata.title else None,
+            "author": metadata.author if metadata and metadata.author else None,
+            "subject": metadata.subject if metadata and metadata.subject else None,
+            "creator": metadata.creator if metadata and metadata.creator else None,
+            "producer": metadata.producer if metadata and metadata.producer else None,
+            "page_count": page_count
+        }
+    
     def chunk_text(self, text: str, chunk_size: int = 4000, overlap: int = 200) -> List[str]:
         """Split text into chunks of specified size with overlap."""
         if not text:
@@ -0,0 +1,192 @@
+import os
+import time
+import random
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """A model's circuit breaker is open; the request was not sent."""
+
+    def __init__(self, model_name: str, retry_in: float):
+        super().__init__(f"Circuit breaker open for model {model_name}, retrying in {retry_in:.0f}s")
+        self.model_name = model_name
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter between the attempts of a request.
+
+    Configuration (environment):
+        HF_RETRY_BASE_DELAY: Wait before the second attempt in seconds, doubled per attempt (default 2)
+        HF_RETRY_MAX_DELAY: Upper bound of a single wait in seconds (default 30)
+    """
+
+    def __init__(self, base_delay: Optional[float] = None, max_delay: Optional[float] = None, jitter: float = 0.5):
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("HF_RETRY_BASE_DELAY", "2"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("HF_RETRY_MAX_DELAY", "30"))
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the wait after a failed attempt.
+
+        Args:
+            attempt: Number of the failed attempt (1-based)
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        delay = self.base_delay * (2 ** (attempt - 1)) * (1 + random.uniform(0, self.jitter))
+        return min(delay, self.max_delay)
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker over consecutive failed requests.
+
+    Closed: requests go through; failure_threshold consecutive failures open
+    the circuit. Open: requests are rejected without being sent, so callers
+    go to a fallback model or local fallback at once instead of retrying.
+    After reset_timeout the circuit is half-open: one probe request goes
+    through, and it closes the circuit on success or opens it again on
+    failure. Only a result counts as a success; timeouts, connection errors,
+    server errors, rate limits and unexpected errors count as failures. A
+    request the endpoint rejects (other 4xx) is counted neither way.
+
+    Configuration (environment):
+        HF_CIRCUIT_FAILURE_THRESHOLD: Consecutive failures that open the circuit, 0 to disable (default 5)
+        HF_CIRCUIT_RESET_SECONDS: Time an open circuit rejects requests before a probe (default 60)
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None
+    ):
+        self.model_name = model_name
+        if failure_threshold is None:
+            failure_threshold = int(os.getenv("HF_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        if reset_timeout is None:
+            reset_timeout = float(os.getenv("HF_CIRCUIT_RESET_SECONDS", "60"))
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.state_changes = {OPEN: 0, HALF_OPEN: 0, CLOSED: 0}
+        self.transitions = deque(maxlen=20)
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            True when closed, or for the single probe of a half-open circuit
+        """
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            now = time.time()
+            if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+                self._change_state(HALF_OPEN, now)
+            if self.state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back is replaced after reset_timeout
+                if self.probe_started is None or now - self.probe_started >= self.reset_timeout:
+                    self.probe_started = now
+                    return True
+            if self.state == CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Get the seconds until an open circuit lets a probe through."""
+        return max(self.opened_at + self.reset_timeout - time.time(), 0.0)
+
+    def record_success(self) -> None:
+        """Record an answer of the model; closes a half-open circuit."""
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                self._change_state(CLOSED, time.time())
+
+    def record_failure(self) -> None:
+        """Record a failed request; opens the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.failure_threshold <= 0:
+                return
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._change_state(OPEN, time.time())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the state, counters and recent state changes of the circuit."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "times_opened": self.state_changes[OPEN],
+                "transitions": list(self.transitions)
+            }
+
+    def _change_state(self, state: str, now: float) -> None:
+        previous, self.state = self.state, state
+        self.state_changes[state] += 1
+        self.transitions.append({"from": previous, "to": state, "at": now})
+        if state == OPEN:
+            self.opened_at = now
+            logger.warning(
+                f"Circuit breaker for {self.model_name} opened after {self.consecutive_failures} "
+                f"consecutive failures; rejecting requests for {self.reset_timeout:.0f}s"
+            )
+        else:
+            logger.info(f"Circuit breaker for {self.model_name} changed from {previous} to {state}")
+        if state != HALF_OPEN:
+            self.probe_started = None
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(model_name: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker of a model."""
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(model_name)
+        if breaker is None:
+            breaker = _circuit_breakers[model_name] = CircuitBreaker(model_name)
+        return breaker
+
+
+def get_circuit_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the stats of the circuit breaker of every model called so far."""
+    with _circuit_breakers_lock:
+        breakers = list(_circuit_breakers.values())
+    return {breaker.model_name: breaker.get_stats() for breaker in breakers}
@@ -0,0 +1,183 @@
+import re
+import logging
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple, Union
+
+from services.document import Document, as_document
+
+logger = logging.getLogger(__name__)
+
+# Built-in section headings. Patterns run on lowercased text; a heading stands
+# at the start of a line and is followed by the end of the line or a colon.
+# Headings starting with "Item" (10-K items) end at the next item heading; other
+# headings end at the next heading of any kind, or after MAX_SECTION_PAGES pages
+# since many headings of a report are not known here. The generic "item"
+# definition only marks where the previous item ends.
+DEFAULT_SECTION_DEFINITIONS = [
+    {"name": "business", "pattern": r"item\s+1\.?\s+business"},
+    {"name": "risk_factors",
+     "pattern": r"(?:item\s+1a\.?\s+)?(?:risk\s+factors|risks\s+and\s+uncertainties|principal\s+risks(?:\s+and\s+uncertainties)?)"},
+    {"name": "legal_proceedings", "pattern": r"item\s+3\.?\s+legal\s+proceedings"},
+    {"name": "mdna",
+     "pattern": r"(?:item\s+7\.?\s+)?(?:management['’]s\s+discussion\s+and\s+analysis"
+                r"(?:\s+of\s+financial\s+condition\s+and\s+results\s+of\s+operations)?|(?:operating\s+and\s+)?financial\s+review)"},
+    {"name": "market_risk",
+     "pattern": r"(?:item\s+7a\.?\s+)?quantitative\s+and\s+qualitative\s+disclosures?\s+about\s+market\s+risk"},
+    {"name": "financial_statements",
+     "pattern": r"(?:item\s+8\.?\s+)?(?:consolidated\s+)?(?:financial\s+statements(?:\s+and\s+supplementary\s+data)?"
+                r"|balance\s+sheets?|income\s+statements?|cash\s+flow\s+statements?"
+                r"|statements?\s+of\s+(?:income|operations|comprehensive\s+income|cash\s+flows|financial\s+position"
+                r"|changes\s+in\s+(?:shareholders|stockholders)['’]?\s+equity))"},
+    {"name": "notes", "pattern": r"notes\s+to\s+(?:the\s+)?(?:consolidated\s+)?financial\s+statements"},
+    {"name": "outlook",
+     "pattern": r"(?:business\s+|future\s+)?outlook|forward[ -]looking\s+statements|future\s+prospects|guidance"},
+    {"name": "controls", "pattern": r"(?:item\s+9a\.?\s+)?controls\s+and\s+procedures"},
+    {"name": "item", "pattern": r"item\s+\d+[a-c]?\.[^\n]*"},
+]
+
+# Pages a section without an "Item" heading can span at most
+MAX_SECTION_PAGES = 5
+
+# Sections holding the financial statements
+FINANCIAL_SECTIONS = ["financial_statements", "notes"]
+
+
+class SectionIndex:
+    """
+    Where the sections of a report are: (section, start, end, page range) entries.
+
+    Entries are in text order; a section name can occur several times (e.g. a
+    table of contents line and the section itself, or one entry per financial
+    statement). Entries are plain dicts, so an index can be stored as JSON.
+    """
+
+    def __init__(self, sections: List[Dict[str, Any]]):
+        self.sections = sections
+
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """Get all entries of a section, in text order."""
+        return [section for section in self.sections if section["section"] == name]
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the longest entry of a section (None if absent); table of contents lines are short."""
+        return max(self.find(name), key=lambda section: section["end"] - section["start"], default=None)
+
+    def span(self, name: str) -> Optional[Tuple[int, int]]:
+        """Get the (start, end) offsets of the longest entry of a section."""
+        section = self.get(name)
+        return (section["start"], section["end"]) if section else None
+
+    def page_indices(self, names: Iterable[str]) -> Set[int]:
+        """Get the 0-based indices of all pages covered by the given sections."""
+        names = set(names)
+        pages = set()
+        for section in self.sections:
+            if section["section"] in names:
+                pages.update(range(section["page_start"] - 1, section["page_end"]))
+        return pages
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [dict(section) for section in self.sections]
+
+    @classmethod
+    def from_list(cls, sections: List[Dict[str, Any]]) -> "SectionIndex":
+        return cls([dict(section) for section in sections])
+
+
+class SectionSegmenter:
+    """
+    Build the section index of a report in one pass.
+
+    All section headings are compiled into one multiline pattern that is run
+    once over the document's shared lowercased text; every stage then reads
+    the span of its own section from the index instead of searching the full
+    text for it.
+
+    Usage:
+        index = get_section_index(document)
+        span = index.span("risk_factors")
+    """
+
+    def __init__(
+        self,
+        definitions: Optional[List[Dict[str, str]]] = None,
+        max_section_pages: int = MAX_SECTION_PAGES
+    ):
+        """
+        Args:
+            definitions: Section definitions ("name" and "pattern" dicts);
+                defaults to DEFAULT_SECTION_DEFINITIONS
+            max_section_pages: Pages a section without an "Item" heading can span at most
+        """
+        self.definitions = definitions if definitions is not None else DEFAULT_SECTION_DEFINITIONS
+        self.max_section_pages = max_section_pages
+        self._names = [definition["name"] for definition in self.definitions]
+        self._heading_pattern = re.compile(
+            r"^[ \t]*(?:" + "|".join(
+                f"(?P<s{index}>{definition['pattern']})" for index, definition in enumerate(self.definitions)
+            ) + r")[ \t]*(?::|$)",
+            re.MULTILINE
+        )
+        self._cache_key = f"section_index:{id(self)}"
+
+    def index(self, text: Union[str, Document]) -> SectionIndex:
+        """
+        Get the section index of a text (or Document), cached on the Document.
+
+        Args:
+            text: Text or Document to segment
+
+        Returns:
+            SectionIndex of the text
+        """
+        document = as_document(text)
+        index = document.get_derived(self._cache_key)
+        if index is None:
+            index = SectionIndex(self._segment(document))
+            document.set_derived(self._cache_key, index)
+            logger.info(f"Found {len(index.sections)} section headings in text of length {len(document)}")
+        return index
+
+    def _segment(self, document: Document) -> List[Dict[str, Any]]:
+        headings = []
+        for match in self._heading_pattern.finditer(document.lower):
+            name = self._names[int(match.lastgroup[1:])]
+            start = match.start(match.lastgroup)
+            headings.append((name, start, document.lower.startswith("item", start)))
+
+        # Walk backwards so the next heading (and next item heading) is always known
+        page_offsets = document.page_offsets
+        sections = []
+        next_heading = next_item = len(document)
+        for name, start, is_item in reversed(headings):
+            page_start = document.page_number_at(start)
+            if is_item:
+                end = next_item
+            else:
+                end = next_heading
+                last_page_index = page_start - 1 + self.max_section_pages
+                if last_page_index < len(page_offsets):
+                    end = min(end, page_offsets[last_page_index])
+            if name != "item":
+                sections.append({
+                    "section": name,
+                    "start": start,
+                    "end": end,
+                    "page_start": page_start,
+                    "page_end": document.page_number_at(max(end - 1, start))
+                })
+            next_heading = start
+            if is_item:
+                next_item = start
+        sections.reverse()
+        return sections
+
+
+_default_segmenter: Optional[SectionSegmenter] = None
+
+
+def get_section_index(text: Union[str, Document]) -> SectionIndex:
+    """Get the section index of a text (or Document) with the built-in section definitions."""
+    global _default_segmenter
+    if _default_segmenter is None:
+        _default_segmenter = SectionSegmenter()
+    return _default_segmenter.index(text)
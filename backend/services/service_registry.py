@@ -0,0 +1,123 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialCheck:
+    """
+    Lazily run credential validation and cache its result for a while.
+
+    Validating an API key costs a network round trip (an inference call or a
+    whoami request), so it is not done when a service is constructed but the
+    first time the result is needed. The result is reused until it expires;
+    a failed validation expires sooner, so a transient network error does
+    not disable the API for long. Concurrent callers wait for one check
+    instead of each making their own.
+
+    Configuration (environment):
+        CREDENTIAL_CHECK_TTL_SECONDS: Reuse of a successful validation (default 3600)
+        CREDENTIAL_CHECK_FAILURE_TTL_SECONDS: Reuse of a failed validation (default 300)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        check: Callable[[], bool],
+        ttl_seconds: Optional[float] = None,
+        failure_ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            name: What is validated, for log messages
+            check: Function validating the credentials; exceptions count as invalid
+            ttl_seconds: Reuse of a successful validation
+            failure_ttl_seconds: Reuse of a failed validation
+        """
+        self.name = name
+        self.check = check
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("CREDENTIAL_CHECK_TTL_SECONDS", "3600"))
+        if failure_ttl_seconds is None:
+            failure_ttl_seconds = float(os.getenv("CREDENTIAL_CHECK_FAILURE_TTL_SECONDS", "300"))
+        self.ttl_seconds = ttl_seconds
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self._lock = threading.Lock()
+        self._valid = False
+        self._expires = 0.0
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the credentials are valid, validated now if there is no unexpired result."""
+        if time.time() < self._expires:
+            return self._valid
+        with self._lock:
+            # Another thread may have validated while this one waited
+            if time.time() < self._expires:
+                return self._valid
+            start_time = time.time()
+            try:
+                valid = bool(self.check())
+            except Exception as e:
+                logger.error(f"Error validating {self.name} credentials: {str(e)}")
+                valid = False
+            self._valid = valid
+            self._expires = time.time() + (self.ttl_seconds if valid else self.failure_ttl_seconds)
+            logger.info(f"Validated {self.name} credentials ({valid}) in {time.time() - start_time:.2f} seconds")
+            return valid
+
+    def set(self, valid: bool) -> None:
+        """Fix the result without validating (it does not expire)."""
+        with self._lock:
+            self._valid = valid
+            self._expires = float("inf")
+
+    def invalidate(self) -> None:
+        """Drop the cached result, so the next use validates again."""
+        with self._lock:
+            self._expires = 0.0
+
+
+_services: Dict[str, Any] = {}
+_services_lock = threading.RLock()
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    """Get a registered service, building it on first use."""
+    service = _services.get(name)
+    if service is None:
+        # Reentrant, as building a service may get the services it depends on
+        with _services_lock:
+            service = _services.get(name)
+            if service is None:
+                start_time = time.time()
+                service = _services[name] = factory()
+                logger.info(f"Created shared {name} in {time.time() - start_time:.2f} seconds")
+    return service
+
+
+def get_huggingface_service():
+    """Get the process-wide HuggingFaceService."""
+    from services.huggingface_service import HuggingFaceService
+    return _get_or_create("HuggingFaceService", HuggingFaceService)
+
+
+def get_ai_service():
+    """Get the process-wide AIService (using the shared HuggingFaceService)."""
+    from services.ai_service import AIService
+    return _get_or_create("AIService", AIService)
+
+
+def get_analysis_service():
+    """Get the process-wide AnalysisService (using the shared AIService)."""
+    from services.analysis_service import AnalysisService
+    return _get_or_create("AnalysisService", AnalysisService)
+
+
+def reset_services() -> None:
+    """Drop all registered services, so they are built again on next use."""
+    with _services_lock:
+        _services.clear()
@@ -0,0 +1,266 @@
+import os
+import time
+import logging
+import tempfile
+import threading
+import pdfplumber
+from typing import List, Dict, Any, Optional, Tuple
+
+from services.page_store import PageStore, normalize_table
+
+logger = logging.getLogger(__name__)
+
+TABLE_ENGINES = ("tabula", "pdfplumber", "ruled")
+
+# Only ruling lines delimit cells in the fast mode; no text-alignment guessing
+RULED_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines"
+}
+
+# A ruled table needs at least two horizontal and two vertical edges
+MIN_RULING_EDGES = 4
+
+# Process-wide timings per engine, so throughput can be compared across reports
+_engine_stats: Dict[str, Dict[str, float]] = {}
+_engine_stats_lock = threading.Lock()
+
+
+def _record_timing(engine: str, pages: int, tables: int, seconds: float, failed: bool) -> None:
+    with _engine_stats_lock:
+        stats = _engine_stats.setdefault(engine, {
+            "runs": 0, "failures": 0, "pages": 0, "tables": 0, "seconds": 0.0
+        })
+        stats["runs"] += 1
+        stats["failures"] += int(failed)
+        stats["pages"] += pages
+        stats["tables"] += tables
+        stats["seconds"] += seconds
+
+
+def get_engine_stats() -> Dict[str, Dict[str, float]]:
+    """Get accumulated timings per table engine, including measured pages/sec."""
+    with _engine_stats_lock:
+        result = {}
+        for engine, stats in _engine_stats.items():
+            result[engine] = dict(stats)
+            result[engine]["pages_per_sec"] = (
+                round(stats["pages"] / stats["seconds"], 2) if stats["seconds"] > 0 else None
+            )
+        return result
+
+
+class TableExtractor:
+    """
+    Table extraction with selectable engines.
+
+    Engines:
+        tabula: tabula-py. With jpype installed, tabula runs in a JVM that is
+            started once per process and stays warm across reports; without
+            jpype every call spawns a new JVM.
+        pdfplumber: pdfplumber's default table finder, cached in the page store.
+        ruled: pdfplumber restricted to ruling lines; pages without enough
+            ruling edges are skipped before any table finding.
+
+    Each extraction records its timing, both in the returned report-level
+    timings and in process-wide per-engine stats (see get_engine_stats).
+
+    Configuration (environment):
+        TABLE_EXTRACTION_ENGINE: tabula (default), pdfplumber or ruled
+    """
+
+    def __init__(self, engine: Optional[str] = None):
+        engine = (engine or os.getenv("TABLE_EXTRACTION_ENGINE", "tabula")).lower()
+        if engine not in TABLE_ENGINES:
+            logger.warning(f"Unknown table extraction engine '{engine}', using tabula")
+            engine = "tabula"
+        self.engine = engine
+
+    def extract(
+        self,
+        file_path: str,
+        pages: List[int],
+        page_store: Optional[PageStore] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Extract tables from pages of a PDF, falling back to pdfplumber if the engine fails.
+
+        Args:
+            file_path: Path to the PDF file
+            pages: 0-indexed pages to extract tables from
+            page_store: Optional page store to read pdfplumber tables through
+
+        Returns:
+            Tuple of (tables, timings). Tables are dictionaries with table_id,
+            data and, where the engine knows it, page. Timings list one entry
+            per engine attempted, with engine, seconds, pages, tables and success.
+        """
+        pages = sorted(pages)
+        engines = [self.engine] if self.engine == "pdfplumber" else [self.engine, "pdfplumber"]
+
+        timings = []
+        for engine in engines:
+            start = time.perf_counter()
+            try:
+                tables = self._run_engine(engine, file_path, pages, page_store)
+                failed = False
+            except Exception as e:
+                logger.error(f"Error extracting tables with {engine}: {str(e)}")
+                tables = None
+                failed = True
+            seconds = time.perf_counter() - start
+
+            table_count = len(tables) if tables else 0
+            _record_timing(engine, len(pages), table_count, seconds, failed)
+            timings.append({
+                "engine": engine,
+                "seconds": round(seconds, 4),
+                "pages": len(pages),
+                "tables": table_count,
+                "success": not failed
+            })
+
+            if not failed:
+                logger.info(f"Extracted {table_count} tables from {len(pages)} pages with {engine} in {seconds:.2f}s")
+                return tables, timings
+
+            logger.info("Falling back to pdfplumber for table extraction")
+
+        return [], timings
+
+    def extract_batch(
+        self,
+        jobs: List[Tuple[str, List[int]]]
+    ) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Extract tables for many reports in one run.
+
+        With the tabula engine all reports go through the same warm JVM, so the
+        startup cost is paid once for the whole batch.
+
+        Args:
+            jobs: List of (file_path, 0-indexed pages) pairs
+
+        Returns:
+            One (tables, timings) pair per job, in job order
+        """
+        if self.engine == "tabula":
+            self.warm_up()
+
+        results = []
+        for file_path, pages in jobs:
+            results.append(self.extract(file_path, pages))
+        return results
+
+    def warm_up(self) -> bool:
+        """
+        Start tabula's JVM ahead of the first report by extracting a one-page sample.
+
+        Returns:
+            True if tabula ran successfully
+        """
+        if self.engine != "tabula":
+            return False
+
+        # Imported here so the sample builder is only loaded when warming up
+        from utils.sample_pdf import write_sample_pdf
+
+        start = time.perf_counter()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                sample_path = write_sample_pdf(
+                    os.path.join(temp_dir, "warm_up.pdf"),
+                    [{"text": "Warm up", "table": [["a", "1"], ["b", "2"]]}]
+                )
+                self._extract_tabula(sample_path, [0])
+            logger.info(f"tabula warmed up in {time.perf_counter() - start:.2f}s")
+            return True
+        except Exception as e:
+            logger.warning(f"tabula warm-up failed: {str(e)}")
+            return False
+
+    def _run_engine(
+        self,
+        engine: str,
+        file_path: str,
+        pages: List[int],
+        page_store: Optional[PageStore]
+    ) -> List[Dict[str, Any]]:
+        if engine == "tabula":
+            return self._extract_tabula(file_path, pages)
+        if engine == "ruled":
+            return self._extract_ruled(file_path, pages)
+        return self._extract_pdfplumber(file_path, pages, page_store)
+
+    def _extract_tabula(self, file_path: str, pages: List[int]) -> List[Dict[str, Any]]:
+        """Extract tables with tabula-py (one call for all pages)."""
+        # Imported lazily: tabula pulls in pandas and, with jpype, the JVM bridge
+        import tabula
+
+        if not pages:
+            return []
+
+        tables = tabula.read_pdf(
+            file_path,
+            pages=[i + 1 for i in pages],  # tabula pages are 1-indexed
+            multiple_tables=True,
+            pandas_options={'header': None}
+        )
+
+        result = []
+        for i, table in enumerate(tables):
+            if not table.empty:
+                # Clean table data
+                table = table.fillna('')
+                result.append({
+                    "table_id": i,
+                    "data": table.values.tolist()
+                })
+        return result
+
+    def _extract_pdfplumber(
+        self,
+        file_path: str,
+        pages: List[int],
+        page_store: Optional[PageStore]
+    ) -> List[Dict[str, Any]]:
+        """Extract tables with pdfplumber's default settings, through the page store."""
+        if page_store is None:
+            with PageStore(file_path) as own_store:
+                return self._extract_pdfplumber(file_path, pages, own_store)
+
+        result = []
+        for i in pages:
+            try:
+                for table in page_store.get_tables(i):
+                    if table:
+                        result.append({
+                            "table_id": len(result),
+                            "page": i,
+                            "data": table
+                        })
+            except Exception as e:
+                logger.warning(f"Error extracting tables from page {i} with pdfplumber: {str(e)}")
+        return result
+
+    def _extract_ruled(self, file_path: str, pages: List[int]) -> List[Dict[str, Any]]:
+        """Extract ruled tables only, skipping pages without ruling lines."""
+        result = []
+        with pdfplumber.open(file_path) as pdf:
+            for i in pages:
+                page = pdf.pages[i]
+                try:
+                    if len(page.edges) < MIN_RULING_EDGES:
+                        continue
+                    for table in page.extract_tables(RULED_TABLE_SETTINGS):
+                        if table:
+                            result.append({
+                                "table_id": len(result),
+                                "page": i,
+                                "data": normalize_table(table)
+                            })
+                except Exception as e:
+                    logger.warning(f"Error extracting ruled tables from page {i}: {str(e)}")
+                finally:
+                    page.flush_cache()
+        return result
@@ -0,0 +1,323 @@
+import os
+import time
+import logging
+import difflib
+import threading
+import PyPDF2
+import pdfplumber
+from typing import List, Dict, Any, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# Backend used when no other backend is configured or available
+DEFAULT_TEXT_BACKEND = "pypdf2"
+
+# Backend whose output the quality comparison is measured against
+REFERENCE_TEXT_BACKEND = "pypdf2"
+
+# Selections per document (path, size, mtime), so every stage reading the same
+# file in this process uses the same backend even though timings fluctuate
+_selection_cache: Dict[Tuple[Any, ...], str] = {}
+_selection_cache_lock = threading.Lock()
+MAX_CACHED_SELECTIONS = 256
+
+
+class TextBackend:
+    """
+    Interface of a plain-text extraction backend for one PDF document.
+
+    Backends open the document lazily and must be closed after use.
+    """
+
+    name = "base"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check whether the backend's library can be used in this environment."""
+        return True
+
+    @property
+    def page_count(self) -> int:
+        raise NotImplementedError
+
+    def extract_page(self, page_index: int) -> str:
+        """Extract the text of a 0-indexed page."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the document."""
+
+    def __enter__(self) -> "TextBackend":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class PyPDF2Backend(TextBackend):
+    """Pure-Python text extraction with PyPDF2."""
+
+    name = "pypdf2"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self._file = None
+        self._reader: Optional[PyPDF2.PdfReader] = None
+
+    @property
+    def reader(self) -> PyPDF2.PdfReader:
+        if self._reader is None:
+            self._file = open(self.file_path, 'rb')
+            self._reader = PyPDF2.PdfReader(self._file)
+        return self._reader
+
+    @property
+    def page_count(self) -> int:
+        return len(self.reader.pages)
+
+    def extract_page(self, page_index: int) -> str:
+        return self.reader.pages[page_index].extract_text() or ""
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._reader = None
+
+
+class PdfplumberBackend(TextBackend):
+    """Layout-aware text extraction with pdfplumber (pdfminer.six)."""
+
+    name = "pdfplumber"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self._pdf = None
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.file_path)
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    def extract_page(self, page_index: int) -> str:
+        page = self.pdf.pages[page_index]
+        try:
+            return page.extract_text() or ""
+        finally:
+            page.flush_cache()
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+
+class PdfiumBackend(TextBackend):
+    """Native text extraction with pypdfium2 (PDFium), installed as a pdfplumber dependency."""
+
+    name = "pypdfium2"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self._document = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def document(self):
+        if self._document is None:
+            import pypdfium2
+            self._document = pypdfium2.PdfDocument(self.file_path)
+        return self._document
+
+    @property
+    def page_count(self) -> int:
+        return len(self.document)
+
+    def extract_page(self, page_index: int) -> str:
+        page = self.document[page_index]
+        text_page = page.get_textpage()
+        try:
+            # PDFium separates lines with CRLF; the other backends use LF
+            return text_page.get_text_range().replace("\r\n", "\n")
+        finally:
+            text_page.close()
+            page.close()
+
+    def close(self) -> None:
+        if self._document is not None:
+            self._document.close()
+            self._document = None
+
+
+TEXT_BACKENDS: Dict[str, Type[TextBackend]] = {
+    PyPDF2Backend.name: PyPDF2Backend,
+    PdfplumberBackend.name: PdfplumberBackend,
+    PdfiumBackend.name: PdfiumBackend
+}
+
+
+def available_text_backends() -> List[str]:
+    """Names of the text backends usable in this environment."""
+    return [name for name, backend in TEXT_BACKENDS.items() if backend.is_available()]
+
+
+def open_text_backend(name: str, file_path: str) -> TextBackend:
+    """
+    Open a text backend by name, falling back to PyPDF2 if it is unknown or unavailable.
+
+    Args:
+        name: Backend name (pypdf2, pdfplumber or pypdfium2)
+        file_path: Path to the PDF file
+
+    Returns:
+        An unopened backend instance for the document
+    """
+    backend = TEXT_BACKENDS.get(name)
+    if backend is None or not backend.is_available():
+        logger.warning(f"Text backend '{name}' is not available, using {DEFAULT_TEXT_BACKEND}")
+        backend = TEXT_BACKENDS[DEFAULT_TEXT_BACKEND]
+    return backend(file_path)
+
+
+def _sample_pages(page_count: int, sample_size: int) -> List[int]:
+    """Pick up to sample_size pages spread evenly over the document."""
+    if page_count <= sample_size:
+        return list(range(page_count))
+    step = page_count / sample_size
+    return [int(i * step) for i in range(sample_size)]
+
+
+def _similarity(text: str, reference: str) -> float:
+    """Word-level similarity between two extractions (1.0 is identical)."""
+    words, reference_words = text.split(), reference.split()
+    if not words and not reference_words:
+        return 1.0
+    return difflib.SequenceMatcher(None, words, reference_words, autojunk=False).ratio()
+
+
+def compare_text_backends(
+    file_path: str,
+    sample_size: int = 5,
+    backends: Optional[List[str]] = None
+) -> Tuple[Dict[str, Dict[str, Any]], List[int]]:
+    """
+    Compare speed and output quality of text backends on a sample of pages.
+
+    Quality is the word-level similarity to the reference backend (PyPDF2,
+    the historical extractor), averaged over the sampled pages.
+
+    Args:
+        file_path: Path to the PDF file
+        sample_size: Number of pages to sample, spread over the document
+        backends: Backends to compare (all available backends by default)
+
+    Returns:
+        Tuple of a dictionary per backend with seconds_per_page, chars,
+        empty_pages and similarity (or error if the backend failed), and the
+        0-indexed sample pages
+    """
+    backends = backends or available_text_backends()
+    if REFERENCE_TEXT_BACKEND not in backends:
+        backends = [REFERENCE_TEXT_BACKEND] + list(backends)
+
+    texts: Dict[str, List[str]] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    sample: List[int] = []
+
+    for name in backends:
+        try:
+            with open_text_backend(name, file_path) as backend:
+                if not sample:
+                    sample = _sample_pages(backend.page_count, sample_size)
+                start = time.perf_counter()
+                texts[name] = [backend.extract_page(i) for i in sample]
+                elapsed = time.perf_counter() - start
+            results[name] = {
+                "seconds_per_page": elapsed / max(len(sample), 1),
+                "chars": sum(len(text) for text in texts[name]),
+                "empty_pages": sum(1 for text in texts[name] if not text.strip())
+            }
+        except Exception as e:
+            logger.warning(f"Text backend {name} failed on {file_path}: {str(e)}")
+            results[name] = {"error": str(e)}
+
+    reference = texts.get(REFERENCE_TEXT_BACKEND)
+    for name, page_texts in texts.items():
+        if reference is not None:
+            scores = [_similarity(text, ref) for text, ref in zip(page_texts, reference)]
+            results[name]["similarity"] = sum(scores) / len(scores) if scores else 1.0
+
+    return results, sample
+
+
+def select_text_backend(
+    file_path: str,
+    sample_size: int = 3,
+    check_quality: bool = False,
+    min_similarity: float = 0.9
+) -> str:
+    """
+    Pick the fastest available text backend for a document.
+
+    The choice is remembered per file (path, size and modification time), so
+    repeated calls for the same document return the same backend.
+
+    Args:
+        file_path: Path to the PDF file
+        sample_size: Number of pages timed per backend
+        check_quality: Only consider backends whose output is at least
+            min_similarity similar to the reference backend on the sample
+        min_similarity: Minimum word-level similarity when check_quality is set
+
+    Returns:
+        Name of the selected backend
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, check_quality, min_similarity)
+    with _selection_cache_lock:
+        selected = _selection_cache.get(key)
+    if selected is not None:
+        return selected
+
+    selected = _select_fastest(file_path, sample_size, check_quality, min_similarity)
+    with _selection_cache_lock:
+        if len(_selection_cache) >= MAX_CACHED_SELECTIONS:
+            _selection_cache.pop(next(iter(_selection_cache)))
+        _selection_cache[key] = selected
+    return selected
+
+
+def _select_fastest(file_path: str, sample_size: int, check_quality: bool, min_similarity: float) -> str:
+    """Time the available backends on sample pages and return the fastest acceptable one."""
+    comparison, _ = compare_text_backends(file_path, sample_size=sample_size)
+
+    candidates = []
+    for name, result in comparison.items():
+        if "error" in result:
+            continue
+        if check_quality and result.get("similarity", 0.0) < min_similarity:
+            logger.info(f"Text backend {name} rejected: similarity {result.get('similarity', 0.0):.2f}")
+            continue
+        candidates.append((result["seconds_per_page"], name))
+
+    if not candidates:
+        return DEFAULT_TEXT_BACKEND
+
+    seconds_per_page, name = min(candidates)
+    logger.info(f"Selected text backend {name} for {file_path} ({seconds_per_page * 1000:.1f} ms/page)")
+    return name
@@ -0,0 +1,183 @@
+import os
+import json
+import math
+import logging
+import unicodedata
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Words longer than this are counted as several tokens by the word estimate
+LONG_WORD_CHARS = 20
+
+# Distinct words whose vocabulary token count is remembered
+WORD_CACHE_SIZE = 100_000
+
+
+class TokenCounter:
+    """
+    Count model tokens word by word, so chunkers can count incrementally.
+
+    Subclasses return the number of tokens of a single whitespace-free word
+    and the word-level budget that fits a model token limit.
+    """
+
+    name = "base"
+
+    # Typical characters of text per counted unit, used to size chunk windows
+    chars_per_unit = 6
+
+    def count(self, word: str) -> int:
+        """Get the number of tokens of one word."""
+        raise NotImplementedError
+
+    def cumulative(self, words: List[str]) -> List[int]:
+        """Get the running token totals of a list of words."""
+        return list(accumulate(map(self.count, words)))
+
+    def budget(self, max_tokens: int) -> int:
+        """Get the sum of word counts that fits in max_tokens model tokens."""
+        raise NotImplementedError
+
+
+class WordEstimateCounter(TokenCounter):
+    """
+    The conservative estimate of nlp_utils.estimate_tokens, counted per word.
+
+    Every word counts once (very long words, such as URLs or run-together
+    table rows, count once per LONG_WORD_CHARS characters), and the budget is
+    the largest word count whose estimate stays within the token limit, so a
+    chunk packed to the budget never exceeds estimate_tokens(chunk) <= max_tokens.
+    """
+
+    name = "estimate"
+    chars_per_unit = 8
+
+    def count(self, word: str) -> int:
+        return 1 if len(word) <= LONG_WORD_CHARS else -(-len(word) // LONG_WORD_CHARS)
+
+    def cumulative(self, words: List[str]) -> List[int]:
+        if max(map(len, words), default=0) <= LONG_WORD_CHARS:
+            # Every word counts once
+            return list(range(1, len(words) + 1))
+        return super().cumulative(words)
+
+    def budget(self, max_tokens: int) -> int:
+        words = max(int(max_tokens / 1.43) + 2, 1)
+        while words > 1 and math.ceil(math.ceil(words * 1.3) * 1.1) > max_tokens:
+            words -= 1
+        return words
+
+
+class VocabTokenCounter(TokenCounter):
+    """
+    Count WordPiece tokens with a local tokenizer vocabulary (no model download).
+
+    Reads a BERT-style vocab.txt (one token per line) or the vocabulary of a
+    WordPiece tokenizer.json, and counts tokens with the same greedy
+    longest-match-first split WordPiece tokenizers use. Counts are cached per
+    distinct word, so each word of a report is tokenized about once.
+    """
+
+    name = "vocab"
+
+    def __init__(self, vocab_path: str, lowercase: bool = True, special_tokens: int = 2):
+        """
+        Args:
+            vocab_path: Path to vocab.txt or tokenizer.json
+            lowercase: Lowercase and strip accents first (uncased models)
+            special_tokens: Tokens the model adds to every input ([CLS], [SEP])
+        """
+        self.vocab_path = vocab_path
+        self.vocab = self._load_vocab(vocab_path)
+        self.lowercase = lowercase
+        self.special_tokens = special_tokens
+        self.max_piece_chars = max((len(token) for token in self.vocab), default=1)
+        self._word_cache: Dict[str, int] = {}
+
+    @staticmethod
+    def _load_vocab(vocab_path: str) -> set:
+        with open(vocab_path, "r", encoding="utf-8") as f:
+            if vocab_path.endswith(".json"):
+                vocab = json.load(f).get("model", {}).get("vocab", {})
+                return set(vocab if isinstance(vocab, dict) else (token for token, _ in vocab))
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    def count(self, word: str) -> int:
+        tokens = self._word_cache.get(word)
+        if tokens is None:
+            tokens = sum(self._count_piece(piece) for piece in self._pre_tokenize(word))
+            if len(self._word_cache) >= WORD_CACHE_SIZE:
+                self._word_cache.clear()
+            self._word_cache[word] = tokens
+        return tokens
+
+    def budget(self, max_tokens: int) -> int:
+        return max(max_tokens - self.special_tokens, 1)
+
+    def _pre_tokenize(self, word: str) -> List[str]:
+        """Split a word at punctuation like BERT's basic tokenizer."""
+        if self.lowercase:
+            word = "".join(
+                c for c in unicodedata.normalize("NFD", word.lower()) if unicodedata.category(c) != "Mn"
+            )
+        pieces = []
+        current = ""
+        for c in word:
+            if unicodedata.category(c).startswith("P") or (c.isascii() and not c.isalnum()):
+                if current:
+                    pieces.append(current)
+                pieces.append(c)
+                current = ""
+            else:
+                current += c
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _count_piece(self, piece: str) -> int:
+        """Count the WordPiece tokens of a punctuation-free piece (1 if it cannot be split)."""
+        tokens = 0
+        start = 0
+        while start < len(piece):
+            end = min(len(piece), start + self.max_piece_chars)
+            while end > start:
+                candidate = piece[start:end] if start == 0 else "##" + piece[start:end]
+                if candidate in self.vocab:
+                    break
+                end -= 1
+            if end == start:
+                # Unknown piece: the whole word becomes a single [UNK]
+                return 1
+            tokens += 1
+            start = end
+        return tokens
+
+
+_counters: Dict[Optional[str], TokenCounter] = {}
+
+
+def get_token_counter(vocab_path: Optional[str] = None) -> TokenCounter:
+    """
+    Get the token counter used for chunking (one instance per vocabulary).
+
+    Args:
+        vocab_path: Local tokenizer vocabulary (defaults to the TOKENIZER_VOCAB_PATH
+            environment variable); the word estimate is used without one
+
+    Returns:
+        TokenCounter instance
+    """
+    vocab_path = vocab_path if vocab_path is not None else os.getenv("TOKENIZER_VOCAB_PATH") or None
+    counter = _counters.get(vocab_path)
+    if counter is None:
+        counter = WordEstimateCounter()
+        if vocab_path:
+            try:
+                counter = VocabTokenCounter(vocab_path)
+                logger.info(f"Counting chunk tokens with {len(counter.vocab)}-token vocabulary {vocab_path}")
+            except Exception as e:
+                logger.warning(f"Could not load tokenizer vocabulary {vocab_path}, using word estimate: {str(e)}")
+        _counters[vocab_path] = counter
+    return counter
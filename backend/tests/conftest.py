@@ -0,0 +1,32 @@
+import os
+import sys
+import shutil
+import tempfile
+import pytest
+
+# Set before the application modules are imported: they read these at import time.
+# The tests get a database and log directory of their own instead of the bundled
+# annual_reports.db and ./backend/logs
+_test_dir = tempfile.mkdtemp(prefix="annual-report-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_test_dir, 'annual_reports.db')}"
+os.environ["LOG_DIR"] = os.path.join(_test_dir, "logs")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_test_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch, tmp_path):
+    """Keep tests from reading or writing the inference and extraction caches under ./cache."""
+    monkeypatch.setenv("INFERENCE_CACHE_ENABLED", "false")
+    monkeypatch.setenv("INFERENCE_CACHE_PATH", str(tmp_path / "inference.sqlite3"))
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(tmp_path / "extraction"))
+
+    # The services are imported both as services.* and backend.services.*
+    for name in ("services.inference_cache", "backend.services.inference_cache"):
+        module = sys.modules.get(name)
+        if module is not None:
+            monkeypatch.setattr(module, "_default_cache", None)
+            monkeypatch.setattr(module, "_default_cache_loaded", False)
+    yield
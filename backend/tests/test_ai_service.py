@@ -1,5 +1,6 @@
 import pytest
 import os
+import time
 from unittest.mock import patch, MagicMock
 from services.ai_service import AIService
 
@@ -174,4 +175,492 @@ class TestAIService:
         
         # Verify error handling
         assert result["status"] == "error"
-        assert "message" in result 
\ No newline at end of file
+        assert "message" in result 
+
+class TestHuggingFaceChunkPlan:
+    """Tests for the chunk plan shared by the HuggingFace tasks."""
+    
+    def test_tasks_share_one_chunk_plan(self, monkeypatch):
+        """Tasks run on the Document's cached chunk plans, one per input limit, instead of re-chunking."""
+        from services import nlp_utils
+        from services.document import Document
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        service = HuggingFaceService()
+        service.chunk_size, service.overlap_size = 1000, 100
+        
+        inputs = []
+        def mock_api(model_name, task, inputs_text, **kwargs):
+            inputs.append(inputs_text)
+            return service._get_mock_response(model_name, task, inputs_text)
+        async def mock_api_async(model_name, task, inputs_text, **kwargs):
+            return mock_api(model_name, task, inputs_text)
+        monkeypatch.setattr(service, "_call_inference_api",
+                            lambda model_name, task, inputs, **kwargs: mock_api(model_name, task, inputs))
+        monkeypatch.setattr(service, "_call_inference_api_async",
+                            lambda model_name, task, inputs, **kwargs: mock_api_async(model_name, task, inputs))
+        
+        service.batch_max_items = 4
+        document = Document(SAMPLE_FINANCIAL_TEXT * 20)
+        with patch.object(nlp_utils, "plan_chunks", wraps=nlp_utils.plan_chunks) as plan_chunks:
+            assert service.analyze_sentiment(document)["method"] == "finbert"
+            service.extract_entities(document)
+            service.analyze_risk(document)
+            service.generate_summary(document, engine="model")
+        
+        # One plan for the 512-token classification models, one for the generation models
+        assert plan_chunks.call_count == 2
+        chunks = nlp_utils.chunk_text(document.text, 1000, 100, service.classification_max_tokens)
+        assert len(chunks) > 5
+        # Sentiment and entities each send all chunks, in batched requests of up to 4
+        batches = [chunks[i:i + 4] if len(chunks[i:i + 4]) > 1 else chunks[i] for i in range(0, len(chunks), 4)]
+        assert inputs[:2 * len(batches)] == batches + batches
+
+
+    def test_classification_chunks_fit_bert_limit(self, monkeypatch, tmp_path):
+        """Sentiment and NER chunks stay within 512 WordPiece tokens, also for number-heavy text."""
+        import string
+        from services import nlp_utils
+        from services.document import Document
+        from services.huggingface_service import HuggingFaceService
+        from services.token_counter import VocabTokenCounter
+        
+        # Whole words for the prose; numbers and punctuation split into single characters
+        characters = string.ascii_lowercase + string.digits
+        vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "$", ",", ".", "%", "-", "(", ")"]
+        vocab += list(characters) + ["##" + c for c in characters]
+        vocab += "revenue was million up from net income operating margin the company reported".split()
+        vocab_path = tmp_path / "vocab.txt"
+        vocab_path.write_text("\n".join(vocab))
+        counter = VocabTokenCounter(str(vocab_path))
+        monkeypatch.setattr(nlp_utils, "get_token_counter", lambda *args: counter)
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.delenv("CHUNK_SIZE", raising=False)
+        service = HuggingFaceService()
+        text = " ".join(
+            f"Revenue was ${1000 + i},{i % 10}02.2 million, up {i % 9}.4% from ${969 + i}.1 million "
+            f"(net income ${i}3,4{i % 7}1.8 million, operating margin {i % 30}.5%)."
+            for i in range(400)
+        )
+        document = Document(text)
+        for chunk_chars in (service.classification_chunk_chars, None):
+            service.classification_chunk_chars = chunk_chars
+            plan = service._chunk_plan(document, "text-classification")
+            assert service._chunk_plan(document, "token-classification") is plan
+            assert len(plan) > 10
+            for start, end in plan:
+                tokens = sum(counter.count(word) for word in text[start:end].split()) + counter.special_tokens
+                assert tokens <= 512
+        
+        # Generation models keep their larger chunks
+        assert len(service._chunk_plan(document)) < len(plan)
+
+
+class TestHuggingFaceConcurrency:
+    """Tests for the concurrent chunk fan-out of the HuggingFace tasks."""
+    
+    def test_chunks_fan_out_within_model_limits(self, monkeypatch):
+        """Chunk requests run concurrently up to the model's limit, results keep chunk order."""
+        import threading
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.setenv("HF_MODEL_CONCURRENCY", "ProsusAI/finbert=3")
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = None
+        monkeypatch.setattr(service, "_retry_wait_time", lambda attempts: 0.05)
+        
+        lock = threading.Lock()
+        in_flight = {"now": 0, "max": 0}
+        attempts_by_chunk = {}
+        def mock_attempt(model_name, task, inputs, attempts, max_retries, kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                attempts_by_chunk[inputs] = attempts
+            time.sleep(0.1)
+            with lock:
+                in_flight["now"] -= 1
+            if inputs == "chunk 0" and attempts == 1:
+                return False, None, inputs  # Fails once, retried without blocking the others
+            return True, [{"label": "positive", "score": float(inputs[-1])}], inputs
+        monkeypatch.setattr(service, "_inference_attempt", mock_attempt)
+        
+        chunks = [f"chunk {i}" for i in range(6)]
+        started = time.perf_counter()
+        results = service._map_chunks(service.finbert_model, "text-classification", chunks)
+        elapsed = time.perf_counter() - started
+        
+        assert [result[0]["score"] for result in results] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert attempts_by_chunk["chunk 0"] == 2
+        assert in_flight["max"] == 3
+        # 7 calls of 0.1s, 3 at a time; serially they would take 0.7s
+        assert elapsed < 0.6
+    
+    def test_request_limits_hold_across_concurrent_calls(self, monkeypatch):
+        """Reports analyzed at the same time share the request limits instead of each getting their own."""
+        import threading
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.setenv("HF_MODEL_CONCURRENCY", "ProsusAI/finbert=2")
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = None
+        
+        lock = threading.Lock()
+        in_flight = {"now": 0, "max": 0}
+        def mock_attempt(model_name, task, inputs, attempts, max_retries, kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.05)
+            with lock:
+                in_flight["now"] -= 1
+            return True, [{"label": "positive", "score": 1.0}], inputs
+        monkeypatch.setattr(service, "_inference_attempt", mock_attempt)
+        
+        results = []
+        def analyze(report):
+            chunks = [f"report {report} chunk {i}" for i in range(4)]
+            results.append(service._map_chunks(service.finbert_model, "text-classification", chunks))
+        threads = [threading.Thread(target=analyze, args=(report,)) for report in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(results) == 3 and all(len(result) == 4 for result in results)
+        assert in_flight["max"] == 2
+    
+    def test_classification_chunks_are_batched(self, monkeypatch):
+        """Sentiment chunks go out in batched requests; a batch rejected as too large is split."""
+        from json import dumps
+        from huggingface_hub.errors import HTTPError
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = None
+        service.batch_max_items = 8
+        
+        batch_sizes = []
+        class FakeClient:
+            def post(self, json=None, model=None, task=None):
+                batch = json["inputs"]
+                batch_sizes.append(len(batch))
+                if len(batch) > 3:
+                    error = HTTPError("Payload Too Large")
+                    error.response = MagicMock(status_code=413)
+                    raise error
+                return dumps([
+                    [{"label": "positive", "score": float(item.split()[-1])}] for item in batch
+                ]).encode()
+        service.inference_client = FakeClient()
+        
+        chunks = [f"chunk {i}" for i in range(10)]
+        results = service._map_chunks_batched(service.finbert_model, "text-classification", chunks)
+        
+        assert [result[0]["score"] for result in results] == [float(i) for i in range(10)]
+        # Batches of 8 and 2; the 8 is rejected, so are its halves of 4, their halves of 2 pass
+        assert sorted(batch_sizes) == [2, 2, 2, 2, 2, 4, 4, 8]
+        assert service._batch_item_limits[service.finbert_model] == 2
+        assert service._plan_batches(service.finbert_model, chunks) == [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+    
+    def test_inference_results_are_cached(self, monkeypatch, tmp_path):
+        """Repeated chunks are answered from the cache, per batch item and across processes."""
+        from services.huggingface_service import HuggingFaceService
+        from services.inference_cache import InferenceCache
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = InferenceCache(str(tmp_path / "inference.sqlite3"), memory_entries=2)
+        
+        sent = []
+        def mock_send(model_name, task, inputs, kwargs):
+            sent.append(inputs)
+            return [[{"label": "positive", "score": float(item[-1])}] for item in inputs]
+        monkeypatch.setattr(service, "_send_request", mock_send)
+        
+        chunks = [f"chunk {i}" for i in range(4)]
+        first = service._map_chunks_batched(service.finbert_model, "text-classification", chunks)
+        again = service._map_chunks_batched(service.finbert_model, "text-classification", chunks + ["chunk 5"])
+        assert again[:4] == first
+        assert sent == [chunks, ["chunk 5"]]
+        
+        # A new process only has the SQLite tier; an expired entry is a miss
+        reopened = InferenceCache(str(tmp_path / "inference.sqlite3"), ttl_seconds=3600)
+        assert reopened.get(service.finbert_model, "text-classification", {}, "chunk 2") == [
+            {"label": "positive", "score": 2.0}
+        ]
+        assert reopened.get(service.finbert_model, "text-classification", {"top_k": 1}, "chunk 2") is None
+        stats = service.inference_cache.get_stats()
+        assert stats["disk_entries"] == 5 and stats["memory_entries"] == 2
+        assert stats["memory_hits"] + stats["disk_hits"] == 4 and stats["misses"] == 5
+        
+        expired = InferenceCache(str(tmp_path / "inference.sqlite3"), ttl_seconds=1e-9)
+        assert expired.get(service.finbert_model, "text-classification", {}, "chunk 2") is None
+        assert expired.get_stats()["expired"] == 1
+
+
+class TestInferenceCircuitBreaker:
+    """Tests for the per-model circuit breakers of the HuggingFace calls."""
+    
+    def test_open_circuit_skips_retries_and_uses_fallbacks(self, monkeypatch):
+        """Consecutive timeouts open a model's circuit; calls then go to the fallback until a probe succeeds."""
+        from huggingface_hub import InferenceTimeoutError
+        from services import resilience
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.setenv("HF_CIRCUIT_FAILURE_THRESHOLD", "2")
+        monkeypatch.setenv("HF_CIRCUIT_RESET_SECONDS", "0.2")
+        monkeypatch.setattr(resilience, "_circuit_breakers", {})
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = None
+        monkeypatch.setattr(service, "_retry_wait_time", lambda attempts: 0)
+        
+        sent = []
+        down = {service.finbert_model, service.summarization_model}
+        def mock_send(model_name, task, inputs, kwargs):
+            sent.append(model_name)
+            if model_name in down:
+                raise InferenceTimeoutError("timed out")
+            return {"summary_text": f"summary by {model_name}"}
+        monkeypatch.setattr(service, "_send_request", mock_send)
+        
+        # Two timeouts open the circuit, the third attempt is not sent; without a fallback model the caller gets an error
+        with pytest.raises(resilience.CircuitOpenError):
+            service._call_inference_api(service.finbert_model, "text-classification", "text", max_retries=3)
+        assert sent == [service.finbert_model] * 2
+        with pytest.raises(resilience.CircuitOpenError):
+            service._call_inference_api(service.finbert_model, "text-classification", "text")
+        assert len(sent) == 2
+        # Sentiment falls back to the local analysis without sending anything
+        assert service.analyze_sentiment("Revenue grew strongly.")["method"] != "finbert"
+        assert len(sent) == 2
+        
+        # A summarization model with an open circuit is skipped for its fallback model
+        for _ in range(2):
+            service._call_inference_api(service.summarization_model, "summarization", "text", max_retries=1)
+        sent.clear()
+        result = service._call_inference_api(service.summarization_model, "summarization", "text")
+        assert result == {"summary_text": f"summary by {service.fallback_summarization_model}"}
+        assert sent == [service.fallback_summarization_model]
+        
+        # After the reset timeout one probe goes through; its success closes the circuit
+        down.clear()
+        time.sleep(0.25)
+        sent.clear()
+        result = service._call_inference_api(service.summarization_model, "summarization", "text")
+        assert sent == [service.summarization_model]
+        stats = resilience.get_circuit_stats()[service.summarization_model]
+        assert stats["state"] == "closed" and stats["times_opened"] == 1 and stats["rejected"] == 1
+        assert [t["to"] for t in stats["transitions"]] == ["open", "half_open", "closed"]
+    
+    def test_errors_never_count_as_success(self, monkeypatch):
+        """A probe that fails with an unexpected error opens the circuit again; rejected requests do not close it."""
+        from huggingface_hub import InferenceTimeoutError
+        from huggingface_hub.errors import HTTPError
+        from services import resilience
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.setenv("HF_CIRCUIT_FAILURE_THRESHOLD", "1")
+        monkeypatch.setenv("HF_CIRCUIT_RESET_SECONDS", "0.1")
+        monkeypatch.setattr(resilience, "_circuit_breakers", {})
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = None
+        monkeypatch.setattr(service, "_retry_wait_time", lambda attempts: 0)
+        
+        errors = [InferenceTimeoutError("timed out")]
+        def mock_send(model_name, task, inputs, kwargs):
+            raise errors[0]
+        monkeypatch.setattr(service, "_send_request", mock_send)
+        breaker = resilience.get_circuit_breaker(service.summarization_model)
+        
+        service._call_inference_api(service.summarization_model, "summarization", "text", max_retries=1)
+        assert breaker.state == "open"
+        
+        # The probe fails with an unexpected error: the circuit opens again
+        errors[0] = RuntimeError("malformed response")
+        time.sleep(0.15)
+        service._call_inference_api(service.summarization_model, "summarization", "text", max_retries=1)
+        assert breaker.state == "open" and breaker.successes == 0
+        
+        # A probe the endpoint rejects leaves the circuit half-open
+        errors[0] = HTTPError("Bad Request")
+        errors[0].response = MagicMock(status_code=400)
+        time.sleep(0.15)
+        service._call_inference_api(service.summarization_model, "summarization", "text", max_retries=1)
+        assert breaker.state == "half_open" and breaker.successes == 0
+    
+    def test_risk_analysis_retries_without_blocking(self, monkeypatch):
+        """Risk analysis retries through the async path, which waits with asyncio.sleep."""
+        from huggingface_hub import InferenceTimeoutError
+        from services import resilience, huggingface_service
+        from services.huggingface_service import HuggingFaceService
+        
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.setattr(resilience, "_circuit_breakers", {})
+        service = HuggingFaceService()
+        service.is_api_key_valid = True
+        service.inference_cache = None
+        monkeypatch.setattr(service, "_retry_wait_time", lambda attempts: 0.01)
+        def blocking_sleep(seconds):
+            raise AssertionError("time.sleep between retries")
+        monkeypatch.setattr(huggingface_service.time, "sleep", blocking_sleep)
+        
+        attempts = []
+        def mock_send(model_name, task, inputs, kwargs):
+            attempts.append(model_name)
+            if len(attempts) == 1:
+                raise InferenceTimeoutError("timed out")
+            return {"generated_text": "Currency risk\nInterest rate risk"}
+        monkeypatch.setattr(service, "_send_request", mock_send)
+        
+        result = service.analyze_risk(SAMPLE_FINANCIAL_TEXT)
+        assert result["method"] == "t5"
+        assert result["risks"] == ["Currency risk", "Interest rate risk"]
+        assert attempts == [service.t5_model] * 2
+
+
+class TestServiceRegistry:
+    """Tests for the shared services and their lazy credential validation."""
+    
+    def test_services_are_shared_and_validate_lazily(self, monkeypatch):
+        """Services are built once per process; the API key is validated on first use and the result cached."""
+        from services import service_registry
+        from services.huggingface_service import HuggingFaceService
+        from services.service_registry import CredentialCheck
+        
+        monkeypatch.setenv("HUGGINGFACE_API_KEY", "test_api_key")
+        monkeypatch.setattr(service_registry, "_services", {})
+        checks = []
+        def mock_validate(self):
+            checks.append(type(self).__name__)
+            return True
+        monkeypatch.setattr(HuggingFaceService, "_validate_api_key", mock_validate)
+        monkeypatch.setattr(AIService, "_validate_api_key", mock_validate)
+        
+        ai_service = service_registry.get_ai_service()
+        assert service_registry.get_ai_service() is ai_service
+        assert ai_service.huggingface_service is service_registry.get_huggingface_service()
+        assert checks == []
+        
+        assert ai_service.is_api_key_valid and ai_service.is_api_key_valid
+        assert ai_service.huggingface_service.resolve_summary_engine("auto") == "model"
+        assert ai_service.huggingface_service.is_api_key_valid
+        assert checks == ["AIService", "HuggingFaceService"]
+        
+        # Failed validations expire after their own TTL; exceptions count as invalid
+        outcomes = [RuntimeError("network down"), True]
+        def check():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        credential_check = CredentialCheck("test", check, ttl_seconds=60, failure_ttl_seconds=0.05)
+        assert not credential_check.is_valid
+        assert not credential_check.is_valid
+        time.sleep(0.06)
+        assert credential_check.is_valid
+        assert outcomes == []
+
+
+def save_tiny_models(model_dir, vocabulary):
+    """Save tiny randomly initialized FinBERT, NER and summarization models (and a tokenizer) under model_dir."""
+    transformers = pytest.importorskip("transformers")
+    pytest.importorskip("torch")
+    
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + vocabulary))
+    tokenizer = transformers.BertTokenizerFast(str(vocab_file))
+    tokenizer.model_max_length = 64
+    bert = dict(vocab_size=len(tokenizer), hidden_size=16, num_hidden_layers=1, num_attention_heads=2,
+                intermediate_size=32, max_position_embeddings=64)
+    models = {
+        "ProsusAI/finbert": transformers.BertForSequenceClassification(transformers.BertConfig(
+            **bert, id2label={0: "positive", 1: "negative", 2: "neutral"}
+        )),
+        "dslim/bert-base-NER": transformers.BertForTokenClassification(transformers.BertConfig(
+            **bert, id2label={0: "O", 1: "B-ORG", 2: "I-ORG"}
+        )),
+        "facebook/bart-large-xsum": transformers.BartForConditionalGeneration(transformers.BartConfig(
+            vocab_size=len(tokenizer), d_model=16, encoder_layers=1, decoder_layers=1, encoder_attention_heads=2,
+            decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32, max_position_embeddings=64,
+            pad_token_id=0, bos_token_id=2, eos_token_id=3, decoder_start_token_id=2, forced_eos_token_id=None
+        ))
+    }
+    for model_name, model in models.items():
+        model.save_pretrained(model_dir / model_name)
+        tokenizer.save_pretrained(model_dir / model_name)
+
+
+class TestLocalInferenceBackend:
+    """Tests for running the HuggingFace tasks on the local CPU backend."""
+    
+    def test_local_tasks_run_in_process(self, monkeypatch, tmp_path):
+        """Tasks set to the local backend run tiny local models, batched and without the hosted API."""
+        from services import inference_backends
+        from services.huggingface_service import HuggingFaceService
+        from services.inference_backends import LocalInferenceBackend
+        
+        words = "the company revenue grew strongly while costs declined across all markets".split()
+        save_tiny_models(tmp_path, words)
+        monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+        monkeypatch.setenv("LOCAL_MODEL_DIR", str(tmp_path))
+        monkeypatch.setenv("INFERENCE_TASK_BACKENDS",
+                           "text-classification=local,token-classification=local,summarization=local")
+        monkeypatch.setattr(inference_backends, "_local_backend", LocalInferenceBackend(batch_size=2))
+        service = HuggingFaceService()
+        service.inference_cache = None
+        service.inference_client = MagicMock()
+        
+        assert service.task_backend("summarization") == "local"
+        assert service.task_backend("text-generation") == "remote"
+        assert service.warm_up_local_models() == {
+            "text-classification": True, "token-classification": True, "summarization": True
+        }
+        
+        chunks = [" ".join(words[i:] + words[:i]) for i in range(5)]
+        results = service._map_chunks_batched(service.finbert_model, "text-classification", chunks)
+        assert len(results) == 5
+        for result in results:
+            assert sorted(item["label"] for item in result) == ["negative", "neutral", "positive"]
+            assert abs(sum(item["score"] for item in result) - 1.0) < 1e-4
+        
+        entities = service._call_inference_api(service.ner_model, "token-classification", chunks[:2])
+        assert len(entities) == 2 and all(isinstance(item, list) for item in entities)
+        
+        summary = service._call_inference_api(
+            service.summarization_model, "summarization", chunks[0], max_new_tokens=5, min_length=1
+        )
+        assert isinstance(summary["summary_text"], str)
+        # Models stay loaded for later reports; nothing went to the hosted API
+        assert len(service.inference_backends["local"].loaded_models()) == 3
+        assert service.inference_client.method_calls == []
+    
+    def test_int8_quantized_weights(self, tmp_path):
+        """Quantized models give results close to the full-precision model."""
+        from services.inference_backends import LocalInferenceBackend
+        
+        words = "profit fell sharply after the impairment charge".split()
+        save_tiny_models(tmp_path, words)
+        text = " ".join(words)
+        full = LocalInferenceBackend(model_dir=str(tmp_path)).infer("ProsusAI/finbert", "text-classification", text, {})
+        int8 = LocalInferenceBackend(model_dir=str(tmp_path), quantize="int8").infer(
+            "ProsusAI/finbert", "text-classification", text, {}
+        )
+        full_scores = {item["label"]: item["score"] for item in full}
+        assert all(abs(full_scores[item["label"]] - item["score"]) < 0.05 for item in int8)
+        
+        with pytest.raises(FileNotFoundError):
+            LocalInferenceBackend(model_dir=str(tmp_path)).infer("missing/model", "text-classification", text, {})
@@ -1,6 +1,18 @@
+import io
+import os
+import asyncio
+import hashlib
 import pytest
+from fastapi import UploadFile
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
 from backend.main import app
+from backend.services.file_service import FileService, UploadRejectedError
+from backend.services.db_service import DBService
+from backend.models.database import Base, Company, Report, Metric, Summary
+from backend.models.schemas import ReportCreate
+from backend.models.migrate_report_content_hash import migrate_database as migrate_report_content_hash
 
 client = TestClient(app)
 
@@ -23,4 +35,96 @@ def test_dashboard_summary():
     data = response.json()
     assert "report_count" in data
     assert "company_count" in data
-    assert "latest_upload_date" in data 
\ No newline at end of file
+    assert "latest_upload_date" in data 
+
+def _upload(content: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename="report.pdf")
+
+def test_stream_upload_hashes_and_saves(tmp_path):
+    """Uploads are streamed to disk in chunks and hashed on the way."""
+    content = b"%PDF-1.7\n" + b"x" * 10000
+    destination = tmp_path / "report.pdf"
+    
+    result = asyncio.run(FileService.stream_upload(_upload(content), str(destination), chunk_size=1024))
+    
+    assert destination.read_bytes() == content
+    assert result["size"] == len(content)
+    assert result["sha256"] == hashlib.sha256(content).hexdigest()
+    assert os.listdir(tmp_path) == ["report.pdf"]
+
+@pytest.mark.parametrize("content, status_code", [
+    (b"", 400),
+    (b"<html>not a pdf</html>", 400),
+    (b"%PDF-1.7\n" + b"x" * 5000, 413)
+])
+def test_stream_upload_rejections(tmp_path, content, status_code):
+    """Empty, non-PDF and oversized uploads are rejected without leaving files behind."""
+    destination = tmp_path / "report.pdf"
+    
+    with pytest.raises(UploadRejectedError) as error:
+        asyncio.run(FileService.stream_upload(_upload(content), str(destination), max_bytes=4096, chunk_size=1024))
+    
+    assert error.value.status_code == status_code
+    assert os.listdir(tmp_path) == []
+
+@pytest.fixture
+def db_session():
+    """Session on a fresh in-memory database."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def test_duplicate_upload_clones_analysis(db_session):
+    """A completed report is found by content hash and its analysis copied onto a new report."""
+    company = Company(name="Acme")
+    db_session.add(company)
+    db_session.commit()
+    
+    failed = Report(company_id=company.id, year="2023", file_path="a.pdf", file_name="a.pdf",
+                    processing_status="failed", content_hash="abc")
+    source = Report(company_id=company.id, year="2023", file_path="b.pdf", file_name="b.pdf",
+                    processing_status="completed", content_hash="abc", page_count=12)
+    source.metrics.append(Metric(name="Revenue", value="10500", unit="$", category="financial"))
+    source.summaries.append(Summary(category="executive", content="Strong year."))
+    db_session.add_all([failed, source])
+    db_session.commit()
+    
+    assert DBService.get_report_by_content_hash(db_session, "abc").id == source.id
+    assert DBService.get_report_by_content_hash(db_session, "other") is None
+    
+    target = DBService.create_report(db_session, ReportCreate(
+        company_id=company.id, year="2024", file_name="c.pdf", file_path="c.pdf", content_hash="abc"
+    ))
+    cloned = DBService.clone_report_analysis(db_session, source.id, target.id)
+    
+    assert cloned.processing_status == "completed"
+    assert cloned.page_count == 12
+    assert [(m.name, m.value) for m in cloned.metrics] == [("Revenue", "10500")]
+    assert [s.content for s in cloned.summaries] == ["Strong year."]
+
+def test_content_hash_migration(tmp_path):
+    """The migration adds the indexed content_hash column to an existing reports table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE reports (id INTEGER PRIMARY KEY, company_id INTEGER, year VARCHAR(4), "
+            "file_path VARCHAR(255), file_name VARCHAR(255))"
+        ))
+        conn.execute(text("INSERT INTO reports VALUES (1, 1, '2023', 'missing.pdf', 'missing.pdf')"))
+    
+    assert migrate_report_content_hash(engine)
+    assert migrate_report_content_hash(engine)  # idempotent
+    
+    inspector = inspect(engine)
+    assert "content_hash" in [column["name"] for column in inspector.get_columns("reports")]
+    assert "ix_reports_content_hash" in [index["name"] for index in inspector.get_indexes("reports")]
+
+def test_api_import_skips_heavy_modules():
+    """Importing the API stays within its import-time budget: no heavy ML or dataframe libraries."""
+    from backend.benchmarks.bench_startup import measure_imports
+    
+    seconds, cumulative, heavy = measure_imports("api.routes")
+    assert "api.routes" in cumulative
+    assert heavy == []
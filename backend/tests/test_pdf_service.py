@@ -1,7 +1,36 @@
 import os
+import re
 import pytest
+import shutil
 import tempfile
+import PyPDF2
+import numpy as np
 from backend.services.pdf_service import PDFService
+from backend.services.page_store import PageStore
+from backend.services.extraction_cache import ExtractionCache
+from backend.services.page_scorer import score_page, is_table_candidate, find_financial_table_pages
+from backend.services.table_extraction import TableExtractor, get_engine_stats
+from backend.services.text_backends import (
+    available_text_backends, open_text_backend, compare_text_backends, select_text_backend
+)
+from backend.services.pdf_outline import (
+    get_page_labels,
+    locate_financial_sections_from_outline,
+    resolve_printed_page
+)
+from backend.utils.sample_pdf import write_sample_pdf, build_synthetic_report
+from backend.services.nlp_utils import (
+    chunk_text, plan_chunks, estimate_tokens, extract_risk_factors_with_regex,
+    fallback_sentiment_analysis
+)
+from backend.services.token_counter import VocabTokenCounter
+from backend.services.document import Document
+from backend.services.metric_scanner import (
+    MetricScanner, load_metric_definitions, as_document, DEFAULT_METRIC_DEFINITIONS
+)
+from backend.services.section_index import SectionIndex, get_section_index, Document as SectionDocument
+from backend.services.lexicon_sentiment import get_lexicon_sentiment_analyzer, sentiment_distribution
+from backend.services.extractive_summarizer import ExtractiveSummarizer
 
 # Initialize the service
 pdf_service = PDFService()
@@ -54,4 +83,448 @@ def test_save_upload():
     finally:
         # Clean up
         if os.path.exists(temp_path):
-            os.unlink(temp_path) 
\ No newline at end of file
+            os.unlink(temp_path)
+
+@pytest.fixture
+def sample_pdf_path(tmp_path):
+    """Write a small synthetic annual report to a temporary file."""
+    return write_sample_pdf(str(tmp_path / "report.pdf"), build_synthetic_report(12))
+
+def test_page_store_parses_each_page_once(sample_pdf_path):
+    """Repeated access to a page should not re-parse it."""
+    with PageStore(sample_pdf_path) as page_store:
+        first = page_store.get_text(3)
+        second = page_store.get_text(3)
+        assert first == second
+        assert page_store.text_pages_parsed == 1
+        
+        page_store.get_tables(10)
+        page_store.get_tables(10)
+        assert page_store.table_pages_parsed == 1
+        
+        # Full text only parses the pages that have not been seen yet
+        page_store.get_full_text()
+        assert page_store.text_pages_parsed == page_store.page_count
+
+def test_extract_text_from_pdf_with_page_store(sample_pdf_path):
+    """Text served from a page store matches a direct extraction."""
+    direct_text = pdf_service.extract_text_from_pdf(sample_pdf_path)
+    
+    with PageStore(sample_pdf_path) as page_store:
+        stored_text = pdf_service.extract_text_from_pdf(sample_pdf_path, page_store=page_store)
+        metadata = pdf_service.get_pdf_metadata(sample_pdf_path, page_store=page_store)
+    
+    assert stored_text == direct_text
+    assert metadata["page_count"] == 12
+
+def test_parallel_extraction_matches_serial(sample_pdf_path):
+    """Sharded multi-process extraction reassembles pages in document order."""
+    serial_text = pdf_service.extract_text_from_pdf(sample_pdf_path, parallel=False)
+    parallel_text = pdf_service.extract_text_from_pdf(sample_pdf_path, parallel=True, max_workers=3)
+    assert parallel_text == serial_text
+    
+    serial_layout = pdf_service.extract_text_with_layout(sample_pdf_path, parallel=False)
+    parallel_layout = pdf_service.extract_text_with_layout(sample_pdf_path, parallel=True, max_workers=3)
+    assert [page["page_number"] for page in parallel_layout] == list(range(1, 13))
+    assert parallel_layout == serial_layout
+
+def test_iter_pages_streams_text_and_tables(sample_pdf_path):
+    """Pages are yielded in order with their text and tables."""
+    pages = list(pdf_service.iter_pages(sample_pdf_path))
+    assert [page_number for page_number, _, _ in pages] == list(range(1, 13))
+    
+    # The synthetic report puts a balance sheet table on page 11
+    _, text, tables = pages[10]
+    assert "Balance Sheet" in text
+    assert tables and tables[0][1][0] == "Revenue"
+    
+    full_text = pdf_service.extract_text_from_pdf(sample_pdf_path, parallel=False)
+    assert "".join(text + "\n\n" for _, text, _ in pages) == full_text
+
+def test_chunks_are_packed_close_to_token_limit():
+    """Chunks fill most of the token budget, end at sentences and overlap slightly."""
+    text = " ".join(f"Revenue for segment {i} grew by {i % 9} percent this year." for i in range(2000))
+    spans = plan_chunks(text, max_tokens=512)
+    chunks = [text[start:end] for start, end in spans]
+    
+    assert all(estimate_tokens(chunk) <= 512 for chunk in chunks)
+    assert all(estimate_tokens(chunk) >= 512 * 0.8 for chunk in chunks[:-1])
+    assert all(chunk.endswith(".") for chunk in chunks)
+    for (start, end), (next_start, _) in zip(spans, spans[1:]):
+        assert start < next_start <= end
+    assert spans[-1][1] == len(text)
+    
+    # A character cap still applies when given, and oversized words are cut
+    assert all(len(chunk) <= 300 for chunk in chunk_text(text, chunk_size=300))
+    assert chunk_text("x" * 5000, max_tokens=100) == ["x" * 1250] * 4
+
+def test_chunks_respect_character_cap():
+    """No planned span is longer than chunk_size, and every chunk reaches past the previous one."""
+    texts = [
+        "$12 $12 " + "x" * 150 + " a b",
+        "a " * 3 + "x" * 150,
+        " ".join(f"Revenue was ${i},{i % 10}02.2 million." for i in range(300)) + " " + "y" * 400 + " done.",
+    ]
+    for text in texts:
+        for chunk_size, max_tokens in ((100, 16), (100, 1024), (250, 64)):
+            spans = plan_chunks(text, chunk_size, 200, max_tokens)
+            assert all(end - start <= chunk_size for start, end in spans)
+            for (start, end), (next_start, next_end) in zip(spans, spans[1:]):
+                assert next_start > start and next_end > end
+            assert spans[-1][1] == len(text.rstrip())
+    
+    assert plan_chunks("$12 $12 " + "x" * 150 + " a b", 100, 200, 16) == [(0, 7), (8, 83), (83, 158), (159, 162)]
+    assert plan_chunks("a " * 3 + "x" * 150, 100, 200, 16) == [(0, 5), (6, 81), (81, 156)]
+
+def test_vocab_token_counter(tmp_path):
+    """A local WordPiece vocabulary counts subword tokens and reserves room for special tokens."""
+    vocab_path = tmp_path / "vocab.txt"
+    vocab_path.write_text("\n".join(["[UNK]", "revenue", "grew", "by", "five", "percent", ".", "##s", "grow"]))
+    counter = VocabTokenCounter(str(vocab_path))
+    
+    assert counter.count("Revenue") == 1
+    assert counter.count("grows.") == 3
+    assert counter.count("zzz") == 1
+    assert counter.budget(512) == 510
+    
+    text = "Revenue grew by five percent. " * 200
+    chunks = chunk_text(text, max_tokens=64, token_counter=counter)
+    assert all(sum(counter.count(word) for word in chunk.split()) <= 62 for chunk in chunks)
+
+def test_extraction_cache_hit_skips_parsing(sample_pdf_path, tmp_path):
+    """A copy of the same PDF under another name is served from the extraction cache."""
+    cache = ExtractionCache(cache_dir=str(tmp_path / "cache"))
+    
+    with PageStore(sample_pdf_path, cache=cache) as page_store:
+        text = page_store.get_full_text()
+        page_store.get_tables(10)
+        metadata = pdf_service.get_pdf_metadata(sample_pdf_path, page_store=page_store)
+        assert not page_store.cache_hit
+    
+    copy_path = str(tmp_path / "renamed_report.pdf")
+    shutil.copy(sample_pdf_path, copy_path)
+    
+    with PageStore(copy_path, cache=cache) as page_store:
+        assert page_store.cache_hit
+        assert page_store.get_full_text() == text
+        assert page_store.get_tables(10)[0][1][0] == "Revenue"
+        assert pdf_service.get_pdf_metadata(copy_path, page_store=page_store) == metadata
+        assert page_store.text_pages_parsed == 0
+        assert page_store.table_pages_parsed == 0
+        # The PDF itself was never opened
+        assert page_store._reader is None and page_store._plumber is None
+    
+    assert cache.get_stats()["hits"] == 1
+    
+    # Another text backend does not reuse the text extracted by PyPDF2
+    with PageStore(copy_path, cache=cache, text_backend="pdfplumber") as page_store:
+        assert not page_store.cache_hit
+
+def test_parallel_extraction_reuses_cached_pages(sample_pdf_path, tmp_path, monkeypatch):
+    """Parallel extraction through a page store served from the cache does not shard the PDF again."""
+    cache = ExtractionCache(cache_dir=str(tmp_path / "cache"))
+    with PageStore(sample_pdf_path, cache=cache) as page_store:
+        text = pdf_service.extract_text_from_pdf(sample_pdf_path, page_store=page_store, parallel=True, max_workers=3)
+        assert page_store.text_pages_loaded == page_store.page_count
+    
+    sharded = []
+    monkeypatch.setattr(pdf_service, "_extract_sharded", lambda *args: sharded.append(args) or [])
+    with PageStore(sample_pdf_path, cache=cache) as page_store:
+        assert page_store.cache_hit
+        cached_text = pdf_service.extract_text_from_pdf(sample_pdf_path, page_store=page_store, parallel=True, max_workers=3)
+        assert cached_text == text
+        assert sharded == []
+        assert page_store.text_pages_parsed == 0
+        assert page_store._reader is None
+
+def test_extraction_cache_evicts_least_recently_used(tmp_path):
+    """Entries beyond the size limit are evicted oldest-access first."""
+    cache = ExtractionCache(cache_dir=str(tmp_path / "cache"), max_bytes=2500)
+    payload = {"texts": {"0": "x" * 1000}}
+    
+    cache.put("a", payload)
+    cache.put("b", payload)
+    # Make "a" the most recently used entry
+    os.utime(os.path.join(cache.cache_dir, "b.json"), (0, 0))
+    assert cache.get("a") is not None
+    
+    cache.put("c", payload)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+def test_outline_and_page_labels_locate_financial_pages(tmp_path):
+    """Bookmarks give financial page ranges and page labels map printed to physical pages."""
+    file_path = write_sample_pdf(
+        str(tmp_path / "outlined.pdf"),
+        build_synthetic_report(30),
+        outline=[
+            ("Strategic Report", 2),
+            ("Consolidated Financial Statements", 10),
+            ("Governance", 14)
+        ],
+        page_labels=[{"start": 0, "style": "r"}, {"start": 4, "style": "D"}]
+    )
+    reader = PyPDF2.PdfReader(file_path)
+    
+    assert sorted(locate_financial_sections_from_outline(reader)) == [10, 11, 12, 13]
+    
+    page_labels = get_page_labels(reader)
+    assert page_labels[:6] == ["i", "ii", "iii", "iv", "1", "2"]
+    # Printed page 5 is the ninth physical page once the roman-numbered front matter is skipped
+    assert resolve_printed_page(page_labels, "5") == 8
+    assert resolve_printed_page(page_labels, "99") is None
+
+def test_outline_locator_without_outline(sample_pdf_path):
+    """Documents without bookmarks fall back to the text scan."""
+    reader = PyPDF2.PdfReader(sample_pdf_path)
+    assert locate_financial_sections_from_outline(reader) is None
+    assert get_page_labels(reader) == [str(i) for i in range(1, 13)]
+
+def test_page_scorer_skips_prose_and_blank_pages(sample_pdf_path):
+    """Only table-like pages reach pdfplumber's table extraction."""
+    assert score_page("") == 0.0
+    assert not is_table_candidate("Management believes the strategy positions the company well. " * 20)
+    assert is_table_candidate("Balance Sheet\nRevenue 10,500 9,800\nNet income 2,300 2,100\nTotal assets 45,000 41,200")
+    
+    with PageStore(sample_pdf_path) as page_store:
+        table_pages = find_financial_table_pages(page_store, range(page_store.page_count))
+        assert table_pages == {10}
+        # Prose and blank pages never reach table extraction
+        assert page_store.table_pages_parsed <= 2
+
+@pytest.mark.parametrize("engine", ["pdfplumber", "ruled"])
+def test_table_extractor_engines(sample_pdf_path, engine):
+    """pdfplumber-based engines find the synthetic balance sheet and record their timing."""
+    extractor = TableExtractor(engine=engine)
+    tables, timings = extractor.extract(sample_pdf_path, [0, 10])
+    
+    assert len(tables) == 1
+    assert tables[0]["page"] == 10
+    assert tables[0]["data"][1] == ["Revenue", "10,500", "9,800"]
+    assert [timing["engine"] for timing in timings] == [engine]
+    assert timings[0]["success"] and timings[0]["pages"] == 2
+    assert get_engine_stats()[engine]["runs"] >= 1
+
+def test_low_memory_page_store_matches_default(sample_pdf_path):
+    """Recycling PDF handles in low-memory mode does not change extracted content."""
+    with PageStore(sample_pdf_path) as page_store:
+        expected = [(page_store.get_text(i), page_store.get_tables(i)) for i in range(page_store.page_count)]
+    
+    with PageStore(sample_pdf_path, low_memory=True, max_resident_pages=3) as page_store:
+        actual = [(page_store.get_text(i), page_store.get_tables(i)) for i in range(page_store.page_count)]
+    
+    assert actual == expected
+
+def test_memory_budget_skips_table_extraction(sample_pdf_path):
+    """Exceeding the memory budget skips table extraction instead of failing."""
+    with PageStore(sample_pdf_path, memory_budget_mb=1) as page_store:
+        # Pretend the process started out empty so the budget is already used up
+        page_store._baseline_memory_mb = 0
+        
+        assert page_store.get_tables(10) == []
+        assert page_store.get_text(10)
+        stats = page_store.get_stats()
+        assert stats["memory_budget_exceeded"]
+        assert stats["table_pages_skipped"] == 1
+        assert stats["table_pages_parsed"] == 0
+
+
+@pytest.mark.parametrize("backend_name", ["pypdf2", "pdfplumber", "pypdfium2"])
+def test_text_backends_extract_same_words(sample_pdf_path, backend_name):
+    """Every text backend extracts the same words as PyPDF2."""
+    if backend_name not in available_text_backends():
+        pytest.skip(f"{backend_name} is not installed")
+    
+    with open_text_backend("pypdf2", sample_pdf_path) as reference:
+        expected = [reference.extract_page(i).split() for i in range(reference.page_count)]
+    
+    with open_text_backend(backend_name, sample_pdf_path) as backend:
+        assert backend.name == backend_name
+        assert backend.page_count == 12
+        assert [backend.extract_page(i).split() for i in range(backend.page_count)] == expected
+
+def test_text_backend_selection(sample_pdf_path):
+    """Auto mode picks an available backend per document and reports quality on sample pages."""
+    comparison, sample = compare_text_backends(sample_pdf_path, sample_size=3)
+    assert len(sample) == 3
+    assert set(comparison) <= set(available_text_backends())
+    for name in available_text_backends():
+        assert comparison[name]["similarity"] == pytest.approx(1.0)
+    
+    assert select_text_backend(sample_pdf_path, check_quality=True) in available_text_backends()
+    
+    with PageStore(sample_pdf_path, text_backend="auto") as page_store:
+        assert "Balance Sheet" in page_store.get_text(10)
+        assert page_store.get_stats()["text_backend"] in available_text_backends()
+        assert page_store.get_derived("text_backend") == page_store.text_backend
+
+def test_unknown_text_backend_falls_back_to_pypdf2(sample_pdf_path):
+    """An unknown backend name falls back to PyPDF2 instead of failing."""
+    with PageStore(sample_pdf_path, text_backend="missing") as page_store:
+        assert "Balance Sheet" in page_store.get_text(10)
+        assert page_store.backend.name == "pypdf2"
+
+def test_document_shares_lazily_computed_views(sample_pdf_path):
+    """A Document computes its lowercased copy, sentences and chunks once, as offsets into the text."""
+    with PageStore(sample_pdf_path) as page_store:
+        page_texts = list(page_store.iter_texts())
+        document = Document.from_pages(page_texts)
+        assert document.text == page_store.get_full_text()
+    
+    assert document.lower is document.lower
+    assert document.lower == document.text.lower()
+    
+    assert list(document.iter_sentences()) == re.split(r'(?<=[.!?])\s+', document.text)
+    
+    plan = document.chunk_plan(800, 100, 256)
+    assert document.chunk_plan(800, 100, 256) is plan
+    assert list(document.iter_chunks(800, 100, 256)) == chunk_text(document.text, 800, 100, 256)
+    
+    balance_sheet = document.text.index("Balance Sheet")
+    assert document.page_number_at(balance_sheet) == 11
+    assert document.page_number_at(0) == 1
+
+def test_metric_scanner_finds_all_metrics_in_one_pass(tmp_path):
+    """One scan yields offsets, units and normalized values; stages share it through the Document."""
+    text = "Total revenue was $4.2 billion. Net income was 610 million.\nTotal assets 12,345 11,200\nInventories 1,234"
+    document = as_document(text)
+    scanner = MetricScanner()
+    
+    revenue = scanner.scan(document, group="statement")[0]
+    assert revenue["name"] == "Revenue"
+    assert text[revenue["start"]:revenue["end"]] == "Total revenue was $4.2 billion"
+    assert revenue["unit"] == "billion" and revenue["value_numeric"] == pytest.approx(4.2e9)
+    assert scanner.scan(document) is not scanner.scan(document)
+    assert document.get_derived(scanner._cache_key) is not None
+    
+    values = scanner.first_values(document, group="line_item")
+    assert values["total_assets"] == 12345 and values["inventory"] == 1234
+    assert values["interest_expense"] is None
+    
+    # Definitions are extended (or replaced by name) from a JSON file
+    config_path = tmp_path / "metrics.json"
+    config_path.write_text(
+        '[{"name": "ebitda", "group": "line_item", "keywords": ["ebitda"],'
+        ' "pattern": "ebitda[^\\\\n\\\\d]+(?P<value>[\\\\d,\\\\.]+)"}]'
+    )
+    definitions = load_metric_definitions(str(config_path))
+    assert len(definitions) == len(DEFAULT_METRIC_DEFINITIONS) + 1
+    assert MetricScanner(definitions).first_values("EBITDA 2,500", group="line_item")["ebitda"] == 2500
+
+def test_metric_scanner_tries_keywords_that_prefix_others():
+    """A keyword that is the beginning of a longer keyword still anchors its definition."""
+    definitions = DEFAULT_METRIC_DEFINITIONS + [
+        {"name": "x", "group": "line_item", "keywords": ["inc"],
+         "pattern": r"inc(?:ome)?\s+tax[^\n\d]+(?P<value>[\d,\.]+)"}
+    ]
+    scanner = MetricScanner(definitions)
+    assert scanner.first_values("Income tax 300", group="line_item")["x"] == 300
+    assert scanner.first_values("Inc tax paid 450", group="line_item")["x"] == 450
+    
+    # Definitions of the longer keyword are still tried at the same position
+    values = scanner.first_values("Income from operations 1,200", group="line_item")
+    assert values["operating_income"] == 1200 and values["x"] is None
+
+def test_section_index_locates_report_sections():
+    """One heading scan gives each stage the span and pages of its own section."""
+    pages = [
+        "Table of Contents\nItem 1A. Risk Factors 3\nItem 7. Management's Discussion and Analysis 4\n",
+        "Item 1. Business\nWe design and sell industrial equipment.\n",
+        "Item 1A. Risk Factors\n• Increasing competition in key markets could reduce our margins\n",
+        "Item 2. Properties\nWe lease our offices.\n"
+        "Item 7. Management's Discussion and Analysis\nRevenue grew by five percent.\n",
+        "Business Outlook:\nWe expect continued growth in 2024.\n\nItem 8. Financial Statements\n",
+        "Consolidated Balance Sheets\nTotal assets 45,000\n",
+    ]
+    # Build it with the Document class the services use
+    document = SectionDocument.from_pages(pages)
+    index = get_section_index(document)
+    assert get_section_index(document) is index
+    
+    risk_start, risk_end = index.span("risk_factors")
+    assert document.text[risk_start:risk_end].startswith("Item 1A. Risk Factors\n•")
+    assert "Properties" not in document.text[risk_start:risk_end]
+    assert index.get("mdna")["page_start"] == 4 and index.get("mdna")["page_end"] == 5
+    assert index.page_indices(["financial_statements"]) == {4, 5}
+    assert SectionIndex.from_list(index.to_list()).sections == index.sections
+    
+    assert extract_risk_factors_with_regex(document) == ["Increasing competition in key markets could reduce our margins"]
+
+def test_lexicon_sentiment_scores_pages_and_sections():
+    """One tokenization gives lexicon counts per page, per section and for the whole report."""
+    pages = [
+        "Item 1A. Risk Factors\nA downturn could cause losses and impairments.\n",
+        "Item 7. Management's Discussion and Analysis\nRevenue increased, margins improved and growth was strong.\n",
+        "Outlook\nWe expect further growth, although demand may fluctuate.\n",
+    ]
+    document = SectionDocument.from_pages(pages)
+    result = get_lexicon_sentiment_analyzer().analyze(document)
+    assert get_lexicon_sentiment_analyzer().analyze(document) is result
+    
+    risk_page, mdna_page, outlook_page = result["pages"]
+    # "Risk" in the heading is an uncertainty term too
+    assert (risk_page["positive"], risk_page["negative"], risk_page["uncertainty"]) == (0, 3, 2)
+    assert risk_page["sentiment"] == "negative" and risk_page["score"] == -1.0
+    assert (mdna_page["positive"], mdna_page["negative"]) == (4, 0) and mdna_page["page_number"] == 2
+    assert (outlook_page["positive"], outlook_page["uncertainty"]) == (1, 2)
+    
+    assert result["sections"]["risk_factors"]["negative"] == 3
+    assert result["sections"]["outlook"]["uncertainty"] == 2
+    # The MD&A item runs until the next item heading, so it includes the outlook page
+    assert result["sections"]["mdna"]["positive"] == 5
+    assert result["document"]["words"] == sum(page["words"] for page in result["pages"])
+    assert sentiment_distribution(result["document"]) == {"positive": 0.4167, "negative": 0.25, "uncertainty": 0.3333}
+    
+    assert fallback_sentiment_analysis(document)["sentiment"] == "positive"
+
+
+def test_extractive_summarizer_ranks_central_sentences():
+    """TextRank over the sparse TF-IDF matrix matches a dense computation and picks diverse sentences."""
+    text = (
+        "Revenue grew 12% to $4.2 billion, driven by strong cloud demand. "
+        "Cloud revenue grew strongly as demand for cloud services increased. "
+        "Cloud revenue grew strongly as demand for cloud services increased. "
+        "The board of directors met four times during the year. "
+        "Operating margin improved because of cloud scale and pricing discipline. "
+        "We expect cloud demand to remain strong in the next fiscal year. "
+        "Short heading."
+    )
+    summarizer = ExtractiveSummarizer(min_sentence_chars=20)
+    matrix = summarizer.sentence_matrix(text)
+    assert matrix.shape[0] == 6  # The heading is too short to be a candidate
+    
+    # Dense reference: PageRank over the cosine similarity graph without self loops
+    dense = np.zeros(matrix.shape)
+    dense[matrix.rows, matrix.columns] = matrix.values
+    similarity = dense @ dense.T
+    np.fill_diagonal(similarity, 0.0)
+    transition = similarity / similarity.sum(axis=1, keepdims=True)
+    expected = np.full(len(dense), 1.0 / len(dense))
+    for _ in range(200):
+        expected = 0.15 / len(dense) + 0.85 * transition.T @ expected
+    assert np.allclose(summarizer.rank(text), expected, atol=1e-5)
+    
+    result = summarizer.summarize(text, max_sentences=3)
+    texts = [sentence["text"] for sentence in result["sentences"]]
+    assert len(texts) == 3 and len(set(texts)) == 3  # The repeated sentence is only picked once
+    assert [sentence["start"] for sentence in result["sentences"]] == sorted(
+        sentence["start"] for sentence in result["sentences"]
+    )
+    assert "board" not in result["summary"]
+    assert result["method"] == "extractive"
+    
+    assert "margin" not in result["summary"]
+    assert "margin" in summarizer.summarize(text, max_sentences=3, focus_terms=["operating margin"])["summary"]
+    assert len(summarizer.summarize(text, max_sentences=5, max_chars=140)["summary"]) <= 140
+    assert summarizer.summarize("", max_sentences=3)["summary"] == ""
+
+
+def test_extractive_summarizer_short_text():
+    """A text without sentences within the length limits is still summarized."""
+    summarizer = ExtractiveSummarizer()
+    assert summarizer.summarize("Revenue grew. Costs fell.")["summary"] == "Revenue grew. Costs fell."
+    assert summarizer.summarize("Revenue grew. Costs fell.", max_sentences=1)["summary"] in ("Revenue grew.", "Costs fell.")
+    assert summarizer.summarize("It is up.")["summary"] == "It is up."
+    assert summarizer.summarize("   ")["summary"] == ""
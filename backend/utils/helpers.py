@@ -1,5 +1,6 @@
 import os
 import re
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -131,4 +132,45 @@ def format_financial_value(value: str) -> str:
             return f"${num_value:.2f}"
     except (ValueError, TypeError):
         # If conversion fails, return the original value
-        return value 
\ No newline at end of file
+        return value 
+
+def get_memory_usage_mb() -> Optional[float]:
+    """
+    Get the resident memory (RSS) of the current process in megabytes.
+    
+    Returns:
+        Current RSS where /proc is available, otherwise the peak RSS reported by
+        the resource module, or None if neither is available
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return None
+
+def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file's contents.
+    
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes read at a time
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -17,8 +17,8 @@ def setup_logging(app_name="app"):
     Returns:
         tuple: (logger, log_file_path, sql_log_path)
     """
-    # Create logs directory if it doesn't exist
-    logs_dir = os.path.join(os.getcwd(), "backend", "logs")
+    # Create logs directory if it doesn't exist (LOG_DIR overrides the default location)
+    logs_dir = os.getenv("LOG_DIR") or os.path.join(os.getcwd(), "backend", "logs")
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
 
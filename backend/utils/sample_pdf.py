@@ -0,0 +1,258 @@
+"""
+Minimal, dependency-free PDF builder used by tests and benchmarks.
+
+Generates small text (and optionally ruled-table) PDFs without requiring
+reportlab, so synthetic annual reports of any size can be produced on the fly.
+"""
+
+import os
+import sys
+import argparse
+from typing import List, Dict, Any, Union, Optional, Tuple
+
+PageSpec = Union[str, Dict[str, Any]]
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+LEFT_MARGIN = 50
+TOP_MARGIN = 60
+LINE_HEIGHT = 12
+
+
+def _escape(text: str) -> str:
+    """Escape a string for use inside a PDF literal string."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text_ops(lines: List[str], top: float) -> List[str]:
+    """Build content stream operators that draw lines of text."""
+    ops = ["BT", "/F1 10 Tf", f"{LINE_HEIGHT} TL", f"{LEFT_MARGIN} {top} Td"]
+    for line in lines:
+        ops.append(f"({_escape(line)}) Tj T*")
+    ops.append("ET")
+    return ops
+
+
+def _table_ops(rows: List[List[str]], top: float) -> List[str]:
+    """Build content stream operators that draw a ruled table."""
+    if not rows:
+        return []
+
+    col_count = max(len(row) for row in rows)
+    col_width = (PAGE_WIDTH - 2 * LEFT_MARGIN) / col_count
+    row_height = 18
+    bottom = top - row_height * len(rows)
+    right = LEFT_MARGIN + col_width * col_count
+
+    ops = ["0.5 w"]
+    # Horizontal rules
+    for r in range(len(rows) + 1):
+        y = top - r * row_height
+        ops.append(f"{LEFT_MARGIN} {y} m {right} {y} l S")
+    # Vertical rules
+    for c in range(col_count + 1):
+        x = LEFT_MARGIN + c * col_width
+        ops.append(f"{x} {top} m {x} {bottom} l S")
+
+    # Cell text
+    for r, row in enumerate(rows):
+        y = top - (r + 1) * row_height + 5
+        for c, cell in enumerate(row):
+            x = LEFT_MARGIN + c * col_width + 3
+            ops.append(f"BT /F1 9 Tf {x} {y} Td ({_escape(str(cell))}) Tj ET")
+    return ops
+
+
+def _page_content(spec: PageSpec) -> bytes:
+    """Render a page specification to a PDF content stream."""
+    if isinstance(spec, str):
+        spec = {"text": spec}
+
+    ops: List[str] = []
+    top = PAGE_HEIGHT - TOP_MARGIN
+
+    lines = spec.get("text", "").split("\n") if spec.get("text") else []
+    if lines:
+        ops.extend(_text_ops(lines, top))
+        top -= LINE_HEIGHT * (len(lines) + 1)
+
+    if spec.get("table"):
+        ops.extend(_table_ops(spec["table"], top))
+
+    return "\n".join(ops).encode("latin-1", errors="replace")
+
+
+def build_sample_pdf(
+    pages: List[PageSpec],
+    outline: Optional[List[Tuple[str, int]]] = None,
+    page_labels: Optional[List[Dict[str, Any]]] = None
+) -> bytes:
+    """
+    Build a PDF document from a list of page specifications.
+
+    Args:
+        pages: One entry per page. Either a string (rendered line by line) or a
+            dict with optional "text" (str) and "table" (list of rows) keys.
+        outline: Optional flat bookmark outline as (title, 0-indexed page) pairs
+        page_labels: Optional page label ranges, each a dict with "start"
+            (0-indexed first page) and optional "style" ("D", "r", "R", "a", "A"),
+            "prefix" and "first" (first number) keys
+
+    Returns:
+        The PDF file contents as bytes
+    """
+    if not pages:
+        pages = [""]
+
+    page_count = len(pages)
+    # Object numbering: 1 catalog, 2 pages tree, 3 font, then (page, content) pairs
+    objects: Dict[int, bytes] = {}
+    kids = []
+    for i, spec in enumerate(pages):
+        page_obj = 4 + 2 * i
+        content_obj = page_obj + 1
+        kids.append(f"{page_obj} 0 R")
+
+        stream = _page_content(spec)
+        objects[page_obj] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>"
+        ).encode("latin-1")
+        objects[content_obj] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream"
+        )
+
+    catalog = "<< /Type /Catalog /Pages 2 0 R"
+    next_obj = 4 + 2 * page_count
+
+    if outline:
+        outlines_obj = next_obj
+        item_objs = list(range(outlines_obj + 1, outlines_obj + 1 + len(outline)))
+        next_obj = item_objs[-1] + 1
+        objects[outlines_obj] = (
+            f"<< /Type /Outlines /First {item_objs[0]} 0 R /Last {item_objs[-1]} 0 R "
+            f"/Count {len(outline)} >>"
+        ).encode("latin-1")
+        for n, (title, page_index) in enumerate(outline):
+            links = ""
+            if n > 0:
+                links += f" /Prev {item_objs[n - 1]} 0 R"
+            if n + 1 < len(outline):
+                links += f" /Next {item_objs[n + 1]} 0 R"
+            objects[item_objs[n]] = (
+                f"<< /Title ({_escape(title)}) /Parent {outlines_obj} 0 R{links} "
+                f"/Dest [{4 + 2 * page_index} 0 R /Fit] >>"
+            ).encode("latin-1")
+        catalog += f" /Outlines {outlines_obj} 0 R"
+
+    if page_labels:
+        nums = []
+        for label in page_labels:
+            entry = ""
+            if label.get("style"):
+                entry += f" /S /{label['style']}"
+            if label.get("prefix"):
+                entry += f" /P ({_escape(label['prefix'])})"
+            if label.get("first"):
+                entry += f" /St {label['first']}"
+            nums.append(f"{label['start']} <<{entry} >>")
+        catalog += f" /PageLabels << /Nums [{' '.join(nums)}] >>"
+
+    objects[1] = (catalog + " >>").encode("latin-1")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode("latin-1")
+    objects[3] = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+    for obj_num in sorted(objects):
+        offsets[obj_num] = len(output)
+        output += f"{obj_num} 0 obj\n".encode("latin-1") + objects[obj_num] + b"\nendobj\n"
+
+    xref_offset = len(output)
+    total = max(objects) + 1
+    output += f"xref\n0 {total}\n".encode("latin-1")
+    output += b"0000000000 65535 f \n"
+    for obj_num in range(1, total):
+        output += f"{offsets[obj_num]:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {total} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    return bytes(output)
+
+
+def write_sample_pdf(file_path: str, pages: List[PageSpec], **kwargs: Any) -> str:
+    """
+    Write a generated PDF to disk.
+
+    Args:
+        file_path: Destination path
+        pages: Page specifications (see build_sample_pdf)
+        **kwargs: Outline and page label options passed to build_sample_pdf
+
+    Returns:
+        The path the PDF was written to
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(build_sample_pdf(pages, **kwargs))
+    return file_path
+
+
+def build_synthetic_report(page_count: int) -> List[PageSpec]:
+    """
+    Build page specifications for a synthetic annual report.
+
+    The mix roughly follows a real filing: mostly narrative prose, a table of
+    contents, periodic financial statement pages with ruled tables, and a few
+    blank (image-only) pages.
+
+    Args:
+        page_count: Number of pages to generate
+
+    Returns:
+        List of page specifications
+    """
+    prose = (
+        "Our business continued to grow during the year as we invested in new products\n"
+        "and expanded into additional markets. Management believes that the strategy\n"
+        "positions the company well for long-term value creation for shareholders.\n"
+    ) * 12
+
+    pages: List[PageSpec] = []
+    for i in range(page_count):
+        if i == 1:
+            pages.append(
+                "Table of Contents\n"
+                "Financial Review ... 5\n"
+                "Consolidated Financial Statements ... 10\n"
+            )
+        elif i % 25 == 10:
+            pages.append({
+                "text": f"Consolidated Balance Sheet\nPage {i + 1}\n",
+                "table": [
+                    ["Item", "2023", "2022"],
+                    ["Revenue", "10,500", "9,800"],
+                    ["Net income", "2,300", "2,100"],
+                    ["Total assets", "45,000", "41,200"],
+                    ["Total liabilities", "20,100", "19,700"],
+                ]
+            })
+        elif i % 40 == 39:
+            pages.append("")
+        else:
+            pages.append(f"Page {i + 1}\n" + prose)
+    return pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic annual report PDF")
+    parser.add_argument("output", help="Path of the PDF to write")
+    parser.add_argument("--pages", type=int, default=100, help="Number of pages")
+    args = parser.parse_args()
+
+    write_sample_pdf(args.output, build_synthetic_report(args.pages))
+    print(f"Wrote {args.pages}-page synthetic report to {args.output}")
+    sys.exit(0)